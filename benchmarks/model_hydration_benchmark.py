@@ -0,0 +1,61 @@
+import datetime
+import sys
+import timeit
+import tracemalloc
+
+from server.models.document import Document
+
+# Measures building and serializing Document models for a bulk listing.
+# LegacyDocument rebuilds the swagger maps for every instance, as the models
+# used to. Usage: python benchmarks/model_hydration_benchmark.py [num_docs]
+
+
+class LegacyDocument(Document):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.swagger_types = {k: v for k, v in Document.swagger_types.items()}
+        self.attribute_map = {k: v for k, v in Document.attribute_map.items()}
+
+
+def make_rows(num_docs):
+    return [
+        {
+            "id": f"doc-{idx}",
+            "name": f"Lease agreement {idx}.pdf",
+            "title": f"Lease agreement {idx}",
+            "user_id": "user-1",
+            "workspace_id": "workspace-1",
+            "parent_folder": "root",
+            "file_size": 1024.0 * idx,
+            "mime_type": "application/pdf",
+            "checksum": f"{idx:032x}",
+            "created_on": datetime.datetime(2022, 1, 1),
+            "is_deleted": False,
+            "status": "ready",
+            "meta": {"pubDate": datetime.datetime(2021, 1, 1)},
+        }
+        for idx in range(num_docs)
+    ]
+
+
+def bench(name, klass, rows, number=5):
+    seconds = (
+        timeit.timeit(
+            lambda: [klass(**row).to_dict() for row in rows],
+            number=number,
+        )
+        / number
+    )
+    tracemalloc.start()
+    models = [klass(**row) for row in rows]  # noqa: F841
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {seconds * 1000:9.2f} ms {peak / 2 ** 20:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = make_rows(num_docs)
+    print(f"building and serializing {num_docs} documents")
+    bench("legacy", LegacyDocument, rows)
+    bench("class maps", Document, rows)
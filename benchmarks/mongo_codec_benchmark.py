@@ -0,0 +1,92 @@
+import copy
+import random
+import timeit
+
+from server.storage.local.mongo_codec import escape_mongo_data
+from server.storage.local.mongo_codec import unescape_mongo_data
+
+# Compares the key-only codec with the previous value escaping codec on a grid
+# payload. Usage: python benchmarks/mongo_codec_benchmark.py [num_rows] [num_fields]
+
+
+def legacy_escape_mongo_data(data):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = legacy_escape_mongo_data(value)
+    elif isinstance(data, list):
+        for idx, value in enumerate(data):
+            data[idx] = legacy_escape_mongo_data(value)
+    elif isinstance(data, str):
+        data = data.replace(".", "_dot_").replace("$", "_dollar_")
+    return data
+
+
+def legacy_unescape_mongo_data(data):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = legacy_unescape_mongo_data(value)
+    elif isinstance(data, list):
+        for idx, value in enumerate(data):
+            data[idx] = legacy_unescape_mongo_data(value)
+    elif isinstance(data, str):
+        data = data.replace("_dot_", ".").replace("_dollar_", "$")
+    return data
+
+
+def make_top_fact(rng):
+    value = f"${rng.randint(1, 10 ** 6) / 100:.2f} per annum"
+    answer_details = {"raw_value": value, "formatted_value": value}
+    return {
+        "answer": value,
+        "formatted_answer": value,
+        "answer_details": answer_details,
+        "phrase": f"The rent is {value}. It is payable monthly in advance.",
+        "match_idx": rng.randint(0, 100),
+        "page_idx": rng.randint(0, 50),
+        "scaled_score": rng.random(),
+        "matches": [
+            {
+                "answer": value,
+                "answer_details": dict(answer_details),
+                "block_idx": rng.randint(0, 500),
+                "header_text": "Section 4.1. Payment terms",
+            }
+            for _ in range(3)
+        ],
+    }
+
+
+def make_grid_payload(num_rows, num_fields):
+    rng = random.Random(0)
+    field_ids = [f"field-{idx}" for idx in range(num_fields)]
+    return {
+        "totalMatchCount": num_rows,
+        "results": [
+            {
+                "file_idx": f"doc-{row}",
+                "file_name": f"Lease agreement {row}.pdf",
+                **{f_id: make_top_fact(rng) for f_id in field_ids},
+            }
+            for row in range(num_rows)
+        ],
+    }
+
+
+def bench(name, func, payload, number=5):
+    copies = [copy.deepcopy(payload) for _ in range(number)]
+    seconds = timeit.timeit(lambda: func(copies.pop()), number=number) / number
+    print(f"{name:<28} {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    payload = make_grid_payload(num_rows, num_fields)
+    print(f"grid payload with {num_rows} rows and {num_fields} fields")
+    bench("legacy escape", legacy_escape_mongo_data, payload)
+    bench("key-only escape", escape_mongo_data, payload)
+    bench("legacy unescape", legacy_unescape_mongo_data, payload)
+    bench("key-only unescape", lambda d: unescape_mongo_data(d, values=False), payload)
+    bench("key and value unescape", unescape_mongo_data, payload)
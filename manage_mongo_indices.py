@@ -0,0 +1,46 @@
+import argparse
+import pprint
+
+from server.storage import nosql_db
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconcile MongoDB indices against the index manifest.",
+    )
+    parser.add_argument(
+        "action",
+        choices=["reconcile", "advise"],
+        help="reconcile: create missing indices, advise: explain() query shapes",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the missing and extra indices",
+    )
+    parser.add_argument(
+        "--drop-extra",
+        action="store_true",
+        help="Drop indices which are not part of the manifest",
+    )
+    args = parser.parse_args()
+
+    if args.action == "reconcile":
+        report = nosql_db.reconcile_indices(
+            drop_extra=args.drop_extra,
+            dry_run=args.dry_run,
+        )
+        pprint.pprint(report)
+    else:
+        problems = nosql_db.advise_indices()
+        if not problems:
+            print("All query shapes are covered by an index.")
+        for problem in problems:
+            print(
+                f"{problem['col_name']}.{problem['name']}: {problem['issues']} "
+                f"(plan: {' <- '.join(problem['stages'])})",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import sys
+
+from server.storage import nosql_db
+from server.storage.local import document_counters
+
+# Recomputes the per workspace / folder document counters from the document
+# collection. Also the repair command when the counters drifted, run it while
+# the reconcilers are stopped (DOCUMENT_COUNTER_RECONCILE_INTERVAL_SECONDS=0),
+# as it does not claim the counters.
+# Usage: python document_counters.py [workspace_id] [folder_id]
+workspace_id = sys.argv[1] if len(sys.argv) > 1 else None
+folder_id = sys.argv[2] if len(sys.argv) > 2 else None
+
+nosql_db.db[document_counters.COUNTER_COLLECTION].create_index(
+    [("workspace_id", 1), ("folder_id", 1)],
+    unique=True,
+)
+num_counters = nosql_db.repair_document_counters(workspace_id, folder_id)
+print(f"recomputed {num_counters} document counters")
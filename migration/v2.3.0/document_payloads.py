@@ -0,0 +1,59 @@
+import sys
+
+from pymongo import UpdateOne
+
+from server.storage import nosql_db
+from server.storage.local import document_payload
+
+# Moves the inline blocks and key_info of the documents into the compressed
+# document_payload collection and removes them from the document collection.
+# Usage: python document_payloads.py [workspace_id]
+BATCH_SIZE = 100
+query = {
+    "$or": [{kind: {"$exists": True}} for kind in document_payload.PAYLOAD_KINDS],
+}
+if len(sys.argv) > 1:
+    query["workspace_id"] = sys.argv[1]
+
+payload_col = nosql_db.db[document_payload.PAYLOAD_COLLECTION]
+payload_col.create_index([("doc_id", 1)], unique=True)
+
+
+def flush(payload_updates, doc_ids):
+    if payload_updates:
+        payload_col.bulk_write(payload_updates, ordered=False)
+    # Only unset once the payloads are safely written.
+    nosql_db.db["document"].update_many(
+        {"id": {"$in": doc_ids}},
+        {"$unset": {kind: 1 for kind in document_payload.PAYLOAD_KINDS}},
+    )
+
+
+payload_updates = []
+doc_ids = []
+num_moved = 0
+projection = {"_id": 0, "id": 1}
+projection.update({kind: 1 for kind in document_payload.PAYLOAD_KINDS})
+for doc in nosql_db.db["document"].find(query, projection, batch_size=BATCH_SIZE):
+    set_data = {}
+    for kind in document_payload.PAYLOAD_KINDS:
+        if doc.get(kind, None) is not None:
+            compressed = document_payload.compress_payload(doc[kind])
+            set_data[kind] = compressed
+            set_data[f"{kind}_size"] = len(compressed)
+    doc_ids.append(doc["id"])
+    if set_data:
+        payload_updates.append(
+            UpdateOne({"doc_id": doc["id"]}, {"$set": set_data}, upsert=True),
+        )
+    if len(doc_ids) == BATCH_SIZE:
+        flush(payload_updates, doc_ids)
+        num_moved += len(doc_ids)
+        payload_updates = []
+        doc_ids = []
+        print(f"moved payloads of {num_moved} documents")
+if doc_ids:
+    flush(payload_updates, doc_ids)
+    num_moved += len(doc_ids)
+print(f"moved payloads of {num_moved} documents")
+print("run compact on the document collection to release the space")
@@ -0,0 +1,41 @@
+import sys
+
+from pymongo import UpdateOne
+
+from server.storage import nosql_db
+from server.utils import str_utils
+
+# Backfills name_grams and title_grams used by the substring and prefix search
+# on the document names and titles.
+# Usage: python document_search_grams.py [workspace_id]
+BATCH_SIZE = 1000
+query = {}
+if len(sys.argv) > 1:
+    query["workspace_id"] = sys.argv[1]
+
+updates = []
+num_updated = 0
+for doc in nosql_db.db["document"].find(
+    query,
+    {"_id": 1, "name": 1, "inferred_title": 1},
+):
+    updates.append(
+        UpdateOne(
+            {"_id": doc["_id"]},
+            {
+                "$set": str_utils.get_document_search_keys(
+                    doc.get("name", None),
+                    doc.get("inferred_title", None),
+                ),
+            },
+        ),
+    )
+    if len(updates) == BATCH_SIZE:
+        nosql_db.db["document"].bulk_write(updates, ordered=False)
+        num_updated += len(updates)
+        updates = []
+        print(f"updated search grams of {num_updated} documents")
+if updates:
+    nosql_db.db["document"].bulk_write(updates, ordered=False)
+    num_updated += len(updates)
+print(f"updated search grams of {num_updated} documents")
@@ -0,0 +1,17 @@
+import sys
+
+from server.storage import nosql_db
+
+# Builds the materialized field_bundle_grid_{workspace}_{bundle} collections.
+# Usage: python field_bundle_grid.py [workspace_id]
+query = {"active": True}
+if len(sys.argv) > 1:
+    query["workspace_id"] = sys.argv[1]
+
+for idx, bundle in enumerate(
+    nosql_db.db["field_bundle"].find(query, {"_id": 0, "id": 1, "workspace_id": 1}),
+):
+    if not bundle.get("id", None) or not bundle.get("workspace_id", None):
+        continue
+    nosql_db.rebuild_field_bundle_grid(bundle["workspace_id"], bundle["id"])
+    print(f"{idx}: rebuilt grid for {bundle['workspace_id']} - {bundle['id']}")
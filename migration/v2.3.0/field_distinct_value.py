@@ -0,0 +1,16 @@
+import sys
+
+from server.storage import nosql_db
+
+# Recounts the reference counted field_distinct_value collection from field_value.
+# Usage: python field_distinct_value.py [workspace_id]
+workspace_id = sys.argv[1] if len(sys.argv) > 1 else None
+
+if workspace_id:
+    workspace_ids = [workspace_id]
+else:
+    workspace_ids = nosql_db.db["field_value"].distinct("workspace_idx")
+
+for idx, ws_id in enumerate(workspace_ids):
+    num_fields = nosql_db.rebuild_field_distinct_values(workspace_idx=ws_id)
+    print(f"{idx}: recounted distinct values of {num_fields} fields in {ws_id}")
@@ -0,0 +1,78 @@
+import sys
+
+from pymongo import UpdateOne
+
+from server.storage import nosql_db
+from server.storage.local.mongo_db import FIELD_VALUE_HISTORY_COLLECTION
+from server.storage.local.mongo_db import FIELD_VALUE_HISTORY_INLINE_SIZE
+from server.storage.local.mongo_db import get_history_archive_docs
+from server.storage.local.mongo_db import get_history_archive_requests
+from server.storage.local.mongo_db import get_numbered_history
+
+# Moves the field_value_history entries beyond FIELD_VALUE_HISTORY_INLINE_SIZE
+# to the field_value_history collection.
+# Usage: python field_value_history.py [workspace_id]
+BATCH_SIZE = 100
+query = {f"field_value_history.{FIELD_VALUE_HISTORY_INLINE_SIZE}": {"$exists": True}}
+if len(sys.argv) > 1:
+    query["workspace_idx"] = sys.argv[1]
+
+history_col = nosql_db.db[FIELD_VALUE_HISTORY_COLLECTION]
+history_col.create_index([("field_idx", 1), ("file_idx", 1), ("ts", -1)])
+
+
+def flush(updates, archived):
+    # Archive first, the inline entries are only trimmed once they are safe.
+    # Entries archived by an interrupted run are not archived again.
+    if archived:
+        history_col.bulk_write(get_history_archive_requests(archived))
+    nosql_db.db["field_value"].bulk_write(updates, ordered=False)
+
+
+updates = []
+archived = []
+num_trimmed = 0
+projection = {
+    "_id": 1,
+    "workspace_idx": 1,
+    "field_bundle_idx": 1,
+    "field_idx": 1,
+    "file_idx": 1,
+    "field_value_history": 1,
+    "field_value_history_count": 1,
+}
+for fv in nosql_db.db["field_value"].find(query, projection, batch_size=BATCH_SIZE):
+    history = fv["field_value_history"]
+    archived.extend(
+        get_history_archive_docs(
+            fv,
+            get_numbered_history(
+                history[FIELD_VALUE_HISTORY_INLINE_SIZE:],
+                fv.get("field_value_history_count", None) or 0,
+                start=FIELD_VALUE_HISTORY_INLINE_SIZE,
+            ),
+        ),
+    )
+    updates.append(
+        UpdateOne(
+            {"_id": fv["_id"]},
+            {
+                "$push": {
+                    "field_value_history": {
+                        "$each": [],
+                        "$slice": FIELD_VALUE_HISTORY_INLINE_SIZE,
+                    },
+                },
+            },
+        ),
+    )
+    if len(updates) == BATCH_SIZE:
+        flush(updates, archived)
+        num_trimmed += len(updates)
+        updates = []
+        archived = []
+        print(f"trimmed the history of {num_trimmed} field values")
+if updates:
+    flush(updates, archived)
+    num_trimmed += len(updates)
+print(f"trimmed the history of {num_trimmed} field values")
@@ -0,0 +1,79 @@
+import sys
+
+from pymongo import ReplaceOne
+
+from server.storage import nosql_db
+from server.storage.local.mongo_codec import escape_mongo_key
+from server.storage.local.mongo_codec import unescape_mongo_key
+from server.storage.local.mongo_db import FIELD_VALUE_HISTORY_COLLECTION
+
+# Values used to be stored with "." and "$" escaped while keys were stored as is.
+# Restores the values and escapes the keys instead, in field, field_value and
+# field_value_history, then rebuilds the grids and the distinct values.
+# Set MONGO_ESCAPED_VALUES=0 on the servers once it ran for every workspace.
+# Usage: python mongo_key_escaping.py [workspace_id]
+BATCH_SIZE = 1000
+
+
+def convert(data):
+    if isinstance(data, dict):
+        return {escape_mongo_key(k): convert(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [convert(v) for v in data]
+    elif isinstance(data, str):
+        return unescape_mongo_key(data)
+    return data
+
+
+def migrate_collection(col_name, query, keep_fields):
+    updates = []
+    num_updated = 0
+    for doc in nosql_db.db[col_name].find(query):
+        new_doc = {
+            k: v if k in keep_fields else convert(v) for k, v in doc.items()
+        }
+        if new_doc == doc:
+            continue
+        updates.append(ReplaceOne({"_id": doc["_id"]}, new_doc))
+        if len(updates) == BATCH_SIZE:
+            nosql_db.db[col_name].bulk_write(updates, ordered=False)
+            num_updated += len(updates)
+            updates = []
+            print(f"{col_name}: migrated {num_updated} entries")
+    if updates:
+        nosql_db.db[col_name].bulk_write(updates, ordered=False)
+        num_updated += len(updates)
+    print(f"{col_name}: migrated {num_updated} entries")
+
+
+workspace_id = sys.argv[1] if len(sys.argv) > 1 else None
+id_fields = {"_id", "id", "workspace_idx", "field_bundle_idx", "field_idx", "file_idx"}
+migrate_collection(
+    "field_value",
+    {"workspace_idx": workspace_id} if workspace_id else {},
+    id_fields,
+)
+migrate_collection(
+    "field",
+    {"workspace_id": workspace_id} if workspace_id else {},
+    id_fields | {"workspace_id", "parent_bundle_id"},
+)
+migrate_collection(
+    FIELD_VALUE_HISTORY_COLLECTION,
+    {"workspace_idx": workspace_id} if workspace_id else {},
+    id_fields | {"ts", "entry_key"},
+)
+
+# The grids and the distinct values hold the old escaped values, rebuild them.
+grid_state_query = {"workspace_id": workspace_id} if workspace_id else {}
+nosql_db.db["field_bundle_grid_state"].update_many(
+    grid_state_query,
+    {"$set": {"ready": False}},
+)
+if workspace_id:
+    workspace_ids = [workspace_id]
+else:
+    workspace_ids = nosql_db.db["field_value"].distinct("workspace_idx")
+for ws_id in workspace_ids:
+    nosql_db.rebuild_field_distinct_values(workspace_idx=ws_id)
+    print(f"rebuilt distinct values in {ws_id}")
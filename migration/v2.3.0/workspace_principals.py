@@ -0,0 +1,32 @@
+from pymongo import UpdateOne
+
+from server.storage import nosql_db
+
+# Backfills the principals array used to find the workspaces shared with a user.
+# Usage: python workspace_principals.py
+BATCH_SIZE = 1000
+
+updates = []
+num_updated = 0
+for ws in nosql_db.db["workspace"].find({}, {"_id": 1, "collaborators": 1}):
+    updates.append(
+        UpdateOne(
+            {"_id": ws["_id"]},
+            {
+                "$set": {
+                    "principals": nosql_db.get_workspace_principals(
+                        ws.get("collaborators", None),
+                    ),
+                },
+            },
+        ),
+    )
+    if len(updates) == BATCH_SIZE:
+        nosql_db.db["workspace"].bulk_write(updates, ordered=False)
+        num_updated += len(updates)
+        updates = []
+        print(f"updated principals of {num_updated} workspaces")
+if updates:
+    nosql_db.db["workspace"].bulk_write(updates, ordered=False)
+    num_updated += len(updates)
+print(f"updated principals of {num_updated} workspaces")
@@ -7,6 +7,7 @@ from flask_cors import CORS
 from nlm_utils.utils import ensure_bool
 
 from server import encoder
+from server.storage.local import request_cache
 
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
@@ -19,7 +20,8 @@ if nlm_parser_openapi:
     specification_dir = "./swagger_openapi/"
 
 app = connexion.App(__name__, specification_dir=specification_dir)
-app.app.json_encoder = encoder.JSONEncoder
+encoder.init_json_provider(app.app)
+request_cache.init_request_stats(app.app)
 app.add_api(
     "swagger.yaml",
     arguments={"title": "NLM Service API"},
@@ -9,6 +9,7 @@ import urllib3
 from jose import jwt
 
 from server.auth.auth_provider import AuthProvider
+from server.auth.token_cache import JWKSCache
 from server.utils import str_utils
 
 CONTENT_TYPE_JSON = "application/json"
@@ -49,6 +50,10 @@ class Auth0Provider(AuthProvider):
 
         self.conn = urllib3.PoolManager()
         self.mgmt_access_key = None
+        self.jwks = JWKSCache(
+            f"https://{self.AUTH0_DOMAIN}/.well-known/jwks.json",
+            self.conn,
+        )
 
     def callback(self, request):
         """
@@ -110,22 +115,26 @@ class Auth0Provider(AuthProvider):
         return url
 
     def verify_token(self, token, is_management_token=False):
-        jsonurl = self.conn.request(
-            "GET",
-            f"https://{self.AUTH0_DOMAIN}/.well-known/jwks.json",
-        )
-        jwks = json.loads(jsonurl.data)
+        namespace = "management" if is_management_token else ""
+        payload = self.verified_tokens.get(token, namespace)
+        if payload:
+            return payload
+        payload = self._verify_token(token, is_management_token)
+        self.verified_tokens.put(token, payload, namespace)
+        return payload
+
+    def _verify_token(self, token, is_management_token=False):
         unverified_header = jwt.get_unverified_header(token)
         rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
+        key = self.jwks.get_key(unverified_header.get("kid", None))
+        if key:
+            rsa_key = {
+                "kty": key["kty"],
+                "kid": key["kid"],
+                "use": key["use"],
+                "n": key["n"],
+                "e": key["e"],
+            }
         if rsa_key:
             try:
                 payload = jwt.decode(
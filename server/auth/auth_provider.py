@@ -10,6 +10,7 @@ from nlm_utils.utils import ensure_bool
 from nlm_utils.utils import ensure_integer
 from pytz import timezone
 
+from server.auth.token_cache import VerifiedTokenCache
 from server.controllers.subscription_controller import create_stripe_customer
 from server.models import FieldBundle
 from server.models import User
@@ -56,10 +57,16 @@ class AuthProvider:
         self.keys = os.getenv(
             "AUTH_SECRET"
         )
+        self.verified_tokens = VerifiedTokenCache()
 
     def verify_token(self, token):
         try:
-            return jwt.decode(token, self.keys)
+            payload = self.verified_tokens.get(token)
+            if payload:
+                return payload
+            payload = jwt.decode(token, self.keys)
+            self.verified_tokens.put(token, payload)
+            return payload
         except jose.ExpiredSignatureError as e:
             # if the token has expired, it is at least from this provider.
             raise e
@@ -101,7 +108,7 @@ class AuthProvider:
 
         try:
             # no need to verify existing user
-            user = nosql_db.get_user_by_email(email, include_stripe_conf=True)
+            user = nosql_db.get_authenticated_user(email)
         # user not exist, create a new one
         except ValueError:
             # check if user in allowed tenant
@@ -5,6 +5,7 @@ import google.auth.transport.requests
 import google.oauth2.id_token
 
 from server.auth.auth_provider import AuthProvider
+from server.auth.token_cache import VerifiedTokenCache
 
 # import server.config as cfg
 
@@ -17,10 +18,14 @@ ALLOWED_DOMAINS = os.getenv("ALLOWED_DOMAINS", "").split()
 
 class FirebaseAuthProvider(AuthProvider):
     def __init__(self):
-        pass
+        self.verified_tokens = VerifiedTokenCache()
 
     def auth_user(self, token):
-        claims = google.oauth2.id_token.verify_firebase_token(token, HTTP_REQUEST)
+        claims = self.verified_tokens.get(token)
+        if not claims:
+            # Fetches the google certificates and verifies the signature.
+            claims = google.oauth2.id_token.verify_firebase_token(token, HTTP_REQUEST)
+            self.verified_tokens.put(token, claims)
         if claims:
             email = claims["email"]
             # !!!!!Security sensitive code - DO NOT CHANGE WITHOUT REVIEW
@@ -0,0 +1,132 @@
+import collections
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from nlm_utils.utils import ensure_integer
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+JWKS_REFRESH_SECONDS = ensure_integer(os.getenv("JWKS_REFRESH_SECONDS", 60 * 60))
+# Minimum time between two refreshes forced by an unknown kid.
+JWKS_MIN_REFRESH_SECONDS = ensure_integer(os.getenv("JWKS_MIN_REFRESH_SECONDS", 60))
+VERIFIED_TOKEN_CACHE_SIZE = ensure_integer(
+    os.getenv("VERIFIED_TOKEN_CACHE_SIZE", 10000),
+)
+
+
+class JWKSCache:
+    """Keeps the JSON Web Key Set of an identity provider in process. The keys are
+    refreshed every refresh_interval seconds, or earlier when a token is signed
+    with an unknown kid. When the provider is not reachable, the last known keys
+    are served."""
+
+    def __init__(
+        self,
+        jwks_url,
+        conn,
+        refresh_interval=JWKS_REFRESH_SECONDS,
+        min_refresh_interval=JWKS_MIN_REFRESH_SECONDS,
+    ):
+        """
+        :param jwks_url: url of the key set, e.g. https://domain/.well-known/jwks.json
+        :param conn: urllib3 PoolManager
+        :param refresh_interval: seconds after which the keys are fetched again
+        :param min_refresh_interval: seconds between two forced refreshes
+        """
+        self.jwks_url = jwks_url
+        self.conn = conn
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.keys = {}
+        self.fetched_at = 0
+        self.lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            resp = self.conn.request("GET", self.jwks_url)
+            jwks = json.loads(resp.data)
+            self.keys = {key["kid"]: key for key in jwks["keys"]}
+        except Exception as e:
+            if not self.keys:
+                raise e
+            logger.error(f"Failed to refresh JWKS from {self.jwks_url}, err: {e}")
+        self.fetched_at = time.monotonic()
+
+    def get_key(self, kid):
+        """Returns the key with the given kid, None if the provider does not know it
+        :param kid: key id from the token header
+        :return: JWK dict
+        """
+        age = time.monotonic() - self.fetched_at
+        if age > self.refresh_interval or (
+            kid not in self.keys and age > self.min_refresh_interval
+        ):
+            with self.lock:
+                # Another thread may have refreshed while we waited.
+                age = time.monotonic() - self.fetched_at
+                if age > self.refresh_interval or (
+                    kid not in self.keys and age > self.min_refresh_interval
+                ):
+                    self._refresh()
+        return self.keys.get(kid, None)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of the payloads of already verified tokens. Entries are kept
+    until the exp claim of the token, so a repeated bearer token skips the
+    signature verification. Only the sha256 digest of the token is stored."""
+
+    def __init__(self, max_size=VERIFIED_TOKEN_CACHE_SIZE):
+        """
+        :param max_size: maximum number of tokens to keep
+        """
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token, namespace):
+        return hashlib.sha256(f"{namespace}:{token}".encode("utf-8")).hexdigest()
+
+    def get(self, token, namespace=""):
+        """Returns the payload of a verified token which has not expired
+        :param token: bearer token
+        :param namespace: kind of verification the token passed, e.g. the audience
+        :return: copy of the payload or None
+        """
+        digest = self._digest(token, namespace)
+        with self.lock:
+            entry = self.entries.get(digest, None)
+            if entry is None:
+                return None
+            payload, exp = entry
+            if exp <= time.time():
+                del self.entries[digest]
+                return None
+            self.entries.move_to_end(digest)
+        return dict(payload)
+
+    def put(self, token, payload, namespace=""):
+        """Remembers a verified token until its exp claim, tokens without exp are
+        not cached
+        :param token: bearer token
+        :param payload: verified claims of the token
+        :param namespace: kind of verification the token passed
+        """
+        exp = payload.get("exp", None) if payload else None
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        digest = self._digest(token, namespace)
+        with self.lock:
+            self.entries[digest] = (dict(payload), exp)
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -2,6 +2,7 @@ from flask import jsonify
 from flask import make_response
 
 from server import auth
+from server.storage.local.mongo_stats import command_stats
 from server.utils import metric_utils
 
 
@@ -33,3 +34,38 @@ def update_global_params(token_info):  # noqa: E501
             ),
             403,
         )
+
+
+def get_mongo_command_stats(token_info, reset=False):  # noqa: E501
+    """Returns the mongo commands aggregated per endpoint / task
+
+     # noqa: E501
+
+    :param token_info: Return data from Authentication
+    :param reset: Start a new aggregation after returning the current one
+    :type reset: bool
+
+    :rtype: List[object]
+    """
+    user_json = token_info["user_obj"]
+    if user_json["is_admin"]:
+        return make_response(
+            jsonify(
+                {
+                    "enabled": command_stats.collect_stats,
+                    "slow_query_ms": command_stats.slow_ms,
+                    "stats": command_stats.get_stats(reset=reset),
+                },
+            ),
+            200,
+        )
+    else:
+        return make_response(
+            jsonify(
+                {
+                    "status": "fail",
+                    "reason": "Only Admins can view the mongo command stats",
+                },
+            ),
+            403,
+        )
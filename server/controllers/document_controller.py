@@ -462,6 +462,7 @@ def get_documents_in_workspace(
     doc_per_page=10000,
     offset=0,
     return_only_status=False,
+    continuation_token=None,
     nosql_db=nosqldb,
     check_permission=True,
 ):  # noqa: E501
@@ -475,6 +476,7 @@ def get_documents_in_workspace(
     :type workspace_id: str
     :param return_only_status:
     :param offset:
+    :param continuation_token: continuationToken of the previous page, offset is ignored when set
     :param nosql_db:
     :param doc_per_page:
     :param check_permission: bool
@@ -510,7 +512,11 @@ def get_documents_in_workspace(
             offset,
             projection=projection,
             do_sort=do_sort,
+            continuation_token=continuation_token,
         )
+    except ValueError as e:
+        logger.info(f"invalid request to retrieve documents, reason: {str(e)}")
+        return err_response(str(e), 400)
     except Exception as e:
         logger.error(
             f"error retrieving documents from workspace, reason: {str(e)}",
@@ -1,4 +1,6 @@
+import csv
 import datetime
+import io
 import json
 import logging
 import os
@@ -8,16 +10,19 @@ from timeit import default_timer
 from typing import List
 
 import connexion
-import pandas as pd
 import requests
 from flask import jsonify
 from flask import make_response
+from flask import Response
 from flask import send_from_directory
+from flask import stream_with_context
 from nlm_utils.rabbitmq import producer
 from nlm_utils.utils import ensure_bool
+from openpyxl import Workbook
 
 from server import err_response
 from server import unauthorized_response
+from server.encoder import json_response
 from server.models import GridSelector
 from server.models.search_criteria import SearchCriteria  # noqa: E501
 from server.storage import nosql_db
@@ -1252,11 +1257,9 @@ def parse_grid_query(grid_query, field_bundle_id, workspace=None):
         expand_cols = grid_query.get("groupKeys", [])
         for idx, expand_val in enumerate(expand_cols):
             (field, _, _) = group_by_list[idx]
-            filter_dict[f"{field}.answer_details.raw_value"] = {
-                convert_to_mongo_operator("equals"): nosql_db.escape_mongo_data(
-                    expand_val,
-                ),
-            }
+            filter_dict[f"{field}.answer_details.raw_value"] = nosql_db.escape_mongo_filter(
+                {convert_to_mongo_operator("equals"): expand_val},
+            )
         if expand_cols and len(expand_cols) == len(
             group_by_list,
         ):  # We are converting the expansion as a filter_model
@@ -1301,7 +1304,7 @@ def parse_grid_query(grid_query, field_bundle_id, workspace=None):
                     # Add to the filter dict only if the key is not already present.
                     # Key might be already present if we are expanding the group on which a filter is also applied.
                     if k not in filter_dict:
-                        filter_dict[k] = nosql_db.escape_mongo_data(v)
+                        filter_dict[k] = nosql_db.escape_mongo_filter(v)
         # Value Aggregators
         value_cols = grid_query.get("valueCols", [])
         for value_item in value_cols:
@@ -1450,35 +1453,79 @@ def extract_field_bundle_grid_data(
         logger.info(f"review_status_filter_dict: {review_status_filter_dict}")
         logger.info(f"distinct_field: {grid_selector.distinct_field}")
 
-        res = nosql_db.retrieve_grid_data_from_field_values(
-            grid_selector.workspace_id,
-            grid_selector.field_bundle_id,
-            file_ids=grid_selector.doc_ids,
-            field_ids=grid_selector.field_ids,
-            limit=limit,
-            skip=skip,
-            sort_tuple_list=sort_tuple_list,
-            filter_dict=filter_dict,
-            group_by_list=group_by_list,
-            value_aggregate_list=value_aggregate_list,
-            review_status_filter_dict=review_status_filter_dict,
-            distinct_field=grid_selector.distinct_field,
-            return_only_file_ids=return_only_file_ids,
-            return_top_fact_answer=grid_selector.return_top_fact_answer,
-        )
+        logger.info(f"continuation_token: {grid_selector.continuation_token}")
+
+        try:
+            res = nosql_db.retrieve_grid_data_from_field_values(
+                grid_selector.workspace_id,
+                grid_selector.field_bundle_id,
+                file_ids=grid_selector.doc_ids,
+                field_ids=grid_selector.field_ids,
+                limit=limit,
+                skip=skip,
+                sort_tuple_list=sort_tuple_list,
+                filter_dict=filter_dict,
+                group_by_list=group_by_list,
+                value_aggregate_list=value_aggregate_list,
+                review_status_filter_dict=review_status_filter_dict,
+                distinct_field=grid_selector.distinct_field,
+                return_only_file_ids=return_only_file_ids,
+                return_top_fact_answer=grid_selector.return_top_fact_answer,
+                continuation_token=grid_selector.continuation_token,
+            )
+        except ValueError as e:
+            logger.info(f"invalid grid query, reason: {str(e)}")
+            return err_response(str(e), 400)
         if return_only_file_ids:
             res["results"] = [{"file_idx": x} for x in res["results"]]
-        return make_response(jsonify(res), 200)
+        return json_response(res, stream_key="results")
     else:
         status, rc, msg = "fail", 422, "invalid json"
         return make_response(jsonify({"status": status, "reason": msg}), rc)
 
 
+def _get_export_cell_value(value):
+    if value is None or isinstance(value, (str, int, float, bool, datetime.datetime)):
+        return value
+    return str(value)
+
+
+def _iter_grid_export_rows(workspace_id, bundle_info, field_idx2field, add_row_index):
+    """Yields the header and the rows of the grid export, columns in bundle order
+    :param workspace_id:
+    :param bundle_info: FieldBundle
+    :param field_idx2field: field id to Field
+    :param add_row_index: add the 0 based row number as first column
+    """
+    header = ["File Name"] + [field_idx2field[i].name for i in bundle_info.field_ids]
+    yield [""] + header if add_row_index else header
+    rows = nosql_db.iter_grid_data_from_field_values(workspace_id, bundle_info.id)
+    for idx, row in enumerate(rows):
+        values = [row.get("file_name", None)] + [
+            _get_export_cell_value(row.get(f_id, None))
+            for f_id in bundle_info.field_ids
+        ]
+        yield [idx] + values if add_row_index else values
+
+
+def _stream_csv(rows, chunk_size=500):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for idx, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if idx % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
 def download_field_bundle_grid_data(
     user,
     token_info,
     workspace_id: str,
     field_bundle_id: str,
+    export_format: str = "xlsx",
 ):
     try:
         bundle_info = nosql_db.get_field_bundle_info(field_bundle_id)
@@ -1521,35 +1568,39 @@ def download_field_bundle_grid_data(
         field_idx2field = {}
         for field in fields:
             field_idx2field[field.id] = field
-        # Reset the order of fields
-        fields = [field_idx2field[i] for i in bundle_info.field_ids]
-        # Retrieve the output from Database
-        output = nosql_db.download_grid_data_from_field_values(
+        attachment_filename = f"{ws.name} - {bundle_info.bundle_name}"
+        attachment_filename = attachment_filename.replace(".", "_")
+        if export_format == "csv":
+            rows = _iter_grid_export_rows(
+                workspace_id,
+                bundle_info,
+                field_idx2field,
+                add_row_index=False,
+            )
+            return Response(
+                stream_with_context(_stream_csv(rows)),
+                mimetype="text/csv",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{attachment_filename}.csv"',
+                },
+            )
+        # Write only workbooks flush the rows to disk as they are appended.
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=f"{bundle_info.bundle_name}")
+        rows = _iter_grid_export_rows(
             workspace_id,
-            field_bundle_id,
+            bundle_info,
+            field_idx2field,
+            add_row_index=True,
         )
-        # Construct Dataframe
-        df = pd.DataFrame(output)
-        # Add any extra cols (workflow fields which are not yet edited)
-        df_cols = list(df.columns.values)
-        cols_extra = list(set(bundle_info.field_ids) - (set(df_cols) - {"file_name"}))
-        for col_name in cols_extra:
-            df[col_name] = ""
-        # Re-arrange the order
-        df = df[["file_name"] + bundle_info.field_ids]
-        # Replace the field id with Fields names
-        rename_dict = {k: v.name for k, v in field_idx2field.items()}
-        rename_dict["file_name"] = "File Name"
-        df.rename(columns=rename_dict, inplace=True)
-
+        for row in rows:
+            worksheet.append(row)
         tempfile_handler, tempfile_location = tempfile.mkstemp(suffix=".xlsx")
         os.close(tempfile_handler)
         doc_mimetype = (
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
-        df.to_excel(tempfile_location, sheet_name=f"{bundle_info.bundle_name}")
-        attachment_filename = f"{ws.name} - {bundle_info.bundle_name}"
-        attachment_filename = attachment_filename.replace(".", "_")
+        workbook.save(tempfile_location)
         return send_from_directory(
             os.path.dirname(tempfile_location),
             os.path.basename(tempfile_location),
@@ -626,6 +626,60 @@ def autocomplete_relation_node(
     return make_response(jsonify({"status": status, "reason": msg}), rc)
 
 
+def get_field_value_history(
+    user,
+    token_info,
+    doc_id,
+    field_id,
+    field_bundle_id: str = None,
+    offset: int = 0,
+    limit: int = 20,
+):  # noqa: E501
+    """Returns the edit history of a field value, newest first
+
+     # noqa: E501
+
+    :param doc_id:
+    :param field_id:
+    :param field_bundle_id:
+    :param offset: number of entries to skip
+    :param limit: maximum number of entries to return
+    :param token_info:
+    :param user:
+
+    :rtype: Object
+    """
+    try:
+        field = nosql_db.get_field_by_id(field_id)
+        if not field:
+            return err_response(f"Field {field_id} not found", 404)
+        user_permission, _ws = nosql_db.get_user_permission(
+            field.workspace_id,
+            email=user,
+            user_json=token_info.get("user_obj", None) if token_info else None,
+        )
+        if user_permission not in ["admin", "owner", "editor", "viewer"]:
+            err_str = "Not authorized to retrieve field value history"
+            log_str = f"user {user} not authorized to retrieve field value history in workspace {field.workspace_id}"
+            logger.info(log_str)
+            return err_response(err_str, 403)
+
+        history = nosql_db.get_field_value_history(
+            field_id,
+            doc_id,
+            field_bundle_idx=field_bundle_id,
+            offset=max(offset or 0, 0),
+            limit=max(min(limit or 20, 100), 1),
+        )
+        return make_response(jsonify(history), 200)
+    except Exception as e:
+        logger.error(
+            f"error retrieving history of field {field_id} for document {doc_id}, err: {str(e)}",
+        )
+        status, rc, msg = "fail", 500, str(e)
+    return make_response(jsonify({"status": status, "reason": msg}), rc)
+
+
 def build_stats_table(
     user,
     token_info,
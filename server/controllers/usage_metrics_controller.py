@@ -8,6 +8,7 @@ from server import unauthorized_response
 from server.models.usage_metric import UsageMetric  # noqa: E501
 from server.storage import nosql_db as nosqldb
 from server.utils.metric_utils import get_catalogs
+from server.utils.metric_utils import usage_meter
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -32,6 +33,8 @@ def get_usage_metrics(user, token_info, year=None, month=None):  # noqa: E501
         user_obj = token_info.get("user_obj", None) if token_info else None
         if not user_obj:
             return unauthorized_response()
+        # Write the metered usage of this process before reading it back.
+        usage_meter.flush()
         # Retrieve the Metrics list
         metric_list = nosqldb.retrieve_usage_metrics(user_obj["id"], year, month)
         # Subscription plan for the user.
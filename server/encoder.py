@@ -1,21 +1,191 @@
+import datetime
+import logging
+import os
+import re
+import uuid
+from decimal import Decimal
+
+from bson import ObjectId
 from connexion.apps.flask_app import FlaskJSONEncoder
+from flask import current_app
+from flask import jsonify
+from flask import make_response
+from flask import Response
+from flask import stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from nlm_utils.utils import ensure_bool
 
 from server.models.base_model_ import Model
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+USE_FAST_JSON_ENCODER = ensure_bool(os.getenv("USE_FAST_JSON_ENCODER", True))
+# Arrays with at least this many items are streamed by json_response.
+JSON_STREAM_MIN_ITEMS = int(os.getenv("JSON_STREAM_MIN_ITEMS", 1000))
+JSON_STREAM_CHUNK_SIZE = 500
+NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+
+def model_to_json_dict(o, include_nulls=False):
+    """Returns the json representation of a model, None values are omitted
+    unless include_nulls is set
+    :param o: Model
+    :param include_nulls: keep the attributes with None values
+    :return: dict keyed by the json attribute names
+    """
+    dikt = {}
+    for attr, _ in o.swagger_types.items():
+        value = getattr(o, attr)
+        if value is None and not include_nulls:
+            continue
+        if attr not in o.attribute_map:
+            continue
+        attr = o.attribute_map[attr]
+        dikt[attr] = value
+    return dikt
+
 
 class JSONEncoder(FlaskJSONEncoder):
     include_nulls = False
 
     def default(self, o):
         if isinstance(o, Model):
-            dikt = {}
-            for attr, _ in o.swagger_types.items():
-                value = getattr(o, attr)
-                if value is None and not self.include_nulls:
-                    continue
-                if attr not in o.attribute_map:
-                    continue
-                attr = o.attribute_map[attr]
-                dikt[attr] = value
-            return dikt
+            return model_to_json_dict(o, self.include_nulls)
         return FlaskJSONEncoder.default(self, o)
+
+
+def _orjson_default(o):
+    if isinstance(o, Model):
+        return model_to_json_dict(o, JSONEncoder.include_nulls)
+    if isinstance(o, datetime.datetime):
+        # Same format as FlaskJSONEncoder, naive datetimes are UTC.
+        return o.isoformat("T") if o.tzinfo else o.isoformat("T") + "Z"
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (ObjectId, uuid.UUID)):
+        return str(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _escape_non_ascii(match):
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    # Surrogate pair, as json.dumps escapes it.
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def fast_dumps(obj, indent=False, sort_keys=True, ensure_ascii=True):
+    """Serializes obj with orjson. NaN and infinite floats are encoded as null.
+    :param obj: object to serialize
+    :param indent: indent with 2 spaces
+    :param sort_keys: sort the keys of dicts
+    :param ensure_ascii: escape the non ASCII characters as json.dumps does
+    :return: json string
+    """
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    text = orjson.dumps(obj, default=_orjson_default, option=option).decode("utf-8")
+    if ensure_ascii and not text.isascii():
+        # Non ASCII characters only occur within strings.
+        text = NON_ASCII_RE.sub(_escape_non_ascii, text)
+    return text
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider serializing with orjson, falls back to JSONEncoder for the
+    payloads orjson can not handle, e.g. integers larger than 64 bits.
+    Unlike JSONEncoder, NaN and infinite floats are encoded as null."""
+
+    @staticmethod
+    def default(o):
+        return JSONEncoder().default(o)
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop("indent", None)
+        separators = kwargs.pop("separators", None)
+        if (
+            not kwargs
+            and indent in (None, 2)
+            and separators in (None, (",", ":"))
+            and (indent or separators)
+        ):
+            try:
+                return fast_dumps(
+                    obj,
+                    indent=bool(indent),
+                    sort_keys=self.sort_keys,
+                    ensure_ascii=self.ensure_ascii,
+                )
+            except (orjson.JSONEncodeError, TypeError):
+                logger.info("Falling back to the default json encoder")
+        if indent is not None:
+            kwargs["indent"] = indent
+        if separators is not None:
+            kwargs["separators"] = separators
+        return super().dumps(obj, **kwargs)
+
+
+def init_json_provider(flask_app):
+    """Installs the fastest available JSON provider on the flask app
+    :param flask_app: Flask app
+    """
+    # Also used by the fallback of FastJSONProvider, in place of the encoder of connexion.
+    flask_app.json_encoder = JSONEncoder
+    if USE_FAST_JSON_ENCODER and orjson is not None:
+        flask_app.json = FastJSONProvider(flask_app)
+        logger.info("Using orjson to encode the responses")
+
+
+def _iter_json_chunks(payload, stream_key, dumps):
+    yield "{"
+    for idx, key in enumerate(sorted(payload)):
+        if idx:
+            yield ","
+        yield f"{dumps(key)}:"
+        if key != stream_key:
+            yield dumps(payload[key])
+            continue
+        items = payload[key]
+        yield "["
+        for start in range(0, len(items), JSON_STREAM_CHUNK_SIZE):
+            chunk = dumps(items[start : start + JSON_STREAM_CHUNK_SIZE])
+            # Strip the brackets of the chunk, the array is opened only once.
+            yield ("," if start else "") + chunk[1:-1]
+        yield "]"
+    yield "}\n"
+
+
+def json_response(payload, status=200, stream_key=None):
+    """Returns payload as a json response. When the array payload[stream_key] is
+    large, the response is streamed chunk by chunk instead of built as one string.
+    :param payload: dict to return
+    :param status: http status
+    :param stream_key: key of the array to stream
+    :return: Response
+    """
+    items = payload.get(stream_key, None) if stream_key else None
+    if (
+        not isinstance(items, list)
+        or len(items) < JSON_STREAM_MIN_ITEMS
+        or current_app.debug
+    ):
+        return make_response(jsonify(payload), status)
+
+    def dumps(obj):
+        return current_app.json.dumps(obj, separators=(",", ":"))
+
+    return Response(
+        stream_with_context(_iter_json_chunks(payload, stream_key, dumps)),
+        status=status,
+        mimetype="application/json",
+    )
@@ -1,8 +1,11 @@
+import collections
 import logging
 import os
+import threading
 from typing import Tuple
 
 import pandas as pd
+from nlm_utils.cache import Cache
 from nlm_utils.storage import file_storage
 
 from .services import Loader
@@ -13,6 +16,17 @@ from server.utils import str_utils
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
+# Compiled template DataFrames per (bundle_id, version), shared by the workers through redis.
+COMPILED_BUNDLE_CACHE_SIZE = int(os.getenv("COMPILED_BUNDLE_CACHE_SIZE", 64))
+compiled_bundle_cacher = Cache(
+    "RedisAgent",
+    ttl=60 * 60 * 24,  # cache bundles for 1 day
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=os.getenv("REDIS_PORT", "6379"),
+    prefix="compiled_bundle_cacher",
+)
+_compiled_bundles = collections.OrderedDict()
+_compiled_bundles_lock = threading.Lock()
 
 
 def read_template(fname):
@@ -179,6 +193,32 @@ class ContentLoader(Loader):
     #     return results
 
     def read_fieldbundle(self, field_bundle_id: str):
+        """Returns the template DataFrame of the field bundle. The compiled bundle
+        is cached in process and in redis until the bundle version changes.
+        :param field_bundle_id: id of the field bundle
+        :return: template DataFrame
+        """
+        version = self._db.get_field_bundle_version(field_bundle_id)
+        key = (field_bundle_id, version)
+        with _compiled_bundles_lock:
+            template_df = _compiled_bundles.get(key, None)
+            if template_df is not None:
+                _compiled_bundles.move_to_end(key)
+        if template_df is None:
+            template_df = self._compile_fieldbundle(
+                field_bundle_id,
+                version,
+                cache_key=f"{field_bundle_id}-{version}",
+            )
+            with _compiled_bundles_lock:
+                _compiled_bundles[key] = template_df
+                while len(_compiled_bundles) > COMPILED_BUNDLE_CACHE_SIZE:
+                    _compiled_bundles.popitem(last=False)
+        # Callers may modify the DataFrame.
+        return template_df.copy()
+
+    @compiled_bundle_cacher
+    def _compile_fieldbundle(self, field_bundle_id: str, version: int):
         bundle_name, bundle_location, workspace_id = self.resolve_field_bundle(
             field_bundle_id,
         )
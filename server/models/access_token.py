@@ -8,19 +8,20 @@ class AccessToken(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "access_token": str,
+    }
+
+    attribute_map = {
+        "access_token": "access_token",
+    }
+
     def __init__(self, access_token: str = None):  # noqa: E501
         """AccessToken - a model defined in Swagger
 
         :param access_token: The access_token of this AccessToken.  # noqa: E501
         :type access_token: str
         """
-        self.swagger_types = {
-            "access_token": str,
-        }
-
-        self.attribute_map = {
-            "access_token": "access_token",
-        }
         self._access_token = access_token
 
     @classmethod
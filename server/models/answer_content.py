@@ -9,6 +9,18 @@ class AnswerContent(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "content": AnswerSummary,
+        "labels": object,
+        "raw_scores": object,
+    }
+
+    attribute_map = {
+        "content": "content",
+        "labels": "labels",
+        "raw_scores": "rawScores",
+    }
+
     def __init__(
         self,
         content: AnswerSummary = None,
@@ -24,17 +36,6 @@ class AnswerContent(Model):
         :param raw_scores: The raw_scores of this AnswerContent.  # noqa: E501
         :type raw_scores: object
         """
-        self.swagger_types = {
-            "content": AnswerSummary,
-            "labels": object,
-            "raw_scores": object,
-        }
-
-        self.attribute_map = {
-            "content": "content",
-            "labels": "labels",
-            "raw_scores": "rawScores",
-        }
         self._content = content
         self._labels = labels
         self._raw_scores = raw_scores
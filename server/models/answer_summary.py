@@ -8,6 +8,22 @@ class AnswerSummary(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "page_idx": int,
+        "block_idx": float,
+        "block_type": str,
+        "phrase": str,
+        "header_text": str,
+    }
+
+    attribute_map = {
+        "page_idx": "pageIdx",
+        "block_idx": "blockIdx",
+        "block_type": "blockType",
+        "phrase": "phrase",
+        "header_text": "header_text",
+    }
+
     def __init__(
         self,
         page_idx: int = None,
@@ -29,21 +45,6 @@ class AnswerSummary(Model):
         :param header_text: The header_text of this AnswerSummary.  # noqa: E501
         :type header_text: str
         """
-        self.swagger_types = {
-            "page_idx": int,
-            "block_idx": float,
-            "block_type": str,
-            "phrase": str,
-            "header_text": str,
-        }
-
-        self.attribute_map = {
-            "page_idx": "pageIdx",
-            "block_idx": "blockIdx",
-            "block_type": "blockType",
-            "phrase": "phrase",
-            "header_text": "header_text",
-        }
         self._page_idx = page_idx
         self._block_idx = block_idx
         self._block_type = block_type
@@ -8,6 +8,26 @@ class AuditFv(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "doc_name": str,
+        "self_entered_cnt": str,
+        "overriden_cnt": str,
+        "total_edits": str,
+        "pct_entered": str,
+        "pct_overriden": str,
+        "pct_total": str,
+    }
+
+    attribute_map = {
+        "doc_name": "docName",
+        "self_entered_cnt": "selfEnteredCnt",
+        "overriden_cnt": "overridenCnt",
+        "total_edits": "totalEdits",
+        "pct_entered": "pctEntered",
+        "pct_overriden": "pctOverriden",
+        "pct_total": "pctTotal",
+    }
+
     def __init__(
         self,
         doc_name: str = None,
@@ -35,26 +55,6 @@ class AuditFv(Model):
         :param pct_total: The pct_total of this WorkspaceId.  # noqa: E501
         :type pct_total: str
         """
-        self.swagger_types = {
-            "doc_name": str,
-            "self_entered_cnt": str,
-            "overriden_cnt": str,
-            "total_edits": str,
-            "pct_entered": str,
-            "pct_overriden": str,
-            "pct_total": str,
-        }
-
-        self.attribute_map = {
-            "doc_name": "docName",
-            "self_entered_cnt": "selfEnteredCnt",
-            "overriden_cnt": "overridenCnt",
-            "total_edits": "totalEdits",
-            "pct_entered": "pctEntered",
-            "pct_overriden": "pctOverriden",
-            "pct_total": "pctTotal",
-        }
-
         self._doc_name = doc_name
         self._self_entered_cnt = self_entered_cnt
         self._overriden_cnt = overriden_cnt
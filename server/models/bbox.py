@@ -10,6 +10,26 @@ class BBox(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "file_idx": str,
+        "block_idx": int,
+        "page_idx": int,
+        "block_type": str,
+        "bbox": List[float],
+        "audited": bool,
+        "split": str,
+    }
+
+    attribute_map = {
+        "file_idx": "docId",
+        "block_idx": "blockId",
+        "page_idx": "pageId",
+        "block_type": "blockType",
+        "bbox": "bbox",
+        "audited": "audited",
+        "split": "split",
+    }
+
     def __init__(
         self,
         file_idx: str = None,
@@ -39,25 +59,6 @@ class BBox(Model):
         :param split: The split of this BBox.  # noqa: E501
         :type split: str
         """
-        self.swagger_types = {
-            "file_idx": str,
-            "block_idx": int,
-            "page_idx": int,
-            "block_type": str,
-            "bbox": List[float],
-            "audited": bool,
-            "split": str,
-        }
-
-        self.attribute_map = {
-            "file_idx": "docId",
-            "block_idx": "blockId",
-            "page_idx": "pageId",
-            "block_type": "blockType",
-            "bbox": "bbox",
-            "audited": "audited",
-            "split": "split",
-        }
         self._file_idx = file_idx
         self._block_idx = block_idx
         self._page_idx = page_idx
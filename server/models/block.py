@@ -14,6 +14,21 @@ class Block(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'block_idx': float,
+        'page_idx': float,
+        'block_text': str,
+        'header_text': str
+    }
+
+    attribute_map = {
+        'block_idx': 'blockIdx',
+        'page_idx': 'pageIdx',
+        'block_text': 'blockText',
+        'header_text': 'headerText'
+    }
+
     def __init__(self, block_idx: float=None, page_idx: float=None, block_text: str=None, header_text: str=None):  # noqa: E501
         """Block - a model defined in Swagger
 
@@ -26,19 +41,6 @@ class Block(Model):
         :param header_text: The header_text of this Block.  # noqa: E501
         :type header_text: str
         """
-        self.swagger_types = {
-            'block_idx': float,
-            'page_idx': float,
-            'block_text': str,
-            'header_text': str
-        }
-
-        self.attribute_map = {
-            'block_idx': 'blockIdx',
-            'page_idx': 'pageIdx',
-            'block_text': 'blockText',
-            'header_text': 'headerText'
-        }
         self._block_idx = block_idx
         self._page_idx = page_idx
         self._block_text = block_text
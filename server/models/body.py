@@ -11,19 +11,21 @@ class Body(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'file': str
+    }
+
+    attribute_map = {
+        'file': 'file'
+    }
+
     def __init__(self, file: str=None):  # noqa: E501
         """Body - a model defined in Swagger
 
         :param file: The file of this Body.  # noqa: E501
         :type file: str
         """
-        self.swagger_types = {
-            'file': str
-        }
-
-        self.attribute_map = {
-            'file': 'file'
-        }
         self._file = file
 
     @classmethod
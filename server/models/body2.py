@@ -11,6 +11,19 @@ class Body2(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'bundle_name': str,
+        'workspace_id': str,
+        'user_id': str
+    }
+
+    attribute_map = {
+        'bundle_name': 'bundleName',
+        'workspace_id': 'workspaceId',
+        'user_id': 'userId'
+    }
+
     def __init__(self, bundle_name: str=None, workspace_id: str=None, user_id: str=None):  # noqa: E501
         """Body2 - a model defined in Swagger
 
@@ -21,17 +34,6 @@ class Body2(Model):
         :param user_id: The user_id of this Body2.  # noqa: E501
         :type user_id: str
         """
-        self.swagger_types = {
-            'bundle_name': str,
-            'workspace_id': str,
-            'user_id': str
-        }
-
-        self.attribute_map = {
-            'bundle_name': 'bundleName',
-            'workspace_id': 'workspaceId',
-            'user_id': 'userId'
-        }
         self._bundle_name = bundle_name
         self._workspace_id = workspace_id
         self._user_id = user_id
@@ -10,6 +10,40 @@ class Criteria(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "question": str,
+        "templates": List[str],
+        "headers": List[str],
+        "expected_answer_type": str,
+        "group_flag": str,
+        "table_flag": str,
+        "page_start": int,
+        "page_end": int,
+        "criteria_rank": int,
+        "enable_similar_search": bool,
+        "entity_types": List[str],
+        "additional_questions": List[str],
+        "before_context_window": int,
+        "after_context_window": int,
+    }
+
+    attribute_map = {
+        "question": "question",
+        "templates": "templates",
+        "headers": "headers",
+        "expected_answer_type": "expectedAnswerType",
+        "group_flag": "groupFlag",
+        "table_flag": "tableFlag",
+        "page_start": "pageStart",
+        "page_end": "pageEnd",
+        "criteria_rank": "criteriaRank",
+        "enable_similar_search": "enableSimilarSearch",
+        "entity_types": "entityTypes",
+        "additional_questions": "additionalQuestions",
+        "before_context_window": "beforeContextWindow",
+        "after_context_window": "afterContextWindow",
+    }
+
     def __init__(
         self,
         question: str = "",
@@ -59,40 +93,6 @@ class Criteria(Model):
         :param after_context_window: The after_context_window of this Criteria.  # noqa: E501
         :type after_context_window: int
         """
-        self.swagger_types = {
-            "question": str,
-            "templates": List[str],
-            "headers": List[str],
-            "expected_answer_type": str,
-            "group_flag": str,
-            "table_flag": str,
-            "page_start": int,
-            "page_end": int,
-            "criteria_rank": int,
-            "enable_similar_search": bool,
-            "entity_types": List[str],
-            "additional_questions": List[str],
-            "before_context_window": int,
-            "after_context_window": int,
-        }
-
-        self.attribute_map = {
-            "question": "question",
-            "templates": "templates",
-            "headers": "headers",
-            "expected_answer_type": "expectedAnswerType",
-            "group_flag": "groupFlag",
-            "table_flag": "tableFlag",
-            "page_start": "pageStart",
-            "page_end": "pageEnd",
-            "criteria_rank": "criteriaRank",
-            "enable_similar_search": "enableSimilarSearch",
-            "entity_types": "entityTypes",
-            "additional_questions": "additionalQuestions",
-            "before_context_window": "beforeContextWindow",
-            "after_context_window": "afterContextWindow",
-        }
-
         self._question = question
         self._templates = templates
         self._headers = headers
@@ -8,6 +8,16 @@ class DeveloperApiKey(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "api_key": str,
+        "app_id": str,
+    }
+
+    attribute_map = {
+        "api_key": "api_key",
+        "app_id": "app_id",
+    }
+
     def __init__(self, api_key: str = None, app_id: str = None):  # noqa: E501
         """DeveloperApiKey - a model defined in Swagger
 
@@ -16,15 +26,6 @@ class DeveloperApiKey(Model):
         :param app_id: The app_id of this DeveloperApiKey.  # noqa: E501
         :type app_id: str
         """
-        self.swagger_types = {
-            "api_key": str,
-            "app_id": str,
-        }
-
-        self.attribute_map = {
-            "api_key": "api_key",
-            "app_id": "app_id",
-        }
         self._api_key = api_key
         self._app_id = app_id
 
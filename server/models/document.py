@@ -10,6 +10,50 @@ class Document(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "title": str,
+        "name": str,
+        "doc_location": str,
+        "user_id": str,
+        "workspace_id": str,
+        "parent_folder": str,
+        "file_size": float,
+        "mime_type": str,
+        "checksum": str,
+        "created_on": datetime,
+        "is_deleted": bool,
+        "status": str,
+        "rendered_file_location": str,
+        "rendered_json_file_location": str,
+        "source_url": str,
+        "update": bool,
+        "inferred_title": str,
+        "meta": object,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "title": "title",
+        "name": "name",
+        "doc_location": "docLocation",
+        "user_id": "userId",
+        "workspace_id": "workspaceId",
+        "parent_folder": "parentFolder",
+        "file_size": "fileSize",
+        "mime_type": "mimeType",
+        "checksum": "checksum",
+        "created_on": "createdOn",
+        "is_deleted": "isDeleted",
+        "status": "status",
+        "rendered_file_location": "renderedFileLocation",
+        "rendered_json_file_location": "renderedJsonFileLocation",
+        "source_url": "sourceUrl",
+        "update": "update",
+        "inferred_title": "inferred_title",
+        "meta": "meta",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -72,49 +116,6 @@ class Document(Model):
         :param inferred_title: The inferred_title of this Document.  # noqa: E501
         :type inferred_title: str
         """
-        self.swagger_types = {
-            "id": str,
-            "title": str,
-            "name": str,
-            "doc_location": str,
-            "user_id": str,
-            "workspace_id": str,
-            "parent_folder": str,
-            "file_size": float,
-            "mime_type": str,
-            "checksum": str,
-            "created_on": datetime,
-            "is_deleted": bool,
-            "status": str,
-            "rendered_file_location": str,
-            "rendered_json_file_location": str,
-            "source_url": str,
-            "update": bool,
-            "inferred_title": str,
-            "meta": object,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "title": "title",
-            "name": "name",
-            "doc_location": "docLocation",
-            "user_id": "userId",
-            "workspace_id": "workspaceId",
-            "parent_folder": "parentFolder",
-            "file_size": "fileSize",
-            "mime_type": "mimeType",
-            "checksum": "checksum",
-            "created_on": "createdOn",
-            "is_deleted": "isDeleted",
-            "status": "status",
-            "rendered_file_location": "renderedFileLocation",
-            "rendered_json_file_location": "renderedJsonFileLocation",
-            "source_url": "sourceUrl",
-            "update": "update",
-            "inferred_title": "inferred_title",
-            "meta": "meta",
-        }
         self._id = id
         self._title = title
         self._name = name
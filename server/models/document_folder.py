@@ -14,6 +14,24 @@ class DocumentFolder(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'name': str,
+        'workspace_id': str,
+        'parent_folder': str,
+        'created_on': datetime,
+        'is_deleted': bool
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'name': 'name',
+        'workspace_id': 'workspaceId',
+        'parent_folder': 'parentFolder',
+        'created_on': 'createdOn',
+        'is_deleted': 'isDeleted'
+    }
+
     def __init__(self, id: str = None, name: str = None, workspace_id: str = None, parent_folder: str = None,
                  created_on: datetime = None, is_deleted: bool = None):  # noqa: E501
         """DocumentFolder - a model defined in Swagger
@@ -31,23 +49,6 @@ class DocumentFolder(Model):
         :param is_deleted: The is_deleted of this DocumentFolder.  # noqa: E501
         :type is_deleted: bool
         """
-        self.swagger_types = {
-            'id': str,
-            'name': str,
-            'workspace_id': str,
-            'parent_folder': str,
-            'created_on': datetime,
-            'is_deleted': bool
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'name': 'name',
-            'workspace_id': 'workspaceId',
-            'parent_folder': 'parentFolder',
-            'created_on': 'createdOn',
-            'is_deleted': 'isDeleted'
-        }
         self._id = id
         self._name = name
         self._workspace_id = workspace_id
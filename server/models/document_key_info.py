@@ -13,6 +13,22 @@ class DocumentKeyInfo(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "section_summary": List[SectionSummary],
+        "key_value_pairs": List[KeyValuePair],
+        "metadata": List[KeyValuePair],
+        "doc_ent": Dict,
+        "reference_definitions": Dict,
+    }
+
+    attribute_map = {
+        "section_summary": "sectionSummary",
+        "key_value_pairs": "keyValuePairs",
+        "metadata": "metadata",
+        "doc_ent": "docEnt",
+        "reference_definitions": "referenceDefinitions",
+    }
+
     def __init__(
         self,
         section_summary: List[SectionSummary] = None,
@@ -35,22 +51,6 @@ class DocumentKeyInfo(Model):
         :param reference_definitions: The reference_definitions of this DocumentKeyInfo.  # noqa: E501
         :type reference_definitions: Dict
         """
-        self.swagger_types = {
-            "section_summary": List[SectionSummary],
-            "key_value_pairs": List[KeyValuePair],
-            "metadata": List[KeyValuePair],
-            "doc_ent": Dict,
-            "reference_definitions": Dict,
-        }
-
-        self.attribute_map = {
-            "section_summary": "sectionSummary",
-            "key_value_pairs": "keyValuePairs",
-            "metadata": "metadata",
-            "doc_ent": "docEnt",
-            "reference_definitions": "referenceDefinitions",
-        }
-
         self._section_summary = section_summary
         self._key_value_pairs = key_value_pairs
         self._metadata = metadata
@@ -11,6 +11,40 @@ class Field(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "name": str,
+        "active": bool,
+        "user_id": str,
+        "workspace_id": str,
+        "is_user_defined": bool,
+        "is_entered_field": bool,
+        "parent_bundle_id": str,
+        "data_type": str,
+        "options": object,
+        "status": object,
+        "search_criteria": SearchCriteria,
+        "distinct_values": List[str],
+        "is_dependent_field": bool,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "name": "name",
+        "active": "active",
+        "user_id": "userId",
+        "workspace_id": "workspaceId",
+        "is_user_defined": "isUserDefined",
+        "is_entered_field": "isEnteredField",
+        "parent_bundle_id": "parentBundleId",
+        "data_type": "dataType",
+        "options": "options",
+        "status": "status",
+        "search_criteria": "searchCriteria",
+        "distinct_values": "distinctValues",
+        "is_dependent_field": "isDependentField",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -60,40 +94,6 @@ class Field(Model):
         :param is_dependent_field: The is_dependent_field of this Field.  # noqa: E501
         :type is_dependent_field: bool
         """
-        self.swagger_types = {
-            "id": str,
-            "name": str,
-            "active": bool,
-            "user_id": str,
-            "workspace_id": str,
-            "is_user_defined": bool,
-            "is_entered_field": bool,
-            "parent_bundle_id": str,
-            "data_type": str,
-            "options": object,
-            "status": object,
-            "search_criteria": SearchCriteria,
-            "distinct_values": List[str],
-            "is_dependent_field": bool,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "name": "name",
-            "active": "active",
-            "user_id": "userId",
-            "workspace_id": "workspaceId",
-            "is_user_defined": "isUserDefined",
-            "is_entered_field": "isEnteredField",
-            "parent_bundle_id": "parentBundleId",
-            "data_type": "dataType",
-            "options": "options",
-            "status": "status",
-            "search_criteria": "searchCriteria",
-            "distinct_values": "distinctValues",
-            "is_dependent_field": "isDependentField",
-        }
-
         self._id = id
         self._name = name
         self._active = active
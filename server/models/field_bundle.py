@@ -11,6 +11,36 @@ class FieldBundle(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "bundle_name": str,
+        "id": str,
+        "created_on": datetime,
+        "parent_bundle_id": str,
+        "user_id": str,
+        "workspace_id": str,
+        "active": bool,
+        "cached_file": str,
+        "bundle_type": str,
+        "tags": List[str],
+        "field_ids": List[str],
+        "workspace_filter_ids": List[str],
+    }
+
+    attribute_map = {
+        "bundle_name": "bundleName",
+        "id": "id",
+        "created_on": "createdOn",
+        "parent_bundle_id": "parentBundleId",
+        "user_id": "userId",
+        "workspace_id": "workspaceId",
+        "active": "active",
+        "cached_file": "cachedFile",
+        "bundle_type": "bundleType",
+        "tags": "tags",
+        "field_ids": "fieldIds",
+        "workspace_filter_ids": "workspaceFilterIds",
+    }
+
     def __init__(
         self,
         bundle_name: str = None,
@@ -54,36 +84,6 @@ class FieldBundle(Model):
         :param workspace_filter_ids: The workspace_filter_ids of this FieldBundle.  # noqa: E501
         :type workspace_filter_ids: List[str]
         """
-        self.swagger_types = {
-            "bundle_name": str,
-            "id": str,
-            "created_on": datetime,
-            "parent_bundle_id": str,
-            "user_id": str,
-            "workspace_id": str,
-            "active": bool,
-            "cached_file": str,
-            "bundle_type": str,
-            "tags": List[str],
-            "field_ids": List[str],
-            "workspace_filter_ids": List[str],
-        }
-
-        self.attribute_map = {
-            "bundle_name": "bundleName",
-            "id": "id",
-            "created_on": "createdOn",
-            "parent_bundle_id": "parentBundleId",
-            "user_id": "userId",
-            "workspace_id": "workspaceId",
-            "active": "active",
-            "cached_file": "cachedFile",
-            "bundle_type": "bundleType",
-            "tags": "tags",
-            "field_ids": "fieldIds",
-            "workspace_filter_ids": "workspaceFilterIds",
-        }
-
         self._bundle_name = bundle_name
         self._id = id
         self._created_on = created_on
@@ -15,6 +15,31 @@ class FieldBundleContent(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'bundle_name': str,
+        'id': str,
+        'created_on': datetime,
+        'parent_bundle_id': str,
+        'user_id': str,
+        'workspace_id': str,
+        'active': bool,
+        'cached_file': str,
+        'fields': List
+    }
+
+    attribute_map = {
+        'bundle_name': 'bundleName',
+        'id': 'id',
+        'created_on': 'createdOn',
+        'parent_bundle_id': 'parentBundleId',
+        'user_id': 'userId',
+        'workspace_id': 'workspaceId',
+        'active': 'active',
+        'cached_file': 'cachedFile',
+        'fields': 'fields'
+    }
+
     def __init__(self, bundle_name: str=None, id: str=None, created_on: datetime=None, parent_bundle_id: str=None, user_id: str=None, workspace_id: str=None, active: bool=None, cached_file: str=None, fields: List=None):  # noqa: E501
         """FieldBundleContent - a model defined in Swagger
 
@@ -35,29 +60,6 @@ class FieldBundleContent(Model):
         :param fields: The fields of this FieldBundleContent.  # noqa: E501
         :type fields: List
         """
-        self.swagger_types = {
-            'bundle_name': str,
-            'id': str,
-            'created_on': datetime,
-            'parent_bundle_id': str,
-            'user_id': str,
-            'workspace_id': str,
-            'active': bool,
-            'cached_file': str,
-            'fields': List
-        }
-
-        self.attribute_map = {
-            'bundle_name': 'bundleName',
-            'id': 'id',
-            'created_on': 'createdOn',
-            'parent_bundle_id': 'parentBundleId',
-            'user_id': 'userId',
-            'workspace_id': 'workspaceId',
-            'active': 'active',
-            'cached_file': 'cachedFile',
-            'fields': 'fields'
-        }
         self._bundle_name = bundle_name
         self._id = id
         self._created_on = created_on
@@ -15,6 +15,29 @@ class FieldContent(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'id': str,
+        'name': str,
+        'active': bool,
+        'user_id': str,
+        'workspace_id': str,
+        'is_user_defined': bool,
+        'parent_bundle_id': str,
+        'templates': List
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'name': 'name',
+        'active': 'active',
+        'user_id': 'userId',
+        'workspace_id': 'workspaceId',
+        'is_user_defined': 'isUserDefined',
+        'parent_bundle_id': 'parentBundleId',
+        'templates': 'templates'
+    }
+
     def __init__(self, id: str=None, name: str=None, active: bool=True, user_id: str=None, workspace_id: str=None, is_user_defined: bool=None, parent_bundle_id: str=None, templates: List=None, is_entered_field=None):  # noqa: E501
         """FieldContent - a model defined in Swagger
 
@@ -35,27 +58,6 @@ class FieldContent(Model):
         :param templates: The templates of this FieldContent.  # noqa: E501
         :type templates: List 
         """
-        self.swagger_types = {
-            'id': str,
-            'name': str,
-            'active': bool,
-            'user_id': str,
-            'workspace_id': str,
-            'is_user_defined': bool,
-            'parent_bundle_id': str,
-            'templates': List
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'name': 'name',
-            'active': 'active',
-            'user_id': 'userId',
-            'workspace_id': 'workspaceId',
-            'is_user_defined': 'isUserDefined',
-            'parent_bundle_id': 'parentBundleId',
-            'templates': 'templates'
-        }
         self._id = id
         self._name = name
         self._active = active
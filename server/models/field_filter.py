@@ -8,6 +8,16 @@ class FieldFilter(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "field_bundle_id": str,
+        "filter_model": object,
+    }
+
+    attribute_map = {
+        "field_bundle_id": "fieldBundleId",
+        "filter_model": "filterModel",
+    }
+
     def __init__(
         self,
         field_bundle_id: str = "",
@@ -21,16 +31,6 @@ class FieldFilter(Model):
         :param filter_model: The templates of this Criteria.  # noqa: E501
         :type filter_model: object
         """
-        self.swagger_types = {
-            "field_bundle_id": str,
-            "filter_model": object,
-        }
-
-        self.attribute_map = {
-            "field_bundle_id": "fieldBundleId",
-            "filter_model": "filterModel",
-        }
-
         self._field_bundle_id = field_bundle_id
         self._filter_model = filter_model
 
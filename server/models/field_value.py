@@ -10,6 +10,28 @@ class FieldValue(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "doc_id": str,
+        "workspace_id": str,
+        "field_bundle_id": str,
+        "field_id": str,
+        "selected_row": object,
+        "history": List[object],
+        "doc_name": str,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "doc_id": "docId",
+        "workspace_id": "workspaceId",
+        "field_bundle_id": "fieldBundleId",
+        "field_id": "fieldId",
+        "selected_row": "selectedRow",
+        "history": "history",
+        "doc_name": "docName",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -40,27 +62,6 @@ class FieldValue(Model):
         :param doc_name: The doc_name of this FieldValue.  # noqa: E501
         :type doc_name: str
         """
-        self.swagger_types = {
-            "id": str,
-            "doc_id": str,
-            "workspace_id": str,
-            "field_bundle_id": str,
-            "field_id": str,
-            "selected_row": object,
-            "history": List[object],
-            "doc_name": str,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "doc_id": "docId",
-            "workspace_id": "workspaceId",
-            "field_bundle_id": "fieldBundleId",
-            "field_id": "fieldId",
-            "selected_row": "selectedRow",
-            "history": "history",
-            "doc_name": "docName",
-        }
         self._id = id
         self._field_id = field_id
         self._selected_row = selected_row
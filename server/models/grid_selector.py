@@ -10,6 +10,30 @@ class GridSelector(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "workspace_id": str,
+        "field_bundle_id": str,
+        "doc_ids": List[str],
+        "field_ids": List[str],
+        "overwrite_cache": str,
+        "grid_query": object,
+        "distinct_field": str,
+        "return_top_fact_answer": bool,
+        "continuation_token": str,
+    }
+
+    attribute_map = {
+        "workspace_id": "workspaceId",
+        "field_bundle_id": "fieldBundleId",
+        "doc_ids": "docIds",
+        "field_ids": "fieldIds",
+        "overwrite_cache": "overwriteCache",
+        "grid_query": "gridQuery",
+        "distinct_field": "distinctField",
+        "return_top_fact_answer": "returnTopFactAnswer",
+        "continuation_token": "continuationToken",
+    }
+
     def __init__(
         self,
         workspace_id: str = None,
@@ -20,6 +44,7 @@ class GridSelector(Model):
         grid_query: object = None,
         distinct_field: str = None,
         return_top_fact_answer: bool = False,
+        continuation_token: str = None,
     ):  # noqa: E501
         """GridSelector - a model defined in Swagger
 
@@ -39,28 +64,9 @@ class GridSelector(Model):
         :type distinct_field: str
         :param return_top_fact_answer: The return_top_fact_answer of this GridSelector.  # noqa: E501
         :type return_top_fact_answer: boolean
+        :param continuation_token: The continuation_token of this GridSelector.  # noqa: E501
+        :type continuation_token: str
         """
-        self.swagger_types = {
-            "workspace_id": str,
-            "field_bundle_id": str,
-            "doc_ids": List[str],
-            "field_ids": List[str],
-            "overwrite_cache": str,
-            "grid_query": object,
-            "distinct_field": str,
-            "return_top_fact_answer": bool,
-        }
-
-        self.attribute_map = {
-            "workspace_id": "workspaceId",
-            "field_bundle_id": "fieldBundleId",
-            "doc_ids": "docIds",
-            "field_ids": "fieldIds",
-            "overwrite_cache": "overwriteCache",
-            "grid_query": "gridQuery",
-            "distinct_field": "distinctField",
-            "return_top_fact_answer": "returnTopFactAnswer",
-        }
         self._workspace_id = workspace_id
         self._field_bundle_id = field_bundle_id
         self._doc_ids = doc_ids
@@ -69,6 +75,7 @@ class GridSelector(Model):
         self._grid_query = grid_query
         self._distinct_field = distinct_field
         self._return_top_fact_answer = return_top_fact_answer or False
+        self._continuation_token = continuation_token
 
     @classmethod
     def from_dict(cls, dikt) -> "GridSelector":
@@ -248,3 +255,24 @@ class GridSelector(Model):
         """
 
         self._return_top_fact_answer = return_top_fact_answer
+
+    @property
+    def continuation_token(self) -> str:
+        """Gets the continuation_token of this GridSelector.
+
+
+        :return: The continuation_token of this GridSelector.
+        :rtype: str
+        """
+        return self._continuation_token
+
+    @continuation_token.setter
+    def continuation_token(self, continuation_token: str):
+        """Sets the continuation_token of this GridSelector.
+
+
+        :param continuation_token: The continuation_token of this GridSelector.
+        :type continuation_token: str
+        """
+
+        self._continuation_token = continuation_token
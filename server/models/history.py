@@ -10,6 +10,24 @@ class History(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "doc_id": str,
+        "workspace_id": str,
+        "timestamp": datetime,
+        "action": str,
+        "details": dict,
+    }
+
+    attribute_map = {
+        "user_id": "user_id",
+        "doc_id": "doc_id",
+        "workspace_id": "workspace_id",
+        "timestamp": "timestamp",
+        "action": "action",
+        "details": "details",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -29,23 +47,6 @@ class History(Model):
         :param id: The id of this History.  # noqa: E501
         :type id: str
         """
-        self.swagger_types = {
-            "user_id": str,
-            "doc_id": str,
-            "workspace_id": str,
-            "timestamp": datetime,
-            "action": str,
-            "details": dict,
-        }
-
-        self.attribute_map = {
-            "user_id": "user_id",
-            "doc_id": "doc_id",
-            "workspace_id": "workspace_id",
-            "timestamp": "timestamp",
-            "action": "action",
-            "details": "details",
-        }
         self._doc_id = doc_id
         self._workspace_id = workspace_id
         self._user_id = user_id
@@ -11,6 +11,17 @@ class IdWithMessage(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'id': str,
+        'message': str
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'message': 'message'
+    }
+
     def __init__(self, id: str=None, message: str=None):  # noqa: E501
         """IdWithMessage - a model defined in Swagger
 
@@ -19,15 +30,6 @@ class IdWithMessage(Model):
         :param message: The message of this IdWithMessage.  # noqa: E501
         :type message: str
         """
-        self.swagger_types = {
-            'id': str,
-            'message': str
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'message': 'message'
-        }
         self._id = id
         self._message = message
 
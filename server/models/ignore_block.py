@@ -8,6 +8,18 @@ class IgnoreBlock(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "ignore_text": str,
+        "ignore_all_after": bool,
+        "block_type": str,
+    }
+
+    attribute_map = {
+        "ignore_text": "ignoreText",
+        "ignore_all_after": "ignoreAllAfter",
+        "block_type": "blockType",
+    }
+
     def __init__(
         self,
         ignore_text: str = None,
@@ -23,17 +35,6 @@ class IgnoreBlock(Model):
         :param block_type: The block_type of this IgnoreBlock.  # noqa: E501
         :type block_type: str
         """
-        self.swagger_types = {
-            "ignore_text": str,
-            "ignore_all_after": bool,
-            "block_type": str,
-        }
-
-        self.attribute_map = {
-            "ignore_text": "ignoreText",
-            "ignore_all_after": "ignoreAllAfter",
-            "block_type": "blockType",
-        }
         self._ignore_text = ignore_text
         self._ignore_all_after = ignore_all_after
         self._block_type = block_type
@@ -14,6 +14,23 @@ class IngestTableTestCase(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'doc_id': str,
+        'user_id': str,
+        'workspace_id': str,
+        'html_text': str,
+        'tag': str
+    }
+
+    attribute_map = {
+        'doc_id': 'doc_id',
+        'user_id': 'user_id',
+        'workspace_id': 'workspace_id',
+        'html_text': 'html_text',
+        'tag': 'tag'
+    }
+
     def __init__(self, doc_id: str=None, user_id: str=None, workspace_id: str=None, html_text: str=None, tag: str=None):  # noqa: E501
         """IngestTableTestCase - a model defined in Swagger
 
@@ -28,21 +45,6 @@ class IngestTableTestCase(Model):
         :param tag: The tag of this IngestTableTestCase.  # noqa: E501
         :type tag: str
         """
-        self.swagger_types = {
-            'doc_id': str,
-            'user_id': str,
-            'workspace_id': str,
-            'html_text': str,
-            'tag': str
-        }
-
-        self.attribute_map = {
-            'doc_id': 'doc_id',
-            'user_id': 'user_id',
-            'workspace_id': 'workspace_id',
-            'html_text': 'html_text',
-            'tag': 'tag'
-        }
         self._doc_id = doc_id
         self._user_id = user_id
         self._workspace_id = workspace_id
@@ -14,6 +14,33 @@ class IngestTestCase(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'correct': bool,
+        'correct_text': str,
+        'correct_type': str,
+        'block_text': str,
+        'block_type': str,
+        'block_html': str,
+        'page_idx': int,
+        'document_id': str,
+        'workspace_id': str,
+        'user_id': str
+    }
+
+    attribute_map = {
+        'correct': 'correct',
+        'correct_text': 'correctText',
+        'correct_type': 'correctType',
+        'block_text': 'blockText',
+        'block_type': 'blockType',
+        'block_html': 'blockHtml',
+        'page_idx': 'pageIdx',
+        'document_id': 'documentId',
+        'workspace_id': 'workspaceId',
+        'user_id': 'userId'
+    }
+
     def __init__(self, correct: bool=None, correct_text: str=None, correct_type: str=None, block_text: str=None, block_type: str=None, block_html: str=None, page_idx: int=None, document_id: str=None, workspace_id: str=None, user_id: str=None):  # noqa: E501
         """IngestTestCase - a model defined in Swagger
 
@@ -38,31 +65,6 @@ class IngestTestCase(Model):
         :param user_id: The user_id of this IngestTestCase.  # noqa: E501
         :type user_id: str
         """
-        self.swagger_types = {
-            'correct': bool,
-            'correct_text': str,
-            'correct_type': str,
-            'block_text': str,
-            'block_type': str,
-            'block_html': str,
-            'page_idx': int,
-            'document_id': str,
-            'workspace_id': str,
-            'user_id': str
-        }
-
-        self.attribute_map = {
-            'correct': 'correct',
-            'correct_text': 'correctText',
-            'correct_type': 'correctType',
-            'block_text': 'blockText',
-            'block_type': 'blockType',
-            'block_html': 'blockHtml',
-            'page_idx': 'pageIdx',
-            'document_id': 'documentId',
-            'workspace_id': 'workspaceId',
-            'user_id': 'userId'
-        }
         self._correct = correct
         self._correct_text = correct_text
         self._correct_type = correct_type
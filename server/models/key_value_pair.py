@@ -15,6 +15,21 @@ class KeyValuePair(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'block': Block,
+        'all_quoted_words': List[str],
+        'key': str,
+        'value': str
+    }
+
+    attribute_map = {
+        'block': 'block',
+        'all_quoted_words': 'all_quoted_words',
+        'key': 'key',
+        'value': 'value'
+    }
+
     def __init__(self, block: Block=None, all_quoted_words: List[str]=None, key: str=None, value: str=None):  # noqa: E501
         """KeyValuePair - a model defined in Swagger
 
@@ -27,19 +42,6 @@ class KeyValuePair(Model):
         :param value: The value of this KeyValuePair.  # noqa: E501
         :type value: str
         """
-        self.swagger_types = {
-            'block': Block,
-            'all_quoted_words': List[str],
-            'key': str,
-            'value': str
-        }
-
-        self.attribute_map = {
-            'block': 'block',
-            'all_quoted_words': 'all_quoted_words',
-            'key': 'key',
-            'value': 'value'
-        }
         self._block = block
         self._all_quoted_words = all_quoted_words
         self._key = key
@@ -8,6 +8,22 @@ class MetricData(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "catalog_id": str,
+        "feature": str,
+        "used": str,
+        "quota": str,
+        "percent_used": str,
+    }
+
+    attribute_map = {
+        "catalog_id": "catalog_id",
+        "feature": "feature",
+        "used": "used",
+        "quota": "quota",
+        "percent_used": "percentUsed",
+    }
+
     def __init__(
         self,
         catalog_id: str = None,
@@ -29,21 +45,6 @@ class MetricData(Model):
         :param percent_used: The percent_used of this MetricData.  # noqa: E501
         :type percent_used: str
         """
-        self.swagger_types = {
-            "catalog_id": str,
-            "feature": str,
-            "used": str,
-            "quota": str,
-            "percent_used": str,
-        }
-
-        self.attribute_map = {
-            "catalog_id": "catalog_id",
-            "feature": "feature",
-            "used": "used",
-            "quota": "quota",
-            "percent_used": "percentUsed",
-        }
         self._catalog_id = catalog_id
         self._feature = feature
         self._used = used
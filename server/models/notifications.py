@@ -10,6 +10,24 @@ class Notifications(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "user_id": str,
+        "is_read": bool,
+        "notify_action": str,
+        "created_on": datetime,
+        "notify_params": object,
+    }
+
+    attribute_map = {
+        "id": "_id",
+        "user_id": "user_id",
+        "is_read": "is_read",
+        "notify_action": "notify_action",
+        "created_on": "created_on",
+        "notify_params": "notify_params",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -35,23 +53,6 @@ class Notifications(Model):
         :param notify_params: The notify_params of this Notifications.  # noqa: E501
         :type notify_params: object
         """
-        self.swagger_types = {
-            "id": str,
-            "user_id": str,
-            "is_read": bool,
-            "notify_action": str,
-            "created_on": datetime,
-            "notify_params": object,
-        }
-
-        self.attribute_map = {
-            "id": "_id",
-            "user_id": "user_id",
-            "is_read": "is_read",
-            "notify_action": "notify_action",
-            "created_on": "created_on",
-            "notify_params": "notify_params",
-        }
         self._id = id
         self._user_id = user_id
         self._is_read = is_read
@@ -14,6 +14,17 @@ class PreferedWorkspace(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'default_workspace_id': str,
+        'user_id': str
+    }
+
+    attribute_map = {
+        'default_workspace_id': 'defaultWorkspaceId',
+        'user_id': 'userId'
+    }
+
     def __init__(self, default_workspace_id: str=None, user_id: str=None):  # noqa: E501
         """PreferedWorkspace - a model defined in Swagger
 
@@ -22,15 +33,6 @@ class PreferedWorkspace(Model):
         :param user_id: The user_id of this PreferedWorkspace.  # noqa: E501
         :type user_id: str
         """
-        self.swagger_types = {
-            'default_workspace_id': str,
-            'user_id': str
-        }
-
-        self.attribute_map = {
-            'default_workspace_id': 'defaultWorkspaceId',
-            'user_id': 'userId'
-        }
         self._default_workspace_id = default_workspace_id
         self._user_id = user_id
 
@@ -10,6 +10,28 @@ class Prompt(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "doc_id": str,
+        "workspace_id": str,
+        "query_scope": str,
+        "prompt_type": str,
+        "title": str,
+        "subtitle": str,
+        "search_criteria": object,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "doc_id": "docId",
+        "workspace_id": "workspaceId",
+        "query_scope": "queryScope",
+        "prompt_type": "promptType",
+        "title": "title",
+        "subtitle": "subtitle",
+        "search_criteria": "searchCriteria",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -47,28 +69,6 @@ class Prompt(Model):
         :param search_criteria: The timestamp of this Prompt.  # noqa: E501
         :type search_criteria: object
         """
-        self.swagger_types = {
-            "id": str,
-            "doc_id": str,
-            "workspace_id": str,
-            "query_scope": str,
-            "prompt_type": str,
-            "title": str,
-            "subtitle": str,
-            "search_criteria": object,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "doc_id": "docId",
-            "workspace_id": "workspaceId",
-            "query_scope": "queryScope",
-            "prompt_type": "promptType",
-            "title": "title",
-            "subtitle": "subtitle",
-            "search_criteria": "searchCriteria",
-        }
-
         self._id = id
         self._user_id = user_id
         self._doc_id = doc_id or ""
@@ -8,6 +8,16 @@ class RenameDoc(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "document_id": str,
+        "new_name": str,
+    }
+
+    attribute_map = {
+        "document_id": "documentId",
+        "new_name": "newName",
+    }
+
     def __init__(self, document_id: str = None, new_name: str = None):  # noqa: E501
         """RenameDoc - a model defined in Swagger
 
@@ -16,15 +26,6 @@ class RenameDoc(Model):
         :param new_name: The new_name of this RenameDoc.  # noqa: E501
         :type new_name: str
         """
-        self.swagger_types = {
-            "document_id": str,
-            "new_name": str,
-        }
-
-        self.attribute_map = {
-            "document_id": "documentId",
-            "new_name": "newName",
-        }
         self._document_id = document_id
         self._new_name = new_name
 
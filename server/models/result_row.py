@@ -14,6 +14,37 @@ class ResultRow(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'file_id': str,
+        'file_name': str,
+        'phrase': str,
+        'match_idx': float,
+        'page_idx': float,
+        'level': str,
+        'answer': str,
+        'formatted_answer': str,
+        'match_score': float,
+        'answer_score': float,
+        'scaled_score': float,
+        'question_score': float
+    }
+
+    attribute_map = {
+        'file_id': 'fileId',
+        'file_name': 'fileName',
+        'phrase': 'phrase',
+        'match_idx': 'matchIdx',
+        'page_idx': 'pageIdx',
+        'level': 'level',
+        'answer': 'answer',
+        'formatted_answer': 'formattedAnswer',
+        'match_score': 'matchScore',
+        'answer_score': 'answerScore',
+        'scaled_score': 'scaledScore',
+        'question_score': 'questionScore'
+    }
+
     def __init__(self, file_id: str=None, file_name: str=None, phrase: str=None, match_idx: float=None, page_idx: float=None, level: str=None, answer: str=None, formatted_answer: str=None, match_score: float=None, answer_score: float=None, scaled_score: float=None, question_score: float=None):  # noqa: E501
         """ResultRow - a model defined in Swagger
 
@@ -42,35 +73,6 @@ class ResultRow(Model):
         :param question_score: The question_score of this ResultRow.  # noqa: E501
         :type question_score: float
         """
-        self.swagger_types = {
-            'file_id': str,
-            'file_name': str,
-            'phrase': str,
-            'match_idx': float,
-            'page_idx': float,
-            'level': str,
-            'answer': str,
-            'formatted_answer': str,
-            'match_score': float,
-            'answer_score': float,
-            'scaled_score': float,
-            'question_score': float
-        }
-
-        self.attribute_map = {
-            'file_id': 'fileId',
-            'file_name': 'fileName',
-            'phrase': 'phrase',
-            'match_idx': 'matchIdx',
-            'page_idx': 'pageIdx',
-            'level': 'level',
-            'answer': 'answer',
-            'formatted_answer': 'formattedAnswer',
-            'match_score': 'matchScore',
-            'answer_score': 'answerScore',
-            'scaled_score': 'scaledScore',
-            'question_score': 'questionScore'
-        }
         self._file_id = file_id
         self._file_name = file_name
         self._phrase = phrase
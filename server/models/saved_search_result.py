@@ -15,6 +15,33 @@ class SavedSearchResult(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'unique_id': str,
+        'user_id': str,
+        'user_name': str,
+        'workspace_id': str,
+        'doc_id': str,
+        'action': str,
+        'status': str,
+        'created_on': datetime,
+        'search_result': object,
+        'search_criteria': SearchCriteria
+    }
+
+    attribute_map = {
+        'unique_id': 'uniqueId',
+        'user_id': 'userId',
+        'user_name': 'userName',
+        'workspace_id': 'workspaceId',
+        'doc_id': 'docId',
+        'action': 'action',
+        'status': 'status',
+        'created_on': 'createdOn',
+        'search_result': 'searchResult',
+        'search_criteria': 'searchCriteria'
+    }
+
     def __init__(self, unique_id: str=None, user_id: str=None, user_name: str=None, workspace_id: str=None, doc_id: str=None, action: str=None, status: str=None, created_on: datetime=None, search_result: object=None, search_criteria: SearchCriteria=None):  # noqa: E501
         """SavedSearchResult - a model defined in Swagger
 
@@ -39,31 +66,6 @@ class SavedSearchResult(Model):
         :param search_criteria: The search_criteria of this SavedSearchResult.  # noqa: E501
         :type search_criteria: SearchCriteria
         """
-        self.swagger_types = {
-            'unique_id': str,
-            'user_id': str,
-            'user_name': str,
-            'workspace_id': str,
-            'doc_id': str,
-            'action': str,
-            'status': str,
-            'created_on': datetime,
-            'search_result': object,
-            'search_criteria': SearchCriteria
-        }
-
-        self.attribute_map = {
-            'unique_id': 'uniqueId',
-            'user_id': 'userId',
-            'user_name': 'userName',
-            'workspace_id': 'workspaceId',
-            'doc_id': 'docId',
-            'action': 'action',
-            'status': 'status',
-            'created_on': 'createdOn',
-            'search_result': 'searchResult',
-            'search_criteria': 'searchCriteria'
-        }
         self._unique_id = unique_id
         self._user_id = user_id
         self._user_name = user_name
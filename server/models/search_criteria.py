@@ -12,6 +12,42 @@ class SearchCriteria(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "criterias": List[Criteria],
+        "extractors": List[str],
+        "post_processors": List[str],
+        "aggregate_post_processors": List[str],
+        "doc_per_page": int,
+        "offset": int,
+        "match_per_doc": int,
+        "debug": bool,
+        "topn": int,
+        "group_by_file": bool,
+        "search_type": str,
+        "field_filter": FieldFilter,
+        "doc_filters": List[str],
+        "disable_extraction": bool,
+        "abstractive_processors": List[str],
+    }
+
+    attribute_map = {
+        "criterias": "criterias",
+        "extractors": "extractors",
+        "post_processors": "postProcessors",
+        "aggregate_post_processors": "aggregatePostProcessors",
+        "doc_per_page": "docPerPage",
+        "offset": "offset",
+        "match_per_doc": "matchPerDoc",
+        "debug": "debug",
+        "topn": "topn",
+        "group_by_file": "groupByFile",
+        "search_type": "searchType",
+        "field_filter": "fieldFilter",
+        "doc_filters": "docFilters",
+        "disable_extraction": "disableExtraction",
+        "abstractive_processors": "abstractiveProcessors",
+    }
+
     def __init__(
         self,
         criterias: List[Criteria] = None,
@@ -54,42 +90,6 @@ class SearchCriteria(Model):
         :param abstractive_processors: The abstractive_processors of this SearchCriteria.  # noqa: E501
         :type abstractive_processors: List[object]
         """
-        self.swagger_types = {
-            "criterias": List[Criteria],
-            "extractors": List[str],
-            "post_processors": List[str],
-            "aggregate_post_processors": List[str],
-            "doc_per_page": int,
-            "offset": int,
-            "match_per_doc": int,
-            "debug": bool,
-            "topn": int,
-            "group_by_file": bool,
-            "search_type": str,
-            "field_filter": FieldFilter,
-            "doc_filters": List[str],
-            "disable_extraction": bool,
-            "abstractive_processors": List[str],
-        }
-
-        self.attribute_map = {
-            "criterias": "criterias",
-            "extractors": "extractors",
-            "post_processors": "postProcessors",
-            "aggregate_post_processors": "aggregatePostProcessors",
-            "doc_per_page": "docPerPage",
-            "offset": "offset",
-            "match_per_doc": "matchPerDoc",
-            "debug": "debug",
-            "topn": "topn",
-            "group_by_file": "groupByFile",
-            "search_type": "searchType",
-            "field_filter": "fieldFilter",
-            "doc_filters": "docFilters",
-            "disable_extraction": "disableExtraction",
-            "abstractive_processors": "abstractiveProcessors",
-        }
-
         self._criterias = criterias or []
         self._extractors = extractors or []
         self._post_processors = post_processors or []
@@ -12,6 +12,26 @@ class SearchCriteriaWorkflow(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "user_id": str,
+        "doc_id": str,
+        "workspace_id": str,
+        "timestamp": datetime,
+        "search_criteria": SearchCriteria,
+        "actions": List[str],
+    }
+
+    attribute_map = {
+        "id": "id",
+        "userId": "userId",
+        "doc_id": "docId",
+        "workspace_id": "workspaceId",
+        "timestamp": "timestamp",
+        "search_criteria": "searchCriteria",
+        "actions": "actions",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -40,26 +60,6 @@ class SearchCriteriaWorkflow(Model):
         :param actions: The actions of this SearchCriteriaWorkflow.  # noqa: E501
         :type actions: List[str]
         """
-        self.swagger_types = {
-            "id": str,
-            "user_id": str,
-            "doc_id": str,
-            "workspace_id": str,
-            "timestamp": datetime,
-            "search_criteria": SearchCriteria,
-            "actions": List[str],
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "userId": "userId",
-            "doc_id": "docId",
-            "workspace_id": "workspaceId",
-            "timestamp": "timestamp",
-            "search_criteria": "searchCriteria",
-            "actions": "actions",
-        }
-
         self._id = id
         self._user_id = user_id
         self._doc_id = doc_id
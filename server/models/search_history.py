@@ -11,6 +11,24 @@ class SearchHistory(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "user_id": str,
+        "doc_id": str,
+        "workspace_id": str,
+        "timestamp": datetime,
+        "search_criteria": SearchCriteria,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "user_id": "user_id",
+        "doc_id": "doc_id",
+        "workspace_id": "workspace_id",
+        "timestamp": "timestamp",
+        "search_criteria": "searchCriteria",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -37,23 +55,6 @@ class SearchHistory(Model):
         :param timestamp: The timestamp of this SearchHistory.  # noqa: E501
         :type timestamp: datetime
         """
-        self.swagger_types = {
-            "id": str,
-            "user_id": str,
-            "doc_id": str,
-            "workspace_id": str,
-            "timestamp": datetime,
-            "search_criteria": SearchCriteria,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "user_id": "user_id",
-            "doc_id": "doc_id",
-            "workspace_id": "workspace_id",
-            "timestamp": "timestamp",
-            "search_criteria": "searchCriteria",
-        }
         self._id = id
         self._user_id = user_id
         self._doc_id = doc_id
@@ -12,6 +12,32 @@ class SearchResult(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "workspace_id": str,
+        "doc_id": str,
+        "header_text": str,
+        "group_type": str,
+        "user_report": object,
+        "tags": List[str],
+        "raw_scores": object,
+        "search_answer": ResultRow,
+        "search_criteria": SearchCriteria,
+    }
+
+    attribute_map = {
+        "user_id": "userId",
+        "workspace_id": "workspaceId",
+        "doc_id": "docId",
+        "header_text": "headerText",
+        "group_type": "groupType",
+        "user_report": "userReport",
+        "tags": "tags",
+        "raw_scores": "rawScores",
+        "search_answer": "searchAnswer",
+        "search_criteria": "searchCriteria",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -48,31 +74,6 @@ class SearchResult(Model):
         :param search_criteria: The search_criteria of this SearchResult.  # noqa: E501
         :type search_criteria: SearchCriteria
         """
-        self.swagger_types = {
-            "user_id": str,
-            "workspace_id": str,
-            "doc_id": str,
-            "header_text": str,
-            "group_type": str,
-            "user_report": object,
-            "tags": List[str],
-            "raw_scores": object,
-            "search_answer": ResultRow,
-            "search_criteria": SearchCriteria,
-        }
-
-        self.attribute_map = {
-            "user_id": "userId",
-            "workspace_id": "workspaceId",
-            "doc_id": "docId",
-            "header_text": "headerText",
-            "group_type": "groupType",
-            "user_report": "userReport",
-            "tags": "tags",
-            "raw_scores": "rawScores",
-            "search_answer": "searchAnswer",
-            "search_criteria": "searchCriteria",
-        }
         self._user_id = user_id
         self._workspace_id = workspace_id
         self._doc_id = doc_id
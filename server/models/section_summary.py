@@ -15,6 +15,21 @@ class SectionSummary(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'title': str,
+        'block': Block,
+        'n_quoted_words': float,
+        'noun_chunks': List[str]
+    }
+
+    attribute_map = {
+        'title': 'title',
+        'block': 'block',
+        'n_quoted_words': 'n_quoted_words',
+        'noun_chunks': 'noun_chunks'
+    }
+
     def __init__(self, title: str=None, block: Block=None, n_quoted_words: float=None, noun_chunks: List[str]=None):  # noqa: E501
         """SectionSummary - a model defined in Swagger
 
@@ -27,19 +42,6 @@ class SectionSummary(Model):
         :param noun_chunks: The noun_chunks of this SectionSummary.  # noqa: E501
         :type noun_chunks: List[str]
         """
-        self.swagger_types = {
-            'title': str,
-            'block': Block,
-            'n_quoted_words': float,
-            'noun_chunks': List[str]
-        }
-
-        self.attribute_map = {
-            'title': 'title',
-            'block': 'block',
-            'n_quoted_words': 'n_quoted_words',
-            'noun_chunks': 'noun_chunks'
-        }
         self._title = title
         self._block = block
         self._n_quoted_words = n_quoted_words
@@ -11,6 +11,25 @@ class Template(Model):
 
     Do not edit the class manually.
     """
+
+    swagger_types = {
+        'id': str,
+        'active': bool,
+        'field_id': str,
+        'template_type': str,
+        'text': str,
+        'index': int
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'active': 'active',
+        'field_id': 'fieldId',
+        'template_type': 'templateType',
+        'text': 'text',
+        'index': 'index'
+    }
+
     def __init__(self, id: str=None, active: bool=True, field_id: str=None, template_type: str=None, text: str=None, index: int=None):  # noqa: E501
         """Template - a model defined in Swagger
 
@@ -27,23 +46,6 @@ class Template(Model):
         :param index: The index of this Template.  # noqa: E501
         :type index: float
         """
-        self.swagger_types = {
-            'id': str,
-            'active': bool,
-            'field_id': str,
-            'template_type': str,
-            'text': str,
-            'index': int
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'active': 'active',
-            'field_id': 'fieldId',
-            'template_type': 'templateType',
-            'text': 'text',
-            'index': 'index'
-        }
         self._id = id
         self._active = active
         self._field_id = field_id
@@ -8,6 +8,22 @@ class TemplateToFile(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "name": str,
+        "doc_location": str,
+        "workspace_id": str,
+        "mime_type": str,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "name": "name",
+        "doc_location": "docLocation",
+        "workspace_id": "workspaceId",
+        "mime_type": "mimeType",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -23,21 +39,6 @@ class TemplateToFile(Model):
         :param document_id: The document_id of this TemplateToFile.  # noqa: E501
         :type document_id: str
         """
-        self.swagger_types = {
-            "id": str,
-            "name": str,
-            "doc_location": str,
-            "workspace_id": str,
-            "mime_type": str,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "name": "name",
-            "doc_location": "docLocation",
-            "workspace_id": "workspaceId",
-            "mime_type": "mimeType",
-        }
         self.id = id
         self.name = name
         self.doc_location = doc_location
@@ -10,6 +10,30 @@ class TrainSample(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "doc_id": str,
+        "workspace_id": str,
+        "id": str,
+        "created_on": str,
+        "train_state": str,
+        "model_to_train": str,
+        "criteria": SearchCriteria,
+        "top_answer": AnswerContent,
+        "selected_answer": AnswerContent,
+    }
+
+    attribute_map = {
+        "doc_id": "docId",
+        "workspace_id": "workspaceId",
+        "id": "id",
+        "created_on": "created_on",
+        "train_state": "train_state",
+        "model_to_train": "model_to_train",
+        "criteria": "criteria",
+        "top_answer": "topAnswer",
+        "selected_answer": "selectedAnswer",
+    }
+
     def __init__(
         self,
         doc_id: str = None,
@@ -43,29 +67,6 @@ class TrainSample(Model):
         :param selected_answer: The selected_answer of this TrainSample.  # noqa: E501
         :type selected_answer: AnswerContent
         """
-        self.swagger_types = {
-            "doc_id": str,
-            "workspace_id": str,
-            "id": str,
-            "created_on": str,
-            "train_state": str,
-            "model_to_train": str,
-            "criteria": SearchCriteria,
-            "top_answer": AnswerContent,
-            "selected_answer": AnswerContent,
-        }
-
-        self.attribute_map = {
-            "doc_id": "docId",
-            "workspace_id": "workspaceId",
-            "id": "id",
-            "created_on": "created_on",
-            "train_state": "train_state",
-            "model_to_train": "model_to_train",
-            "criteria": "criteria",
-            "top_answer": "topAnswer",
-            "selected_answer": "selectedAnswer",
-        }
         self._doc_id = doc_id
         self._workspace_id = workspace_id
         self._id = id
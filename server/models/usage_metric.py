@@ -11,6 +11,22 @@ class UsageMetric(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "reported_on": str,
+        "subscription_detail": str,
+        "general_usage": List[MetricData],
+        "dev_api_usage": List[MetricData],
+    }
+
+    attribute_map = {
+        "user_id": "user_id",
+        "reported_on": "reported_on",
+        "subscription_detail": "subscription_detail",
+        "general_usage": "general_usage",
+        "dev_api_usage": "dev_api_usage",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -32,21 +48,6 @@ class UsageMetric(Model):
         :param dev_api_usage: The dev_api_usage of this UsageMetric.  # noqa: E501
         :type dev_api_usage: List[MetricData]
         """
-        self.swagger_types = {
-            "user_id": str,
-            "reported_on": str,
-            "subscription_detail": str,
-            "general_usage": List[MetricData],
-            "dev_api_usage": List[MetricData],
-        }
-
-        self.attribute_map = {
-            "user_id": "user_id",
-            "reported_on": "reported_on",
-            "subscription_detail": "subscription_detail",
-            "general_usage": "general_usage",
-            "dev_api_usage": "dev_api_usage",
-        }
         self._user_id = user_id
         self._reported_on = reported_on
         self._subscription_detail = subscription_detail
@@ -11,6 +11,54 @@ class User(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "email_id": str,
+        "first_name": str,
+        "last_name": str,
+        "active": bool,
+        "is_admin": bool,
+        "created_on": datetime,
+        "has_developer_account": bool,
+        "developer_app_id": str,
+        "expiry_time": datetime,
+        "subscription_plan": str,
+        "access_type": str,
+        "last_login": datetime,
+        "is_logged_in": bool,
+        "has_notifications": bool,
+        "workspace_notification_settings": dict,
+        "subscribed_workspaces": List[str],
+        "restricted_workspaces": List[str],
+        "included_features": List[str],
+        "can_change_subscription": bool,
+        "stripe_conf": dict,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "email_id": "emailId",
+        "first_name": "firstName",
+        "last_name": "lastName",
+        "active": "active",
+        "is_admin": "isAdmin",
+        "created_on": "createdOn",
+        "has_developer_account": "hasDeveloperAccount",
+        "developer_app_id": "developerAppId",
+        "expiry_time": "expiry_time",
+        "subscription_plan": "subscription_plan",
+        "access_type": "accessType",
+        "last_login": "lastLogin",
+        "is_logged_in": "isLoggedIn",
+        "has_notifications": "hasNotifications",
+        "workspace_notification_settings": "workspaceNotificationSettings",
+        "subscribed_workspaces": "subscribedWorkspaces",
+        "restricted_workspaces": "restrictedWorkspaces",
+        "included_features": "includedFeatures",
+        "can_change_subscription": "canChangeSubscription",
+        "stripe_conf": "stripeConf",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -79,54 +127,6 @@ class User(Model):
         :param stripe_conf: The stripe_conf of this User.  # noqa: E501
         :type stripe_conf: dict
         """
-        self.swagger_types = {
-            "id": str,
-            "email_id": str,
-            "first_name": str,
-            "last_name": str,
-            "active": bool,
-            "is_admin": bool,
-            "created_on": datetime,
-            "has_developer_account": bool,
-            "developer_app_id": str,
-            "expiry_time": datetime,
-            "subscription_plan": str,
-            "access_type": str,
-            "last_login": datetime,
-            "is_logged_in": bool,
-            "has_notifications": bool,
-            "workspace_notification_settings": dict,
-            "subscribed_workspaces": List[str],
-            "restricted_workspaces": List[str],
-            "included_features": List[str],
-            "can_change_subscription": bool,
-            "stripe_conf": dict,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "email_id": "emailId",
-            "first_name": "firstName",
-            "last_name": "lastName",
-            "active": "active",
-            "is_admin": "isAdmin",
-            "created_on": "createdOn",
-            "has_developer_account": "hasDeveloperAccount",
-            "developer_app_id": "developerAppId",
-            "expiry_time": "expiry_time",
-            "subscription_plan": "subscription_plan",
-            "access_type": "accessType",
-            "last_login": "lastLogin",
-            "is_logged_in": "isLoggedIn",
-            "has_notifications": "hasNotifications",
-            "workspace_notification_settings": "workspaceNotificationSettings",
-            "subscribed_workspaces": "subscribedWorkspaces",
-            "restricted_workspaces": "restrictedWorkspaces",
-            "included_features": "includedFeatures",
-            "can_change_subscription": "canChangeSubscription",
-            "stripe_conf": "stripeConf",
-        }
-
         self._id = id
         self._email_id = email_id
         self._first_name = first_name
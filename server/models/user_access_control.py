@@ -10,6 +10,18 @@ class UserAccessControl(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "email_id": str,
+        "access_control_list": List[str],
+    }
+
+    attribute_map = {
+        "user_id": "userId",
+        "email_id": "emailId",
+        "access_control_list": "accessControlList",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -26,18 +38,6 @@ class UserAccessControl(Model):
         :param access_control_list: The access_control_list of this UserAccessControl.  # noqa: E501
         :type access_control_list: List[str]
         """
-        self.swagger_types = {
-            "user_id": str,
-            "email_id": str,
-            "access_control_list": List[str],
-        }
-
-        self.attribute_map = {
-            "user_id": "userId",
-            "email_id": "emailId",
-            "access_control_list": "accessControlList",
-        }
-
         self._user_id = user_id
         self._email_id = email_id
         self._access_control_list = access_control_list
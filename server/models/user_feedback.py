@@ -8,6 +8,18 @@ class UserFeedback(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "rating_stars": float,
+        "feedback": str,
+    }
+
+    attribute_map = {
+        "user_id": "userId",
+        "rating_stars": "ratingStars",
+        "feedback": "feedback",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -24,18 +36,6 @@ class UserFeedback(Model):
         :param feedback: The feedback of this UserFeedback.  # noqa: E501
         :type feedback: str
         """
-        self.swagger_types = {
-            "user_id": str,
-            "rating_stars": float,
-            "feedback": str,
-        }
-
-        self.attribute_map = {
-            "user_id": "userId",
-            "rating_stars": "ratingStars",
-            "feedback": "feedback",
-        }
-
         self._user_id = user_id
         self._rating_stars = rating_stars
         self._feedback = feedback
@@ -8,6 +8,22 @@ class WaitList(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "user_id": str,
+        "app_name": str,
+        "wait_list_type": str,
+        "send_notifications": bool,
+        "user_action_taken": bool,
+    }
+
+    attribute_map = {
+        "user_id": "userId",
+        "app_name": "appName",
+        "wait_list_type": "waitListType",
+        "send_notifications": "sendNotifications",
+        "user_action_taken": "userActionTaken",
+    }
+
     def __init__(
         self,
         user_id: str = None,
@@ -30,22 +46,6 @@ class WaitList(Model):
         :param user_action_taken: The user_action_taken of this WaitList.  # noqa: E501
         :type user_action_taken: bool
         """
-        self.swagger_types = {
-            "user_id": str,
-            "app_name": str,
-            "wait_list_type": str,
-            "send_notifications": bool,
-            "user_action_taken": bool,
-        }
-
-        self.attribute_map = {
-            "user_id": "userId",
-            "app_name": "appName",
-            "wait_list_type": "waitListType",
-            "send_notifications": "sendNotifications",
-            "user_action_taken": "userActionTaken",
-        }
-
         self._user_id = user_id
         self._app_name = app_name
         self._wait_list_type = wait_list_type
@@ -11,6 +11,33 @@ class Workspace(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "name": str,
+        "user_id": str,
+        "active": bool,
+        "shared_with": List[str],
+        "created_on": datetime,
+        "settings": dict,
+        "statistics": dict,
+        "collaborators": dict,
+        "subscribed_users": List[str],
+        "stripe_conf": dict,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "name": "name",
+        "user_id": "userId",
+        "active": "active",
+        "shared_with": "sharedWith",
+        "created_on": "createdOn",
+        "settings": "settings",
+        "statistics": "statistics",
+        "collaborators": "collaborators",
+        "subscribed_users": "subscribedUsers",
+    }
+
     def __init__(
         self,
         id: str = None,
@@ -52,32 +79,6 @@ class Workspace(Model):
         :type stripe_conf: dict
 
         """
-        self.swagger_types = {
-            "id": str,
-            "name": str,
-            "user_id": str,
-            "active": bool,
-            "shared_with": List[str],
-            "created_on": datetime,
-            "settings": dict,
-            "statistics": dict,
-            "collaborators": dict,
-            "subscribed_users": List[str],
-            "stripe_conf": dict,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "name": "name",
-            "user_id": "userId",
-            "active": "active",
-            "shared_with": "sharedWith",
-            "created_on": "createdOn",
-            "settings": "settings",
-            "statistics": "statistics",
-            "collaborators": "collaborators",
-            "subscribed_users": "subscribedUsers",
-        }
         self._id = id
         self._name = (
             name
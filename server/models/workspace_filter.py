@@ -13,6 +13,34 @@ class WorkspaceFilter(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        "id": str,
+        "name": str,
+        "active": bool,
+        "user_id": str,
+        "workspace_id": str,
+        "is_user_defined": bool,
+        "is_default": bool,
+        "options": object,
+        "status": object,
+        "search_criteria": FilterSearchCriteria,
+        "data_criteria": FilterDataCriteria,
+    }
+
+    attribute_map = {
+        "id": "id",
+        "name": "name",
+        "active": "active",
+        "user_id": "userId",
+        "workspace_id": "workspaceId",
+        "is_user_defined": "isUserDefined",
+        "is_default": "isDefault",
+        "options": "options",
+        "status": "status",
+        "search_criteria": "searchCriteria",
+        "data_criteria": "dataCriteria",
+    }
+
     """
     Attributes:
       swagger_types (dict): The key is attribute name
@@ -38,34 +66,6 @@ class WorkspaceFilter(Model):
     ):  # noqa: E501
         """WorkspaceFilter - a model defined in Swagger"""  # noqa: E501
 
-        self.swagger_types = {
-            "id": str,
-            "name": str,
-            "active": bool,
-            "user_id": str,
-            "workspace_id": str,
-            "is_user_defined": bool,
-            "is_default": bool,
-            "options": object,
-            "status": object,
-            "search_criteria": FilterSearchCriteria,
-            "data_criteria": FilterDataCriteria,
-        }
-
-        self.attribute_map = {
-            "id": "id",
-            "name": "name",
-            "active": "active",
-            "user_id": "userId",
-            "workspace_id": "workspaceId",
-            "is_user_defined": "isUserDefined",
-            "is_default": "isDefault",
-            "options": "options",
-            "status": "status",
-            "search_criteria": "searchCriteria",
-            "data_criteria": "dataCriteria",
-        }
-
         self._id = id
         self._name = name
         self._active = active
@@ -0,0 +1,113 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+# Seconds between two flushes, 0 inserts every document right away.
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", 2))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+_STOP = object()
+
+
+class BufferedInsertWriter:
+    """Inserts fire-and-forget documents (access logs, search history) from a
+    background thread. Documents are queued in a bounded queue and written with
+    one insert_many per collection whenever batch_size documents are pending or
+    flush_interval seconds have passed. When the queue is full, documents are
+    dropped rather than blocking the request. The queue is drained at exit."""
+
+    def __init__(
+        self,
+        db,
+        flush_interval=AUDIT_FLUSH_INTERVAL_SECONDS,
+        batch_size=AUDIT_BATCH_SIZE,
+        max_queue_size=AUDIT_QUEUE_SIZE,
+    ):
+        """
+        :param db: pymongo Database
+        :param flush_interval: seconds between two flushes
+        :param batch_size: pending documents which trigger a flush
+        :param max_queue_size: maximum number of queued documents
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, col_name, doc):
+        """Queues a document for insertion
+        :param col_name: collection to insert into
+        :param doc: document, must not be modified by the caller afterwards
+        """
+        if self.flush_interval <= 0:
+            self.db[col_name].insert_one(doc)
+            return
+        self._start()
+        try:
+            self.queue.put_nowait((col_name, doc))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.error(f"Audit queue full, {self.dropped} documents dropped")
+
+    def _start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                return
+            if self.thread is None:
+                atexit.register(self.close)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _write(self, batches):
+        for col_name, docs in batches.items():
+            try:
+                self.db[col_name].insert_many(docs, ordered=False)
+            except Exception as e:
+                logger.error(f"Failed to insert {len(docs)} docs into {col_name}, err: {e}")
+
+    def _run(self):
+        batches = {}
+        count = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._write(batches)
+                return
+            if item is not None:
+                col_name, doc = item
+                batches.setdefault(col_name, []).append(doc)
+                count += 1
+            if count >= self.batch_size or time.monotonic() >= deadline:
+                if batches:
+                    self._write(batches)
+                batches = {}
+                count = 0
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self, timeout=10):
+        """Writes the queued documents and stops the background thread
+        :param timeout: seconds to wait for the queue to drain
+        """
+        if not self.thread or not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Audit queue did not drain, pending documents are lost")
+            return
+        self.thread.join(timeout)
@@ -0,0 +1,144 @@
+import os
+
+from pymongo import UpdateOne
+
+# One document per (workspace_id, folder_id) holding the number of live
+# documents, the number per status and the number of soft deleted documents.
+COUNTER_COLLECTION = "document_counter"
+# Fields of a document which decide the counters it contributes to.
+COUNTED_FIELDS = ("workspace_id", "parent_folder", "status", "is_deleted")
+COUNTED_PROJECTION = {"_id": 0, **{k: 1 for k in COUNTED_FIELDS}}
+# Seconds between two runs of the reconciler, 0 disables it.
+DOCUMENT_COUNTER_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("DOCUMENT_COUNTER_RECONCILE_INTERVAL_SECONDS", 300),
+)
+# Counters recounted longer ago than this are recounted by the reconciler.
+DOCUMENT_COUNTER_MAX_AGE_SECONDS = int(
+    os.getenv("DOCUMENT_COUNTER_MAX_AGE_SECONDS", 86400),
+)
+# Counters the reconciler recounts per run.
+DOCUMENT_COUNTER_RECONCILE_BATCH = int(
+    os.getenv("DOCUMENT_COUNTER_RECONCILE_BATCH", 50),
+)
+
+
+def get_counter_key(doc):
+    """
+    :param doc: document dict, only the COUNTED_FIELDS are used
+    :return: (workspace_id, folder_id)
+    """
+    return doc.get("workspace_id", None), doc.get("parent_folder", None) or "root"
+
+
+def get_counter_inc(doc, sign=1):
+    """Returns the $inc a document contributes to its counter
+    :param doc: document dict, None contributes nothing
+    :param sign: 1 to add the document, -1 to remove it
+    :return: dict of counter field to increment
+    """
+    if not doc:
+        return {}
+    if doc.get("is_deleted", False):
+        return {"deleted": sign}
+    inc = {"total": sign}
+    if doc.get("status", None):
+        inc[f"status.{doc['status']}"] = sign
+    return inc
+
+
+def get_transition_updates(old_doc, new_doc):
+    """Returns the counter updates for a document going from old_doc to new_doc
+    :param old_doc: document before the write, None when created
+    :param new_doc: document after the write, None when removed
+    :return: list of UpdateOne for the counter collection
+    """
+    incs = {}
+    for doc, sign in ((old_doc, -1), (new_doc, 1)):
+        if not doc:
+            continue
+        inc = incs.setdefault(get_counter_key(doc), {})
+        for k, v in get_counter_inc(doc, sign).items():
+            inc[k] = inc.get(k, 0) + v
+    updates = []
+    for (workspace_id, folder_id), inc in incs.items():
+        inc = {k: v for k, v in inc.items() if v}
+        if not inc or not workspace_id:
+            continue
+        updates.append(
+            UpdateOne(
+                {"workspace_id": workspace_id, "folder_id": folder_id},
+                {"$inc": inc},
+                upsert=True,
+            ),
+        )
+    return updates
+
+
+def build_counters(grouped_rows):
+    """Builds the counter documents from the output of get_count_pipeline
+    :param grouped_rows: iterable of {"_id": {...COUNTED_FIELDS}, "count": n}
+    :return: dict of (workspace_id, folder_id) to counter document
+    """
+    counters = {}
+    for row in grouped_rows:
+        key = get_counter_key(row["_id"])
+        counter = counters.setdefault(key, new_counter(*key))
+        for k, v in get_counter_inc(row["_id"], row["count"]).items():
+            if k.startswith("status."):
+                counter["status"][k[len("status.") :]] = v
+            else:
+                counter[k] += v
+    return counters
+
+
+def new_counter(workspace_id, folder_id):
+    """
+    :param workspace_id: id of the workspace
+    :param folder_id: id of the folder
+    :return: empty counter document
+    """
+    return {
+        "workspace_id": workspace_id,
+        "folder_id": folder_id,
+        "total": 0,
+        "deleted": 0,
+        "status": {},
+        # Counters created by $inc alone are missing the documents written before them.
+        "complete": True,
+    }
+
+
+def get_count_pipeline(match):
+    """Aggregation counting the documents per counter and status
+    :param match: filter on the document collection
+    :return: pipeline
+    """
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {k: f"${k}" for k in COUNTED_FIELDS},
+                "count": {"$sum": 1},
+            },
+        },
+    ]
+
+
+def get_recount_inc(counter, recounted):
+    """Returns the $inc correcting a counter to the recounted values. Applied as
+    an increment, it keeps the increments made after the counter was read.
+    :param counter: counter read before the documents were counted, None when
+        it was missing
+    :param recounted: counter document from build_counters
+    :return: dict of counter field to increment
+    """
+    counter = counter or {}
+    inc = {k: recounted.get(k, 0) - counter.get(k, 0) for k in ("total", "deleted")}
+    old_status = counter.get("status", None) or {}
+    new_status = recounted.get("status", None) or {}
+    for status in set(old_status) | set(new_status):
+        delta = new_status.get(status, 0) - old_status.get(status, 0)
+        if delta:
+            inc[f"status.{status}"] = delta
+    return inc
+
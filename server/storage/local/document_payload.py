@@ -0,0 +1,26 @@
+import zlib
+
+import bson
+from bson.binary import Binary
+
+# Side collection holding the large parsed payloads of a document, one entry
+# per doc_id, so that the document collection stays small.
+PAYLOAD_COLLECTION = "document_payload"
+PAYLOAD_KINDS = ("blocks", "key_info")
+COMPRESSION_LEVEL = 6
+
+
+def compress_payload(data):
+    """Serializes the payload to BSON and compresses it with zlib
+    :param data: blocks list or key_info dict
+    :return: bson Binary
+    """
+    return Binary(zlib.compress(bson.encode({"v": data}), COMPRESSION_LEVEL))
+
+
+def decompress_payload(data):
+    """Reverts compress_payload
+    :param data: compressed payload
+    :return: blocks list or key_info dict
+    """
+    return bson.decode(zlib.decompress(data))["v"]
@@ -0,0 +1,192 @@
+import os
+
+from pymongo import UpdateOne
+
+# Counters of the field values of a bundle, one document per field (kind
+# "field") and one per file (kind "file", with the counters of every field).
+STATS_COLLECTION = "field_value_stats"
+# One document per bundle, the counters are only maintained while it is ready.
+STATS_STATE_COLLECTION = "field_value_stats_state"
+COUNTER_NAMES = ("n", "n_edits", "n_approvals")
+# Seconds between two runs of the reconciler, 0 disables it.
+FIELD_STATS_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("FIELD_STATS_RECONCILE_INTERVAL_SECONDS", 300),
+)
+# Statistics older than this are recomputed by the reconciler to fix drift.
+FIELD_STATS_MAX_AGE_SECONDS = int(os.getenv("FIELD_STATS_MAX_AGE_SECONDS", 86400))
+# Bundles the reconciler rebuilds per run.
+FIELD_STATS_RECONCILE_BATCH = int(os.getenv("FIELD_STATS_RECONCILE_BATCH", 10))
+
+
+def get_stats_key(field_bundle_idx, kind, key):
+    """
+    :param field_bundle_idx: id of the bundle
+    :param kind: field or file
+    :param key: field_idx or file_idx
+    :return: filter of the statistics document
+    """
+    return {"field_bundle_idx": field_bundle_idx, "kind": kind, "key": key}
+
+
+def get_stat_counters(top_fact):
+    """Returns the counters a field value contributes to
+    :param top_fact: top_fact of the field value, only type and is_override are used
+    :return: dict of counter name to 0 or 1
+    """
+    top_fact = top_fact or {}
+    return {
+        "n": 1,
+        "n_edits": int(top_fact.get("is_override", False) is True),
+        "n_approvals": int(top_fact.get("type", None) == "approve"),
+    }
+
+
+def get_stats_updates(stat_changes):
+    """Returns the $inc updates of the statistics for a list of field value changes
+    :param stat_changes: list of dicts with field_bundle_idx, field_idx, file_idx,
+        file_name and the old and new counters (None when the value is missing)
+    :return: list of UpdateOne for the statistics collection
+    """
+    field_incs = {}
+    file_incs = {}
+    file_names = {}
+    for change in stat_changes:
+        bundle_idx = change["field_bundle_idx"]
+        field_idx = change["field_idx"]
+        file_key = (bundle_idx, change["file_idx"])
+        if change.get("file_name", None):
+            file_names[file_key] = change["file_name"]
+        old = change.get("old", None) or {}
+        new = change.get("new", None) or {}
+        field_inc = field_incs.setdefault((bundle_idx, field_idx), {})
+        file_inc = file_incs.setdefault(file_key, {})
+        for name in COUNTER_NAMES:
+            delta = new.get(name, 0) - old.get(name, 0)
+            if not delta:
+                continue
+            field_inc[name] = field_inc.get(name, 0) + delta
+            file_counter = f"fields.{field_idx}.{name}"
+            file_inc[file_counter] = file_inc.get(file_counter, 0) + delta
+    updates = []
+    for (bundle_idx, field_idx), inc in field_incs.items():
+        inc = {k: v for k, v in inc.items() if v}
+        if inc:
+            updates.append(
+                UpdateOne(
+                    get_stats_key(bundle_idx, "field", field_idx),
+                    {"$inc": inc},
+                    upsert=True,
+                ),
+            )
+    for file_key, inc in file_incs.items():
+        update = {}
+        inc = {k: v for k, v in inc.items() if v}
+        if inc:
+            update["$inc"] = inc
+        if file_key in file_names:
+            update["$set"] = {"file_name": file_names[file_key]}
+        if update:
+            updates.append(
+                UpdateOne(
+                    get_stats_key(file_key[0], "file", file_key[1]),
+                    update,
+                    upsert=True,
+                ),
+            )
+    return updates
+
+
+def get_rebuild_pipelines(match):
+    """Aggregations computing the statistics documents of a bundle
+    :param match: filter on the field_value collection
+    :return: pipeline of the field documents, pipeline of the file documents
+    """
+    counters = {
+        "n": {"$literal": 1},
+        "n_edits": {"$cond": [{"$eq": [True, "$top_fact.is_override"]}, 1, 0]},
+        "n_approvals": {"$cond": [{"$eq": ["approve", "$top_fact.type"]}, 1, 0]},
+    }
+    project = {
+        "$project": {
+            "_id": 0,
+            "field_idx": 1,
+            "file_idx": 1,
+            "file_name": 1,
+            **counters,
+        },
+    }
+    field_pipeline = [
+        {"$match": match},
+        project,
+        {
+            "$group": {
+                "_id": "$field_idx",
+                **{name: {"$sum": f"${name}"} for name in COUNTER_NAMES},
+            },
+        },
+    ]
+    file_pipeline = [
+        {"$match": match},
+        project,
+        {
+            "$group": {
+                "_id": "$file_idx",
+                "file_name": {"$first": "$file_name"},
+                "fields": {
+                    "$push": {
+                        "k": "$field_idx",
+                        "v": {name: f"${name}" for name in COUNTER_NAMES},
+                    },
+                },
+            },
+        },
+        {"$addFields": {"fields": {"$arrayToObject": "$fields"}}},
+    ]
+    return field_pipeline, file_pipeline
+
+
+def build_stats_table(stat_docs, field_ids):
+    """Builds the statistics table from the statistics documents of a bundle
+    :param stat_docs: iterable of statistics documents
+    :param field_ids: fields to report
+    :return: dict with rowStats, colStats, totalFiles, totalEdits, totalApprovals
+        and totalFields
+    """
+    field_ids = set(field_ids)
+    row_stats = []
+    col_stats = []
+    for doc in stat_docs:
+        if doc["kind"] == "field":
+            if doc["key"] in field_ids and doc.get("n", 0) > 0:
+                col_stats.append(
+                    {
+                        "_id": doc["key"],
+                        "nEdits": doc.get("n_edits", 0),
+                        "nApprovals": doc.get("n_approvals", 0),
+                    },
+                )
+            continue
+        counters = [
+            counter
+            for field_idx, counter in (doc.get("fields", None) or {}).items()
+            if field_idx in field_ids and counter.get("n", 0) > 0
+        ]
+        if counters:
+            row_stats.append(
+                {
+                    "_id": doc["key"],
+                    "fileName": doc.get("file_name", None),
+                    "nEdits": sum(c.get("n_edits", 0) for c in counters),
+                    "nApprovals": sum(c.get("n_approvals", 0) for c in counters),
+                },
+            )
+    row_stats.sort(key=lambda row: row["fileName"] or "")
+    return {
+        "totalEdits": sum(row["nEdits"] for row in row_stats),
+        "totalApprovals": sum(row["nApprovals"] for row in row_stats),
+        "totalFiles": len(row_stats),
+        "totalFields": len(row_stats) * len(col_stats),
+        "rowStats": row_stats,
+        "colStats": col_stats,
+    }
+
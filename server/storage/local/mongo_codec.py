@@ -0,0 +1,117 @@
+import os
+
+DOT_ESCAPE = "_dot_"
+DOLLAR_ESCAPE = "_dollar_"
+# Values used to be stored escaped, they are unescaped on read and matched in both forms
+# until migration/v2.3.0/mongo_key_escaping.py ran. Set to 0 afterwards.
+MONGO_ESCAPED_VALUES = int(os.getenv("MONGO_ESCAPED_VALUES", 1))
+
+
+def escape_mongo_key(key):
+    """Escapes the characters MongoDB does not allow in field names
+    :param key: dict key
+    :return: escaped key
+    """
+    if isinstance(key, str) and ("." in key or "$" in key):
+        return key.replace(".", DOT_ESCAPE).replace("$", DOLLAR_ESCAPE)
+    return key
+
+
+def unescape_mongo_key(key):
+    """Reverts escape_mongo_key
+    :param key: escaped dict key
+    :return: original key
+    """
+    if isinstance(key, str) and (DOT_ESCAPE in key or DOLLAR_ESCAPE in key):
+        return key.replace(DOT_ESCAPE, ".").replace(DOLLAR_ESCAPE, "$")
+    return key
+
+
+def _joined_keys(data):
+    try:
+        return "".join(data)
+    except TypeError:
+        # Non string keys are left as they are.
+        return "".join(key for key in data if isinstance(key, str))
+
+
+def _rename_keys(data, convert_key):
+    items = list(data.items())
+    data.clear()
+    for key, value in items:
+        data[convert_key(key)] = value
+
+
+def escape_mongo_data(data):
+    """Escapes the dict keys of the data in place, other values are never touched
+    :param data: dict, list or any value
+    :return: data
+    """
+    if isinstance(data, dict):
+        keys = _joined_keys(data)
+        if "." in keys or "$" in keys:
+            _rename_keys(data, escape_mongo_key)
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                escape_mongo_data(value)
+    elif isinstance(data, list):
+        for value in data:
+            if isinstance(value, (dict, list)):
+                escape_mongo_data(value)
+    return data
+
+
+def unescape_mongo_data(data, values=None):
+    """Unescapes the dict keys of the data in place
+    :param data: dict, list or any value
+    :param values: also unescape the string values, defaults to MONGO_ESCAPED_VALUES
+    :return: data
+    """
+    if values is None:
+        values = MONGO_ESCAPED_VALUES
+    if isinstance(data, dict):
+        keys = _joined_keys(data)
+        if DOT_ESCAPE in keys or DOLLAR_ESCAPE in keys:
+            _rename_keys(data, unescape_mongo_key)
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                unescape_mongo_data(value, values)
+            elif values and isinstance(value, str):
+                data[key] = unescape_mongo_key(value)
+    elif isinstance(data, list):
+        for idx, value in enumerate(data):
+            if isinstance(value, (dict, list)):
+                unescape_mongo_data(value, values)
+            elif values and isinstance(value, str):
+                data[idx] = unescape_mongo_key(value)
+    elif values and isinstance(data, str):
+        return unescape_mongo_key(data)
+    return data
+
+
+def escape_mongo_filter(condition):
+    """Extends a filter condition to also match the values stored escaped,
+    while MONGO_ESCAPED_VALUES is set
+    :param condition: value or {operator: value} condition of a field
+    :return: condition
+    """
+    if not MONGO_ESCAPED_VALUES:
+        return condition
+    if not isinstance(condition, dict):
+        if escape_mongo_key(condition) != condition:
+            return {"$in": [condition, escape_mongo_key(condition)]}
+        return condition
+    escaped = {}
+    for operator, value in condition.items():
+        if operator in ("$eq", "$ne") and escape_mongo_key(value) != value:
+            escaped["$in" if operator == "$eq" else "$nin"] = [
+                value,
+                escape_mongo_key(value),
+            ]
+        elif operator in ("$in", "$nin") and isinstance(value, list):
+            escaped[operator] = value + [
+                escape_mongo_key(v) for v in value if escape_mongo_key(v) != v
+            ]
+        else:
+            escaped[operator] = value
+    return escaped
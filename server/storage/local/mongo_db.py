@@ -1,24 +1,31 @@
 import base64
 import collections
 import datetime
+import hashlib
 import logging
 import os
+import random
+import re
 import tempfile
+import threading
+import time
 import traceback
 from typing import List
 from typing import Optional
 
+from bson import json_util
 from bson.objectid import ObjectId
 from flask import jsonify
 from flask import make_response
 from flask import request
-from natsort import natsorted
 from nlm_utils.storage import file_storage
 from nlm_utils.utils.utils import ensure_bool
 from pymongo import MongoClient
 from pymongo import ReturnDocument
 from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from pymongo.errors import CollectionInvalid
+from pymongo.errors import DuplicateKeyError
 from pytz import timezone
 
 from server.models import BBox
@@ -42,6 +49,20 @@ from server.models import Workspace
 from server.models import WorkspaceFilter
 from server.models.history import History
 from server.models.train_sample import TrainSample
+from server.storage.local import document_counters
+from server.storage.local import document_payload
+from server.storage.local import field_value_stats
+from server.storage.local import mongo_codec
+from server.storage.local import request_cache
+from server.storage.local.audit_writer import BufferedInsertWriter
+from server.storage.local.mongo_indices import advise_indices
+from server.storage.local.mongo_indices import INDEX_MANIFEST
+from server.storage.local.mongo_indices import INDEX_MANIFEST_SETTING_ID
+from server.storage.local.mongo_indices import INDEX_MANIFEST_VERSION
+from server.storage.local.mongo_indices import reconcile_indices
+from server.storage.local.mongo_stats import command_stats
+from server.storage.local.reconciler import BackgroundReconciler
+from server.storage.local.user_cache import UserProfileCache
 from server.storage.nosql_db import NoSqlDb
 from server.utils import bbox_utils
 from server.utils import str_utils
@@ -52,20 +73,69 @@ from server.utils.dependent_fields_utils import DEFAULT_CAST_OPTION_KEY
 from server.utils.dependent_fields_utils import DEPENDENT_FIELD_ALLOWED_TYPES
 from server.utils.dependent_fields_utils import FORMULA_FIELD_TYPE
 from server.utils.dependent_fields_utils import NONE_CAST_OPTION_KEY
-from server.utils.formula import evaluate_formula
+from server.utils.formula import compile_formula
 from server.utils.notification_general import WS_SPECIFIC_NOTIFY_ACTIONS
+from server.utils.pagination_utils import build_keyset_query
+from server.utils.pagination_utils import decode_continuation_token
+from server.utils.pagination_utils import encode_continuation_token
+from server.utils.pagination_utils import get_sort_type_expression
+from server.utils.pagination_utils import get_sort_value
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-COLLECTION_LIST = []
+COLLECTION_LIST = INDEX_MANIFEST
 DATE_TIME_YEAR_MONTH = "%Y-%m"
 DATE_TIME_YEAR_MONTH_DATE = "%Y-%m-%d"
 t_zone = timezone("UTC")
 T_ZONE_FORMAT = "%Y-%m-%d %H:%M:%S %Z%z"
-MAX_SELF_SORT_LIMIT = 1001
 PAYMENT_CONTROLLED_RENEWABLE_RESOURCES = ensure_bool(
     os.getenv("PAYMENT_CONTROLLED_RENEWABLE_RESOURCES", False),
 )
+WORKFLOW_FIELD_BULK_WRITE_SIZE = int(os.getenv("WORKFLOW_FIELD_BULK_WRITE_SIZE", 1000))
+# One document per field whose distinct values are written from a prior read,
+# the reconciler recounts them to fix the drift of concurrent edits.
+FIELD_DISTINCT_VALUE_STATE_COLLECTION = "field_distinct_value_state"
+# Seconds between two runs of the reconciler, 0 disables it.
+FIELD_DISTINCT_VALUE_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("FIELD_DISTINCT_VALUE_RECONCILE_INTERVAL_SECONDS", 300),
+)
+# Distinct values recounted longer ago than this are recounted by the reconciler.
+FIELD_DISTINCT_VALUE_MAX_AGE_SECONDS = int(
+    os.getenv("FIELD_DISTINCT_VALUE_MAX_AGE_SECONDS", 86400),
+)
+# Fields the reconciler recounts per run.
+FIELD_DISTINCT_VALUE_RECONCILE_BATCH = int(
+    os.getenv("FIELD_DISTINCT_VALUE_RECONCILE_BATCH", 20),
+)
+# Seconds a reader waits for the first build of a grid claimed by another reader.
+FIELD_BUNDLE_GRID_BUILD_WAIT_SECONDS = int(
+    os.getenv("FIELD_BUNDLE_GRID_BUILD_WAIT_SECONDS", 120),
+)
+# Latest edits kept inline in field_value, older ones move to field_value_history.
+FIELD_VALUE_HISTORY_INLINE_SIZE = int(os.getenv("FIELD_VALUE_HISTORY_INLINE_SIZE", 20))
+FIELD_VALUE_HISTORY_COLLECTION = "field_value_history"
+# Format of edited_time in the history entries, see str_utils.timestamp_as_str.
+FIELD_VALUE_HISTORY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Optional client for the long read-only reports, e.g. a secondary or an analytics node.
+MONGO_ANALYTICS_HOST = os.getenv("MONGO_ANALYTICS_HOST", None)
+MONGO_ANALYTICS_POOL_SIZE = int(os.getenv("MONGO_ANALYTICS_POOL_SIZE", 20))
+MONGO_ANALYTICS_READ_PREFERENCE = os.getenv(
+    "MONGO_ANALYTICS_READ_PREFERENCE",
+    "secondaryPreferred",
+)
+MONGO_ANALYTICS_READ_CONCERN = os.getenv("MONGO_ANALYTICS_READ_CONCERN", "local")
+# Server side time limit of the report queries, 0 means no limit.
+MONGO_ANALYTICS_MAX_TIME_MS = int(os.getenv("MONGO_ANALYTICS_MAX_TIME_MS", 0))
+# Fraction of the successful requests written to access_logs, failures are always kept.
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 1.0))
+# Default projection of the document listings, leaves out the payloads and search grams.
+DOCUMENT_INFO_PROJECTION = {
+    "blocks": 0,
+    "_id": 0,
+    "key_info": 0,
+    "name_grams": 0,
+    "title_grams": 0,
+}
 
 
 class MongoDB(NoSqlDb):
@@ -73,9 +143,52 @@ class MongoDB(NoSqlDb):
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(log_level)
         host = host or os.getenv("MONGO_HOST", "localhost")
-        self.db_client = MongoClient(host)
+        self.db_client = MongoClient(
+            host,
+            event_listeners=[request_cache.RequestCommandListener(), command_stats],
+        )
         self.db = self.db_client[db or os.getenv("MONGO_DATABASE", "doc-store-dev")]
+        if MONGO_ANALYTICS_HOST:
+            self.analytics_client = MongoClient(
+                MONGO_ANALYTICS_HOST,
+                maxPoolSize=MONGO_ANALYTICS_POOL_SIZE,
+                readPreference=MONGO_ANALYTICS_READ_PREFERENCE,
+                readConcernLevel=MONGO_ANALYTICS_READ_CONCERN,
+                event_listeners=[request_cache.RequestCommandListener(), command_stats],
+            )
+            self.analytics_db = self.analytics_client[self.db.name]
+        else:
+            # Reports share the primary client.
+            self.analytics_client = None
+            self.analytics_db = self.db
+        self.analytics_max_time_ms = MONGO_ANALYTICS_MAX_TIME_MS or None
         self.index_db = self.db_client[os.getenv("MONGO_INDEX_DATABASE", "nlm-index")]
+        self.user_cache = UserProfileCache()
+        self.audit_writer = BufferedInsertWriter(self.db)
+        self.field_stats_reconciler = BackgroundReconciler(
+            "field value statistics",
+            self.claim_field_value_stats_rebuilds,
+            self.rebuild_field_value_stats,
+            field_value_stats.FIELD_STATS_RECONCILE_INTERVAL_SECONDS,
+            field_value_stats.FIELD_STATS_MAX_AGE_SECONDS,
+            field_value_stats.FIELD_STATS_RECONCILE_BATCH,
+        )
+        self.distinct_value_reconciler = BackgroundReconciler(
+            "field distinct values",
+            self.claim_field_distinct_value_rebuilds,
+            self.rebuild_field_distinct_values,
+            FIELD_DISTINCT_VALUE_RECONCILE_INTERVAL_SECONDS,
+            FIELD_DISTINCT_VALUE_MAX_AGE_SECONDS,
+            FIELD_DISTINCT_VALUE_RECONCILE_BATCH,
+        )
+        self.document_counter_reconciler = BackgroundReconciler(
+            "document counters",
+            self.claim_document_counter_repairs,
+            self.repair_document_counters,
+            document_counters.DOCUMENT_COUNTER_RECONCILE_INTERVAL_SECONDS,
+            document_counters.DOCUMENT_COUNTER_MAX_AGE_SECONDS,
+            document_counters.DOCUMENT_COUNTER_RECONCILE_BATCH,
+        )
         if (
             ensure_bool(os.getenv("MONGO_CHECK_COLLECTIONS", True))
             and host != "localhost"
@@ -84,15 +197,55 @@ class MongoDB(NoSqlDb):
 
     def _create_collections(self, collection_list):
         """
-        Creates collections and the associated indices for each of the collection.
+        Reconciles the indices of each collection against the index manifest.
+        Runs only when the manifest version stored in nlm_settings is older than
+        INDEX_MANIFEST_VERSION.
         :param collection_list: List of collections and the indices to create.
         :return: VOID
         """
-        col_names = self.db.list_collection_names()
-        for col in collection_list:
-            if col["col_name"] not in col_names:
-                for index in col["indices"]:
-                    self.db[col["col_name"]].create_index(index)
+        setting = self.db["nlm_settings"].find_one(
+            {"id": INDEX_MANIFEST_SETTING_ID},
+            {"_id": 0, "value": 1},
+        )
+        if setting and setting.get("value", 0) >= INDEX_MANIFEST_VERSION:
+            return
+        self.reconcile_indices(collection_list)
+
+    def reconcile_indices(self, manifest=None, drop_extra=False, dry_run=False):
+        """
+        Creates the indices in the manifest that are missing from the database.
+        :param manifest: Index manifest, defaults to INDEX_MANIFEST.
+        :param drop_extra: Drop indices which are not in the manifest.
+        :param dry_run: Only report the differences.
+        :return: Reconciliation report per collection.
+        """
+        report = reconcile_indices(
+            self.db,
+            manifest=manifest,
+            drop_extra=drop_extra,
+            dry_run=dry_run,
+        )
+        if not dry_run and not any(r["failed"] for r in report.values()):
+            self.db["nlm_settings"].update_one(
+                {"id": INDEX_MANIFEST_SETTING_ID},
+                {"$set": {"value": INDEX_MANIFEST_VERSION}},
+                upsert=True,
+            )
+        return report
+
+    def advise_indices(self, query_shapes=None):
+        """
+        Reports query shapes whose winning plan has a COLLSCAN or in-memory SORT.
+        :param query_shapes: Query shapes to explain, defaults to QUERY_SHAPES.
+        :return: List of offending query shapes.
+        """
+        return advise_indices(self.db, query_shapes=query_shapes)
+
+    def _analytics_options(self):
+        """Options of the aggregations routed to the analytics client"""
+        if self.analytics_max_time_ms:
+            return {"maxTimeMS": self.analytics_max_time_ms}
+        return {}
 
     def _create_entity(
         self,
@@ -102,7 +255,10 @@ class MongoDB(NoSqlDb):
         entity_object_dict=None,
     ):
         if not append:
-            doc_ref = self.db[entity_type].find_one({"id": entity_object.id})
+            doc_ref = self.db[entity_type].find_one(
+                {"id": entity_object.id},
+                {"_id": 1},
+            )
             if doc_ref:
                 self.logger.error(
                     f"{entity_type} with id {entity_object.id} already exists",
@@ -154,6 +310,8 @@ class MongoDB(NoSqlDb):
         :param include_stripe_conf: Include stripe configuration or not.
         :return: user object
         """
+        # Only the default projections are shared within a request.
+        use_request_cache = not projection
         if not projection:
             projection = {
                 "_id": 0,
@@ -167,10 +325,20 @@ class MongoDB(NoSqlDb):
         if not expand:
             projection["workspace_notification_settings"] = 0
 
-        user_stream = self.db["user"].find_one(
-            {"email_id": email_id},
-            projection,
-        )
+        def load_user():
+            return self.db["user"].find_one(
+                {"email_id": email_id},
+                projection,
+            )
+
+        if use_request_cache:
+            user_stream = request_cache.get_cached(
+                "user",
+                ("email_id", email_id, expand, include_stripe_conf),
+                load_user,
+            )
+        else:
+            user_stream = load_user()
         if user_stream:
             users = [User(**user_stream)]
         else:
@@ -187,6 +355,23 @@ class MongoDB(NoSqlDb):
             self.logger.error(f"{len(users)} multiple users found with id {email_id}")
             raise Exception(f"multiple users found for user with id {email_id}")
 
+    def get_authenticated_user(self, email_id):
+        """Returns the user with the stripe configuration, as needed to authenticate
+        a request. Served from the in process user cache for up to USER_CACHE_TTL_SECONDS.
+        :param email_id: email of the user
+        :return: user object, raises ValueError when the user does not exist
+        """
+        user_dict = self.user_cache.get(email_id)
+        if user_dict is None:
+            user_dict = self.db["user"].find_one(
+                {"email_id": email_id},
+                {"_id": 0, "workspace_notification_settings": 0},
+            )
+            if not user_dict:
+                raise ValueError(str(email_id) + " not in db")
+            self.user_cache.put(email_id, user_dict)
+        return User(**user_dict)
+
     def get_distinct_active_user_profiles(
         self,
         domain_name="",
@@ -232,7 +417,11 @@ class MongoDB(NoSqlDb):
         :param user_id: id of user to be deleted
         :return: id of the deleted user, if successful
         """
-        return self._delete_entity(user_id, "user")
+        try:
+            return self._delete_entity(user_id, "user")
+        finally:
+            # After the write, a concurrent read may have cached the old profile.
+            self.user_cache.invalidate(user_id=user_id)
 
     def get_users(
         self,
@@ -273,19 +462,39 @@ class MongoDB(NoSqlDb):
             query["email_id"] = email
         else:
             query["id"] = user_id
-        return self.db["user"].find_one_and_update(
+        user = self.db["user"].find_one_and_update(
             query,
             {"$set": profile_json},
             {"_id": 0},
             return_document=ReturnDocument.AFTER,
         )
+        self.user_cache.invalidate(email=email, user_id=user_id)
+        return user
+
+    @staticmethod
+    def get_workspace_principals(collaborators):
+        """Flattens the collaborators of a workspace into the indexed principals array
+        :param collaborators: dict of email, domain or "*" to permission
+        :return: list of dicts with principal and permission
+        """
+        return [
+            {"principal": principal, "permission": permission}
+            for principal, permission in (collaborators or {}).items()
+        ]
 
     def create_workspace(self, workspace):
         """Creates a new workspace
         :param workspace:
         :return:
         """
-        return self._create_entity(workspace, "workspace")
+        return self._create_entity(
+            workspace,
+            "workspace",
+            entity_object_dict={
+                **workspace.to_dict(),
+                "principals": self.get_workspace_principals(workspace.collaborators),
+            },
+        )
 
     def delete_workspace(self, workspace_id, permanent=False):
         """Deletes an existing workspace
@@ -335,7 +544,18 @@ class MongoDB(NoSqlDb):
         :param workspace:
         :return:
         """
-        return self._update_entity(workspace_id, workspace, "workspace")
+        result = self.db["workspace"].replace_one(
+            {"id": workspace_id},
+            {
+                **workspace.to_dict(),
+                "principals": self.get_workspace_principals(workspace.collaborators),
+            },
+        )
+        if not result.matched_count:
+            self.logger.error(f"workspace with id {workspace_id} does not exists")
+            raise Exception(f"workspace with id {workspace_id} does not exists")
+        self.logger.info(f"workspace with id {workspace_id} updated")
+        return workspace_id
 
     def workspace_exists(self, workspace_id):
         # check if workspace exists
@@ -375,18 +595,18 @@ class MongoDB(NoSqlDb):
         return ws_list
 
     def get_workspace_by_id(self, workspace_id, remove_private_data=False):
-        filter_param = {
-            "_id": 0,
-        }
-
-        if remove_private_data:
-            filter_param["subscribed_users"] = 0
-            filter_param["stripe_conf"] = 0
-
-        workspace_ref = self.db["workspace"].find_one(
-            {"id": workspace_id, "active": True},
-            filter_param,
+        workspace_ref = request_cache.get_cached(
+            "workspace",
+            workspace_id,
+            lambda: self.db["workspace"].find_one(
+                {"id": workspace_id, "active": True},
+                {"_id": 0},
+            ),
         )
+        if workspace_ref and remove_private_data:
+            workspace_ref.pop("subscribed_users", None)
+            workspace_ref.pop("stripe_conf", None)
+
         workspaces = []
         if workspace_ref:
             workspaces.append(Workspace(**workspace_ref))
@@ -439,99 +659,63 @@ class MongoDB(NoSqlDb):
             filter_param["settings.search_settings"] = 0
             filter_param["settings.document_settings"] = 0
 
-        # get private workspace
-        private_ws = self.db["workspace"].find(
-            {"user_id": user_id, "active": True},
-            filter_param,
-        )
-        for w in private_ws:
-            private_workspaces.append(Workspace(**w))
-            idxs.add(w["id"])
-        workspaces.extend(private_workspaces)
+        filter_param["principals"] = 0
 
         if get_only_private_ws:
+            private_ws = self.db["workspace"].find(
+                {"user_id": user_id, "active": True},
+                filter_param,
+            )
+            workspaces = [Workspace(**w) for w in private_ws]
             workspaces.sort(key=lambda ws: ws.name if ws.name else "")
             return workspaces
 
-        # get collaborated_workspaces
+        # Own, collaborated, public, subscribed and restricted workspaces in one
+        # query, each clause of the $or is served by an index.
         user_domain = user.split("@")[1]
-        collaborators = self.db["workspace"].aggregate(
-            [
-                {
-                    "$addFields": {
-                        "result": {
-                            "$filter": {
-                                "input": {"$objectToArray": "$collaborators"},
-                                "cond": {
-                                    "$or": [
-                                        {"$eq": ["$$this.k", user]},
-                                        {"$eq": ["$$this.k", user_domain]},
-                                        # {"$eq": ["$$this.k", "*"]},
-                                    ],
-                                },
-                            },
-                        },
-                    },
-                },
-                {"$match": {"active": True}},
-                {"$match": {"$expr": {"$ne": ["$result", None]}}},
-                {"$match": {"$expr": {"$ne": [{"$size": "$result"}, 0]}}},
-                {"$project": {"result": 0}},
-            ],
+        subscribed_ids = set()
+        restricted_ids = set()
+        if user_profile:
+            subscribed_ids = set(user_profile.get("subscribed_workspaces", []) or [])
+            restricted_ids = set(user_profile.get("restricted_workspaces", []) or [])
+        ws_query = [
+            {"user_id": user_id},
+            {"principals.principal": {"$in": [user, user_domain, "*"]}},
+        ]
+        if subscribed_ids or restricted_ids:
+            ws_query.append({"id": {"$in": list(subscribed_ids | restricted_ids)}})
+        ws_stream = self.db["workspace"].find(
+            {"$or": ws_query, "active": True},
+            filter_param,
         )
-        for w in collaborators:
-            del w["_id"]
-            if remove_private_data:
-                w.pop("subscribed_users", None)
-                w.pop("stripe_conf", None)
-                w.get("settings", {}).pop("index_settings", None)
-                w.get("settings", {}).pop("search_settings", None)
-                w.get("settings", {}).pop("document_settings", None)
-            # remove duplicate workspace
+        visible_ws = [(w, Workspace(**w)) for w in ws_stream]
+        for w, ws in visible_ws:
+            if w.get("user_id", None) == user_id:
+                private_workspaces.append(ws)
+                idxs.add(w["id"])
+        for w, ws in visible_ws:
+            collaborators = w.get("collaborators", None) or {}
             if w["id"] in idxs:
                 continue
-
-            idxs.add(w["id"])
-            collaborated_workspaces.append(Workspace(**w))
-        workspaces.extend(collaborated_workspaces)
-
-        # public_workspaces
-        public_ws = self.db["workspace"].find(
-            {"collaborators.*": {"$exists": True}, "active": True},
-            filter_param,
-        )
-        for w in public_ws:
-            # remove duplicate workspace
+            if user in collaborators or user_domain in collaborators:
+                collaborated_workspaces.append(ws)
+                idxs.add(w["id"])
+        for w, ws in visible_ws:
+            collaborators = w.get("collaborators", None) or {}
             if w["id"] in idxs:
                 continue
-
-            idxs.add(w["id"])
-            public_workspaces.append(Workspace(**w))
-
+            if "*" in collaborators:
+                public_workspaces.append(ws)
+                idxs.add(w["id"])
+        for w, ws in visible_ws:
+            if w["id"] in subscribed_ids:
+                subscribed_workspaces.append(ws)
+            if w["id"] in restricted_ids:
+                restricted_workspaces.append(ws)
+        workspaces.extend(private_workspaces)
+        workspaces.extend(collaborated_workspaces)
         workspaces.extend(public_workspaces)
-
-        # Retrieve subscribed_workspaces.
-        if user_profile:
-            ws_stream = self.db["workspace"].find(
-                {
-                    "id": {"$in": user_profile.get("subscribed_workspaces", [])},
-                    "active": True,
-                },
-                filter_param,
-            )
-            for ws in ws_stream:
-                subscribed_workspaces.append(Workspace(**ws))
-            workspaces.extend(subscribed_workspaces)
-
-            rest_ws_stream = self.db["workspace"].find(
-                {
-                    "id": {"$in": user_profile.get("restricted_workspaces", [])},
-                    "active": True,
-                },
-                filter_param,
-            )
-            for ws in rest_ws_stream:
-                restricted_workspaces.append(Workspace(**ws))
+        workspaces.extend(subscribed_workspaces)
 
         ret_dict = {
             "private_workspaces": private_workspaces,
@@ -544,6 +728,11 @@ class MongoDB(NoSqlDb):
         return workspaces, ret_dict
 
     def update_workspace_data(self, workspace_id: str, set_data):
+        if "collaborators" in set_data:
+            set_data = {
+                **set_data,
+                "principals": self.get_workspace_principals(set_data["collaborators"]),
+            }
         update_ref = self.db["workspace"].update_one(
             {"id": workspace_id},
             {"$set": set_data},
@@ -786,6 +975,8 @@ class MongoDB(NoSqlDb):
         :param projection: What parameters to return or not return.
         :return: return the user object
         """
+        # Only the default projections are shared within a request.
+        use_request_cache = not projection
         if not projection:
             projection = {
                 "_id": 0,
@@ -798,12 +989,22 @@ class MongoDB(NoSqlDb):
         if not expand:
             projection["workspace_notification_settings"] = 0
 
-        user_ref = self.db["user"].find_one(
-            {
-                "id": user_id,
-            },
-            projection,
-        )
+        def load_user():
+            return self.db["user"].find_one(
+                {
+                    "id": user_id,
+                },
+                projection,
+            )
+
+        if use_request_cache:
+            user_ref = request_cache.get_cached(
+                "user",
+                ("id", user_id, expand, include_stripe_conf),
+                load_user,
+            )
+        else:
+            user_ref = load_user()
         user_list = []
         if user_ref:
             user_list.append(user_ref)
@@ -893,8 +1094,10 @@ class MongoDB(NoSqlDb):
         sort_method="name",
         reverse_sort=False,
         filter_struct=None,
+        continuation_token=None,
     ):
         opt_query_params = False
+        next_continuation_token = None
         if folder_id != "root":
             raise ValueError(
                 f"folder_id {folder_id} is not supported. Only root is allowed",
@@ -927,124 +1130,110 @@ class MongoDB(NoSqlDb):
                     {"meta.pubDate": {"$gte": filter_date_from}},
                     {"meta.pubDate": {"$lte": filter_date_to}},
                 ]
-        query_params = {"blocks": 0, "_id": 0, "key_info": 0}
-
-        if name_contains:
-            # use regex, case insensitive
-            # query["name"] = {"$regex": name_contains, "$options": "i"}
-            # regex expression will not use any index and hence will take longer. Moving to a text index on name.
-            # Partial matches are not supported by text indices
-            query["$text"] = {"$search": f'"{name_contains}"', "$language": "none"}
-            query_params = {"_id": 0, "id": 1, "name": 1}
-            opt_query_params = True
-        elif name_startswith:
-            query["name"] = {"$regex": f"^{name_startswith}", "$options": "i"}
+        query_params = DOCUMENT_INFO_PROJECTION
+
+        if name_contains or name_startswith:
+            # The multikey indices on the search grams select the candidates,
+            # the regex drops the ones which contain the grams in another order.
+            prefix = not name_contains
+            search_value = name_contains or name_startswith
+            pattern = ("^" if prefix else "") + re.escape(search_value)
+            grams = str_utils.get_search_query_grams(search_value, prefix=prefix)
+            name_query = [
+                {"name": {"$regex": pattern, "$options": "i"}},
+                {"inferred_title": {"$regex": pattern, "$options": "i"}},
+            ]
+            if grams:
+                name_query[0]["name_grams"] = {"$all": grams}
+                name_query[1]["title_grams"] = {"$all": grams}
+            query["$or"] = name_query
             query_params = {"_id": 0, "id": 1, "name": 1}
             opt_query_params = True
 
         if projection:
             query_params = projection
-        # sort the documents by name in ascending order
-        approx_count = self.db["document"].count_documents(
-            query,
-            limit=MAX_SELF_SORT_LIMIT,
+        if do_sort:
+            sort_order = 1 if not reverse_sort else -1
+            if sort_method == "time":
+                sort_field = "created_on"
+            elif sort_method == "size":
+                sort_field = "file_size"
+            elif sort_method == "title":
+                sort_field = "title_sort_key"
+            elif sort_method == "pubDate":
+                sort_field = "meta.pubDate"
+            else:
+                sort_field = "name_sort_key"
+        else:
+            sort_order = 1
+            sort_field = None
+        # id is the tie-breaker for keyset pagination.
+        sort_tuple_list = [(sort_field, sort_order)] if sort_field else []
+        sort_tuple_list.append(("id", sort_order))
+        added_sort_fields = []
+        if any(v for k, v in query_params.items() if k != "_id"):
+            # Inclusion projection, the sort keys are needed for the continuation token.
+            query_params = dict(query_params)
+            for k, _ in sort_tuple_list:
+                if k not in query_params:
+                    query_params[k] = 1
+                    added_sort_fields.append(k)
+        if not offset:
+            offset = 0
+        find_query = query
+        if continuation_token:
+            sort_values, _ = decode_continuation_token(continuation_token)
+            find_query = {
+                "$and": [
+                    query,
+                    build_keyset_query(sort_tuple_list, sort_values),
+                ],
+            }
+            offset = 0
+        document_stream = (
+            self.db["document"]
+            .find(find_query, query_params)
+            .sort(sort_tuple_list)
+            .skip(offset)
+            .limit(docs_per_page)
         )
-
-        if approx_count != MAX_SELF_SORT_LIMIT and not opt_query_params:
-            document_stream = self.db["document"].find(query, query_params)
-            documents = [Document(**d) for d in document_stream]
-            if do_sort:
-                if sort_method == "time":
-                    documents = sorted(
-                        documents,
-                        key=lambda d: d["created_on"],
-                        reverse=reverse_sort,
-                    )
-                elif sort_method == "name":
-                    documents = natsorted(
-                        documents,
-                        key=lambda d: d["name"],
-                        reverse=reverse_sort,
-                    )
-                elif sort_method == "size":
-                    documents = sorted(
-                        documents,
-                        key=lambda d: d["file_size"],
-                        reverse=reverse_sort,
-                    )
-                elif sort_method == "title":
-                    documents = natsorted(
-                        documents,
-                        key=lambda d: (not d["inferred_title"], d["inferred_title"]),
-                        reverse=reverse_sort,
-                    )
-                elif sort_method == "pubDate":
-                    documents = natsorted(
-                        documents,
-                        key=lambda d: d["meta"]["pubDate"],
-                        reverse=reverse_sort,
-                    )
-                else:
-                    documents = natsorted(
-                        documents,
-                        key=lambda d: d["name"],
-                        reverse=reverse_sort,
-                    )
-
-            documents = documents[offset : docs_per_page + offset]
+        raw_documents = [d for d in document_stream]
+        if raw_documents and len(raw_documents) == docs_per_page:
+            next_continuation_token = encode_continuation_token(
+                [get_sort_value(raw_documents[-1], k) for (k, _) in sort_tuple_list],
+            )
+        for d in raw_documents:
+            for k in added_sort_fields:
+                d.pop(k, None)
+        if opt_query_params:
+            documents = raw_documents
         else:
-            if do_sort:
-                sort_order = 1 if not reverse_sort else -1
-                if sort_method == "time":
-                    sort_field = "created_on"
-                elif sort_method == "size":
-                    sort_field = "file_size"
-                elif sort_method == "title":
-                    sort_field = "inferred_title"
-                elif sort_method == "pubDate":
-                    sort_field = "meta.pubDate"
-                else:
-                    sort_field = "name"
-                if not offset:
-                    offset = 0
-                document_stream = (
-                    self.db["document"]
-                    .find(query, query_params)
-                    .sort(
-                        [(sort_field, sort_order)],
-                    )
-                    .skip(offset)
-                    .limit(docs_per_page)
-                )
-                if opt_query_params:
-                    documents = [d for d in document_stream]
-                else:
-                    documents = [Document(**d) for d in document_stream]
-            else:
-                if offset is None:
-                    offset = 0
-                document_stream = (
-                    self.db["document"]
-                    .find(query, query_params)
-                    .skip(offset)
-                    .limit(docs_per_page)
-                )
-                if opt_query_params:
-                    documents = [d for d in document_stream]
-                else:
-                    documents = [Document(**d) for d in document_stream]
+            documents = [Document(**d) for d in raw_documents]
 
         if do_sort:
-            total_doc_count = self.db["document"].count_documents(query)
-            return {
+            if "$or" in query or "$and" in query or not isinstance(
+                query.get("status", ""),
+                str,
+            ):
+                total_doc_count = self.db["document"].count_documents(query)
+            else:
+                counter = self.get_document_counters(workspace_id, folder_id)
+                if "status" in query:
+                    total_doc_count = counter["status"].get(query["status"], 0)
+                else:
+                    total_doc_count = counter["total"]
+            output = {
                 **folder_info.to_dict(),
                 "totalDocCount": total_doc_count,
                 "documents": documents,
             }
         else:
-            return {
+            output = {
                 "documents": documents,
             }
+        if next_continuation_token:
+            output["continuationToken"] = next_continuation_token
+        return output
 
     def get_docs_in_workspace(
         self,
@@ -1069,11 +1258,17 @@ class MongoDB(NoSqlDb):
             query.update(opt_query_params)
 
         if not projection:
-            projection = {"blocks": 0, "_id": 0, "key_info": 0}
+            projection = DOCUMENT_INFO_PROJECTION
 
         total_doc_count = None
         if do_total_count:
-            total_doc_count = self.db["document"].count_documents(query)
+            if opt_query_params:
+                total_doc_count = self.db["document"].count_documents(query)
+            else:
+                total_doc_count = self.get_document_counters(
+                    workspace_id,
+                    folder_id,
+                )["total"]
 
         document_stream = (
             self.db["document"]
@@ -1097,12 +1292,189 @@ class MongoDB(NoSqlDb):
         :param folder_id: Folder ID
         :return: The number of documents in the folder.
         """
+        return self.get_document_counters(workspace_id, folder_id)["total"]
+
+    def get_document_counters(self, workspace_id, folder_id="root"):
+        """Returns the document counters of a folder. A counter which is missing or
+        was started by increments is recounted once by the first reader, the
+        others count the documents meanwhile.
+        :param workspace_id: Workspace ID
+        :param folder_id: Folder ID
+        :return: dict with total, deleted and the number of documents per status
+        """
+        counter_query = {"workspace_id": workspace_id, "folder_id": folder_id}
+        counter_col = self.db[document_counters.COUNTER_COLLECTION]
+        counter = counter_col.find_one(counter_query, {"_id": 0})
+        if not counter or not counter.get("complete", False):
+            self.document_counter_reconciler.start()
+            if not self._claim_document_counter(workspace_id, folder_id):
+                return self._count_documents(workspace_id, folder_id)[
+                    (workspace_id, folder_id)
+                ]
+            self.repair_document_counters(workspace_id, folder_id)
+            counter = counter_col.find_one(counter_query, {"_id": 0})
+        counter.setdefault("status", {})
+        return counter
+
+    def _claim_document_counter(self, workspace_id, folder_id):
+        """Claims the recount of a counter, creating it when missing.
+        :param workspace_id: Workspace ID
+        :param folder_id: Folder ID
+        :return: True when claimed, False when another recount is running
+        """
+        now = datetime.datetime.utcnow()
+        try:
+            self.db[document_counters.COUNTER_COLLECTION].update_one(
+                {
+                    "workspace_id": workspace_id,
+                    "folder_id": folder_id,
+                    "$or": [
+                        {"claimed_until": {"$exists": False}},
+                        {"claimed_until": {"$lt": now}},
+                    ],
+                },
+                {"$set": {"claimed_until": now + datetime.timedelta(minutes=10)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # The counter exists and is claimed.
+            return False
+        return True
+
+    def _count_documents(self, workspace_id=None, folder_id=None):
+        """Counts the documents per folder and status
+        :param workspace_id: Workspace ID, all workspaces when not set
+        :param folder_id: Folder ID, all folders of the workspace when not set
+        :return: dict of (workspace_id, folder_id) to counter document
+        """
+        match = {}
+        if workspace_id:
+            match["workspace_id"] = workspace_id
+        if folder_id:
+            match["parent_folder"] = folder_id
+        counters = document_counters.build_counters(
+            self.db["document"].aggregate(
+                document_counters.get_count_pipeline(match),
+                allowDiskUse=True,
+            ),
+        )
+        if workspace_id and folder_id:
+            counters.setdefault(
+                (workspace_id, folder_id),
+                document_counters.new_counter(workspace_id, folder_id),
+            )
+        return counters
+
+    def repair_document_counters(self, workspace_id=None, folder_id=None):
+        """Recounts the document counters from the document collection. The
+        counters are corrected by the difference between the count and their value
+        read before counting, so that increments made meanwhile are kept. The
+        caller must hold the claim of the counters.
+        :param workspace_id: Workspace ID, all workspaces when not set
+        :param folder_id: Folder ID, all folders of the workspace when not set
+        :return: number of counters written
+        """
+        counter_query = {}
+        if workspace_id:
+            counter_query["workspace_id"] = workspace_id
+        if folder_id:
+            counter_query["folder_id"] = folder_id
+        counter_col = self.db[document_counters.COUNTER_COLLECTION]
+        before = {
+            (c["workspace_id"], c["folder_id"]): c
+            for c in counter_col.find(
+                counter_query,
+                {
+                    "_id": 0,
+                    "workspace_id": 1,
+                    "folder_id": 1,
+                    "total": 1,
+                    "deleted": 1,
+                    "status": 1,
+                },
+            )
+        }
+        counters = self._count_documents(workspace_id, folder_id)
+        # Reset the counters of the folders which are empty by now.
+        for key in before:
+            counters.setdefault(key, document_counters.new_counter(*key))
+        checked_on = datetime.datetime.utcnow()
+        for (key_workspace_id, key_folder_id), counter in counters.items():
+            counter_filter = {
+                "workspace_id": key_workspace_id,
+                "folder_id": key_folder_id,
+            }
+            update = {
+                "$inc": document_counters.get_recount_inc(
+                    before.get((key_workspace_id, key_folder_id), None),
+                    counter,
+                ),
+                "$set": {"complete": True, "checked_on": checked_on},
+                "$unset": {"claimed_until": ""},
+            }
+            try:
+                counter_col.update_one(counter_filter, update, upsert=True)
+            except DuplicateKeyError:
+                # Created by an increment meanwhile.
+                counter_col.update_one(counter_filter, update)
+        self.logger.info(f"{len(counters)} document counters recomputed")
+        return len(counters)
+
+    def claim_document_counter_repairs(self, max_age, limit):
+        """
+        Claims the counters which are incomplete or were recounted longer than
+        max_age ago, so that concurrent reconcilers do not recount the same folder.
+        :param max_age: Seconds after which the counters are recounted.
+        :param limit: Maximum number of counters to claim.
+        :return: List of (workspace_id, folder_id).
+        """
+        now = datetime.datetime.utcnow()
+        checked_before = now - datetime.timedelta(seconds=max_age)
         query = {
-            "is_deleted": False,
-            "parent_folder": folder_id,
-            "workspace_id": workspace_id,
+            "$and": [
+                {
+                    "$or": [
+                        {"complete": {"$ne": True}},
+                        {"checked_on": {"$exists": False}},
+                        {"checked_on": {"$lt": checked_before}},
+                    ],
+                },
+                {
+                    "$or": [
+                        {"claimed_until": {"$exists": False}},
+                        {"claimed_until": {"$lt": now}},
+                    ],
+                },
+            ],
         }
-        return self.db["document"].find(query).count()
+        keys = []
+        for _ in range(limit):
+            counter = self.db[document_counters.COUNTER_COLLECTION].find_one_and_update(
+                query,
+                {"$set": {"claimed_until": now + datetime.timedelta(minutes=10)}},
+                projection={"_id": 0, "workspace_id": 1, "folder_id": 1},
+            )
+            if not counter:
+                break
+            keys.append((counter["workspace_id"], counter["folder_id"]))
+        return keys
+
+    def _update_document_counters(self, old_doc, new_doc):
+        """Moves a document between the counters after a write
+        :param old_doc: counted fields before the write, None when created
+        :param new_doc: counted fields after the write, None when removed
+        """
+        updates = document_counters.get_transition_updates(old_doc, new_doc)
+        if not updates:
+            return
+        try:
+            self.db[document_counters.COUNTER_COLLECTION].bulk_write(
+                updates,
+                ordered=False,
+            )
+        except Exception as e:
+            # The reconciler recounts the counters periodically.
+            self.logger.error(f"Failed to update document counters, err: {e}")
 
     def folder_exists(self, workspace_id, folder_id):
         folder = self.db["folder"].find_one({"id": folder_id})
@@ -1121,11 +1493,24 @@ class MongoDB(NoSqlDb):
             document.id,
             "uploaded_document",
         )
-        return self._create_entity(
+        document_json = document_json or document.to_dict()
+        doc_id = self._create_entity(
             document,
             "document",
-            entity_object_dict=document_json,
+            entity_object_dict={
+                **document_json,
+                **str_utils.get_document_sort_keys(
+                    document_json.get("name", None),
+                    document_json.get("inferred_title", None),
+                ),
+                **str_utils.get_document_search_keys(
+                    document_json.get("name", None),
+                    document_json.get("inferred_title", None),
+                ),
+            },
         )
+        self._update_document_counters(None, document_json)
+        return doc_id
 
     def set_document_info(self, document_id, data_to_set):
         """Updates an existing workspace
@@ -1133,10 +1518,30 @@ class MongoDB(NoSqlDb):
         :param data_to_set: field values to set
         :return:
         """
-        self.db["document"].update_one(
-            {"id": document_id},
+        self._set_document_fields({"id": document_id}, data_to_set)
+
+    def _set_document_fields(self, query, data_to_set):
+        """Sets fields of a document, keeping the document counters in sync
+        when a counted field changes
+        :param query: filter matching the document
+        :param data_to_set: field values to set
+        :return: True if a document matched
+        """
+        data_to_set = {
+            **data_to_set,
+            **str_utils.get_document_key_updates(data_to_set),
+        }
+        if not any(k in document_counters.COUNTED_FIELDS for k in data_to_set):
+            result = self.db["document"].update_one(query, {"$set": data_to_set})
+            return result.matched_count > 0
+        old_doc = self.db["document"].find_one_and_update(
+            query,
             {"$set": data_to_set},
+            projection=document_counters.COUNTED_PROJECTION,
         )
+        if old_doc:
+            self._update_document_counters(old_doc, {**old_doc, **data_to_set})
+        return old_doc is not None
 
     def update_document(self, document_id, doc_info):
         logging.info(f"updating document entry {document_id}")
@@ -1144,23 +1549,29 @@ class MongoDB(NoSqlDb):
         old_id = doc_info.id
         old_doc_ws_id = doc_info.workspace_id
         old_doc_folder_id = doc_info.parent_folder
-        if self.db["document"].find_one(
+        new_doc = {
+            **doc_info.to_dict(),
+            **str_utils.get_document_sort_keys(
+                doc_info.name,
+                doc_info.inferred_title,
+            ),
+            **str_utils.get_document_search_keys(
+                doc_info.name,
+                doc_info.inferred_title,
+            ),
+        }
+        old_doc = self.db["document"].find_one_and_replace(
             {
                 "id": old_id,
                 "workspace_id": old_doc_ws_id,
                 "parent_folder": old_doc_folder_id,
                 "is_deleted": False,
             },
-        ):
-            self.db["document"].replace_one(
-                {
-                    "id": old_id,
-                    "workspace_id": old_doc_ws_id,
-                    "parent_folder": old_doc_folder_id,
-                    "is_deleted": False,
-                },
-                doc_info.to_dict(),
-            )
+            new_doc,
+            projection=document_counters.COUNTED_PROJECTION,
+        )
+        if old_doc:
+            self._update_document_counters(old_doc, new_doc)
             logging.info(f"Updated document {old_id}")
             return True
         logging.info("DID NOT FIND DOCUMENT!")
@@ -1170,9 +1581,9 @@ class MongoDB(NoSqlDb):
     def add_document_attribute(self, document_id, attribute_key, attribute_value):
         if self.get_document_info_by_id(document_id):
             if len(attribute_key) and len(attribute_value):
-                self.db["document"].update_one(
+                self._set_document_fields(
                     {"id": document_id},
-                    {"$set": {attribute_key: attribute_value}},
+                    {attribute_key: attribute_value},
                 )
                 return True
         return False
@@ -1188,7 +1599,13 @@ class MongoDB(NoSqlDb):
         if self.db["document"].find_one({"id": document_id, "is_deleted": False}):
             self.db["document"].update_one(
                 {"id": document_id, "is_deleted": False},
-                {"$set": {"name": newname}},
+                {
+                    "$set": {
+                        "name": newname,
+                        "name_sort_key": str_utils.get_natural_sort_key(newname),
+                        "name_grams": str_utils.get_search_grams(newname),
+                    },
+                },
             )
             logging.info(f"Updated document name from {doc_old_name} to {newname}")
             return newname
@@ -1232,11 +1649,7 @@ class MongoDB(NoSqlDb):
 
     def get_document(self, workspace_id, document_id, filter_params=None):
         if not filter_params:
-            filter_params = {
-                "blocks": 0,
-                "_id": 0,
-                "key_info": 0,
-            }
+            filter_params = DOCUMENT_INFO_PROJECTION
         db_doc = self.db["document"].find_one(
             {"id": document_id, "is_deleted": False},
             filter_params,
@@ -1252,12 +1665,19 @@ class MongoDB(NoSqlDb):
         # check auth, for now find and delete
         # self.db["document"].delete_one({"id": document_id})
         if not permanent:
-            self.db["document"].update_one(
+            self._set_document_fields(
                 {"id": document_id, "is_deleted": False},
-                {"$set": {"is_deleted": True}},
+                {"is_deleted": True},
             )
         else:
-            self.db["document"].delete_one({"id": document_id})
+            old_doc = self.db["document"].find_one_and_delete(
+                {"id": document_id},
+                projection=document_counters.COUNTED_PROJECTION,
+            )
+            self._update_document_counters(old_doc, None)
+            self.db[document_payload.PAYLOAD_COLLECTION].delete_one(
+                {"doc_id": document_id},
+            )
 
         return Document(document_id)
 
@@ -1274,7 +1694,7 @@ class MongoDB(NoSqlDb):
             query["is_deleted"] = False
         db_doc = self.db["document"].find_one(
             query,
-            {"blocks": 0, "_id": 0, "key_info": 0},
+            DOCUMENT_INFO_PROJECTION,
         )
         if db_doc is None:
             raise Exception(f"Document {document_id} not found")
@@ -1287,7 +1707,7 @@ class MongoDB(NoSqlDb):
     def get_document_infos_by_ids(self, document_ids):
         cursor = self.db["document"].find(
             {"id": {"$in": document_ids}, "is_deleted": False},
-            {"blocks": 0, "_id": 0, "key_info": 0},
+            DOCUMENT_INFO_PROJECTION,
         )
         docs = []
         for item in cursor:
@@ -1298,87 +1718,81 @@ class MongoDB(NoSqlDb):
     def get_document_info_by_source_url(self, source_url):
         db_doc = self.db["document"].find_one(
             {"source_url": source_url, "is_deleted": False},
-            {"blocks": 0, "_id": 0, "key_info": 0},
+            DOCUMENT_INFO_PROJECTION,
         )
         if db_doc is None:
             raise Exception(f"Document {source_url} not found")
         doc = Document(**db_doc)
         return doc
 
+    def get_document_payload(self, doc_id, kind):
+        """Loads the blocks or key_info of a document from the payload collection.
+        Documents which have not been migrated yet still carry them inline.
+        :param doc_id: id of the document
+        :param kind: blocks or key_info
+        :return: payload, None if the document has none
+        """
+        payload_ref = self.db[document_payload.PAYLOAD_COLLECTION].find_one(
+            {"doc_id": doc_id},
+            {"_id": 0, kind: 1},
+        )
+        if payload_ref and payload_ref.get(kind, None) is not None:
+            return document_payload.decompress_payload(payload_ref[kind])
+        doc_ref = self.db["document"].find_one({"id": doc_id}, {"_id": 0, kind: 1})
+        return doc_ref.get(kind, None) if doc_ref else None
+
+    def save_document_payload(self, doc_id, kind, data):
+        """Stores the blocks or key_info of a document compressed in the payload collection
+        :param doc_id: id of the document
+        :param kind: blocks or key_info
+        :param data: payload, None removes it
+        """
+        if data is None:
+            update = {"$unset": {kind: 1, f"{kind}_size": 1}}
+        else:
+            compressed = document_payload.compress_payload(data)
+            update = {"$set": {kind: compressed, f"{kind}_size": len(compressed)}}
+        self.db[document_payload.PAYLOAD_COLLECTION].update_one(
+            {"doc_id": doc_id},
+            update,
+            upsert=data is not None,
+        )
+        # Drop the inline copy of documents written before the payload collection.
+        self.db["document"].update_one(
+            {"id": doc_id, kind: {"$exists": True}},
+            {"$unset": {kind: 1}},
+        )
+
     def get_document_key_info_by_id(self, document_id):
-        db_doc = self.db["document"].find_one({"id": document_id}, {"key_info": 1})
+        db_doc = self.db["document"].find_one({"id": document_id}, {"_id": 1})
         if db_doc is None:
             raise Exception(f"Document {document_id} not found")
-        if "key_info" not in db_doc:
-            db_doc["key_info"] = dict(section_summary=[], key_value_pairs=[])
-        key_info = DocumentKeyInfo(**db_doc["key_info"])
-        return key_info
+        key_info = self.get_document_payload(document_id, "key_info")
+        if key_info is None:
+            key_info = dict(section_summary=[], key_value_pairs=[])
+        return DocumentKeyInfo(**key_info)
 
     def get_document_reference_definitions_by_id(self, document_id):
-        db_doc = self.db["document"].find_one(
-            {"id": document_id},
-            {"_id": 0, "key_info.reference_definitions": 1},
-        )
+        db_doc = self.db["document"].find_one({"id": document_id}, {"_id": 1})
         if db_doc is None:
             self.logger.info(f"Document {document_id} not found")
             return None
-        return db_doc.get("key_info", {}).get("reference_definitions", {})
+        key_info = self.get_document_payload(document_id, "key_info") or {}
+        return key_info.get("reference_definitions", {})
 
     def get_status_of_docs_in(self, workspace_id: str, folder_id: str = "root"):
-        pipeline = [
-            {
-                "$match": {
-                    "is_deleted": False,
-                    "parent_folder": folder_id,
-                    "workspace_id": workspace_id,
-                },
-            },
-            {
-                "$facet": {
-                    "total": [
-                        {"$match": {"status": {"$exists": True}}},
-                        {"$count": "total"},
-                    ],
-                    "ingest_ok": [
-                        {"$match": {"status": "ingest_ok"}},
-                        {"$count": "ingest_ok"},
-                    ],
-                    "ingest_failed": [
-                        {"$match": {"status": "ingest_failed"}},
-                        {"$count": "ingest_failed"},
-                    ],
-                    "ready_for_ingestion": [
-                        {"$match": {"status": "ready_for_ingestion"}},
-                        {"$count": "ready_for_ingestion"},
-                    ],
-                    "ingest_inprogress": [
-                        {"$match": {"status": "ingest_inprogress"}},
-                        {"$count": "ingest_inprogress"},
-                    ],
-                },
-            },
-            {
-                "$project": {
-                    "total": {"$arrayElemAt": ["$total.total", 0]},
-                    "ingest_ok": {"$arrayElemAt": ["$ingest_ok.ingest_ok", 0]},
-                    "ingest_failed": {
-                        "$arrayElemAt": ["$ingest_failed.ingest_failed", 0],
-                    },
-                    "ready_for_ingestion": {
-                        "$arrayElemAt": ["$ready_for_ingestion.ready_for_ingestion", 0],
-                    },
-                    "ingest_inprogress": {
-                        "$arrayElemAt": ["$ingest_inprogress.ingest_inprogress", 0],
-                    },
-                },
-            },
-        ]
-        db_data = self.db["document"].aggregate(pipeline)
+        counter = self.get_document_counters(workspace_id, folder_id)
         output = {}
-        if db_data:
-            for d in db_data:
-                output = d
-                break
+        if counter["total"]:
+            output["total"] = counter["total"]
+        for status in [
+            "ingest_ok",
+            "ingest_failed",
+            "ready_for_ingestion",
+            "ingest_inprogress",
+        ]:
+            if counter["status"].get(status, 0):
+                output[status] = counter["status"][status]
         return output
 
     # FieldBundle operations
@@ -1442,12 +1856,20 @@ class MongoDB(NoSqlDb):
     ):
         if not bundle_id:
             return None
-        if not projection:
-            projection = {"_id": 0}
-        bundle_ref = self.db["field_bundle"].find_one(
-            {"id": bundle_id},
-            projection,
-        )
+        if projection:
+            bundle_ref = self.db["field_bundle"].find_one(
+                {"id": bundle_id},
+                projection,
+            )
+        else:
+            bundle_ref = request_cache.get_cached(
+                "field_bundle",
+                bundle_id,
+                lambda: self.db["field_bundle"].find_one(
+                    {"id": bundle_id},
+                    {"_id": 0},
+                ),
+            )
         if bundle_ref:
             return bundle_ref if return_dict else FieldBundle(**bundle_ref)
         else:
@@ -1483,9 +1905,54 @@ class MongoDB(NoSqlDb):
             return None
 
     def delete_field_bundle(self, field_bundle_id):
-        self.db["field_bundle"].delete_one({"id": field_bundle_id})
+        bundle = self.db["field_bundle"].find_one_and_delete(
+            {"id": field_bundle_id},
+            projection={"_id": 0, "workspace_id": 1},
+        )
+        if bundle and bundle.get("workspace_id", None):
+            self.drop_field_bundle_grid(bundle["workspace_id"], field_bundle_id)
+        self.db["field_bundle_version"].delete_one({"field_bundle_id": field_bundle_id})
+        self.db[field_value_stats.STATS_STATE_COLLECTION].delete_one(
+            {"field_bundle_id": field_bundle_id},
+        )
+        self.db[field_value_stats.STATS_COLLECTION].delete_many(
+            {"field_bundle_idx": field_bundle_id},
+        )
         return field_bundle_id
 
+    def get_field_bundle_version(self, field_bundle_id):
+        """Returns the version of the field bundle definition, bumped whenever
+        the bundle or one of its fields changes
+        :param field_bundle_id: id of the field bundle
+        :return: version, 0 for bundles which never changed
+        """
+        version_ref = self.db["field_bundle_version"].find_one(
+            {"field_bundle_id": field_bundle_id},
+            {"_id": 0, "version": 1},
+        )
+        return version_ref.get("version", 0) if version_ref else 0
+
+    def bump_field_bundle_version(self, field_bundle_id=None, field_id=None):
+        """Bumps the version of a field bundle, or of the bundle of the field
+        :param field_bundle_id: id of the field bundle
+        :param field_id: id of the changed field
+        """
+        bundle_ids = [field_bundle_id] if field_bundle_id else []
+        if field_id:
+            # Same membership as get_fields_in_bundle.
+            field = self.db["field"].find_one(
+                {"id": field_id},
+                {"_id": 0, "parent_bundle_id": 1},
+            )
+            if field and field.get("parent_bundle_id", None):
+                bundle_ids.append(field["parent_bundle_id"])
+        for bundle_id in set(bundle_ids):
+            self.db["field_bundle_version"].update_one(
+                {"field_bundle_id": bundle_id},
+                {"$inc": {"version": 1}},
+                upsert=True,
+            )
+
     def get_field_bundles_with_tag(self, tag) -> Optional[List[FieldBundle]]:
         # query = self.db.collection(u'field_bundle').where(u'tags', u'array_contains', tag)
         query = self.db["field_bundle"].find({"array_contains": tag})
@@ -1524,6 +1991,7 @@ class MongoDB(NoSqlDb):
             {"id": bundle_id},
             {"$set": {"field_ids": field_ids}},
         )
+        self.bump_field_bundle_version(bundle_id)
 
     def add_fields_to_bundle(self, newly_created_field_id, bundle_id):
         """Add an existing field to a field bundle
@@ -1535,18 +2003,21 @@ class MongoDB(NoSqlDb):
             {"id": bundle_id},
             {"$push": {"field_ids": newly_created_field_id}},
         )
+        self.bump_field_bundle_version(bundle_id)
 
     def update_fields_in_bundle(self, field_ids, field_bundle_id):
         self.db["field_bundle"].update_one(
             {"id": field_bundle_id},
             {"$set": {"field_ids": field_ids}},
         )
+        self.bump_field_bundle_version(field_bundle_id)
 
     def update_field_bundle_attr(self, set_data, field_bundle_id):
         self.db["field_bundle"].update_one(
             {"id": field_bundle_id},
             {"$set": set_data},
         )
+        self.bump_field_bundle_version(field_bundle_id)
 
     def create_field(self, field):
         if not field.id or not field.name:
@@ -1569,6 +2040,17 @@ class MongoDB(NoSqlDb):
                 {"id": field_idx},
                 {"$set": {"status.progress": "done"}},
             )
+        elif action == "chunk_done":
+            # Progress of a dependent field recomputation, done is set once it finishes.
+            self.db["field"].update_one(
+                {"id": field_idx},
+                {
+                    "$set": {
+                        "status.progress": "extracting",
+                        "status.written": kwargs.get("written", 0),
+                    },
+                },
+            )
         elif action == "batch_done":
             self.db["field"].update_one(
                 {"id": field_idx},
@@ -1638,6 +2120,7 @@ class MongoDB(NoSqlDb):
                     {"id": parent_bundle_id},
                     {"$set": {"field_ids": field_ids}},
                 )
+                self.bump_field_bundle_version(parent_bundle_id)
                 logger.info(
                     f"new bundle is {self.get_field_bundle_info(parent_bundle_id)}",
                 )
@@ -1737,14 +2220,27 @@ class MongoDB(NoSqlDb):
         :param field: field object
         :return: return id of the user to update
         """
+        old_field = self.db["field"].find_one(
+            {"id": field_id},
+            {"_id": 0, "parent_bundle_id": 1},
+        )
         field = self.escape_mongo_data(field)
-        return self._update_entity(field_id, field, "field")
+        updated_id = self._update_entity(field_id, field, "field")
+        # A field moved to another bundle changes both bundles.
+        self.bump_field_bundle_version(
+            field_bundle_id=(old_field or {}).get("parent_bundle_id", None),
+            field_id=field_id,
+        )
+        return updated_id
 
     def update_field_attr(self, set_data, field_id):
         self.db["field"].update_one(
             {"id": field_id},
             {"$set": set_data},
         )
+        # Extraction progress does not change the definition of the field.
+        if any(not key.startswith("status") for key in set_data):
+            self.bump_field_bundle_version(field_id=field_id)
 
     def update_fields_status_from_ingestor(self, field_ids):
         self.db["field"].update_many(
@@ -1804,13 +2300,12 @@ class MongoDB(NoSqlDb):
 
     def get_parsed_blocks_for_document(self, doc_id: str) -> Optional[List]:
         # check if the document has been ingested
-        doc_ref = self.db["document"].find_one({"id": doc_id, "is_deleted": False})
+        doc_ref = self.db["document"].find_one(
+            {"id": doc_id, "is_deleted": False},
+            {"_id": 0, "status": 1},
+        )
         if doc_ref and doc_ref["status"] == "ingest_ok":
-            doc_blocks = doc_ref["blocks"]
-            block_list = []
-            for block in doc_blocks:
-                block_list.append(block)
-            return block_list
+            return self.get_document_payload(doc_id, "blocks") or []
         else:
             raise Exception(f"document with id {doc_id} does not exist")
 
@@ -1874,8 +2369,8 @@ class MongoDB(NoSqlDb):
         }
 
         search_history = SearchHistory(**info)
-
-        return self._create_entity(search_history, "search_history", append=True)
+        self.audit_writer.submit("search_history", search_history.to_dict())
+        return search_history.id
 
     def get_search_history_by_days(
         self,
@@ -1928,9 +2423,13 @@ class MongoDB(NoSqlDb):
         Get document, field and field_value for a workspace
         """
         # Fetch all active documents in a workspace
-        doc_stream = self.db["document"].find(
-            {"workspace_id": workspace_id, "is_deleted": False},
-            {"blocks": 0},
+        doc_stream = (
+            self.analytics_db["document"]
+            .find(
+                {"workspace_id": workspace_id, "is_deleted": False},
+                {"blocks": 0},
+            )
+            .max_time_ms(self.analytics_max_time_ms)
         )
         doc_ref = []
         for doc in doc_stream:
@@ -1938,21 +2437,29 @@ class MongoDB(NoSqlDb):
             doc_ref.append(Document(**doc))
 
         # Fetch all fields in a workspace
-        field_stream = self.db["field"].find({"workspace_id": workspace_id}, {"_id": 0})
+        field_stream = (
+            self.analytics_db["field"]
+            .find({"workspace_id": workspace_id}, {"_id": 0})
+            .max_time_ms(self.analytics_max_time_ms)
+        )
         field_ref = []
         for field in field_stream:
             field = self.unescape_mongo_data(field)
             field_ref.append(Field(**field))
         # Fetch all field values in a workspace for specific date range
-        field_value_stream = self.db["field_value"].find(
-            {
-                "workspace_idx": workspace_id,
-                "$and": [
-                    {"last_modified": {"$gte": start_date_time}},
-                    {"last_modified": {"$lte": end_date_time}},
-                ],
-            },
-            {"_id": 0},
+        field_value_stream = (
+            self.analytics_db["field_value"]
+            .find(
+                {
+                    "workspace_idx": workspace_id,
+                    "$and": [
+                        {"last_modified": {"$gte": start_date_time}},
+                        {"last_modified": {"$lte": end_date_time}},
+                    ],
+                },
+                {"_id": 0},
+            )
+            .max_time_ms(self.analytics_max_time_ms)
         )
         field_value_ref = []
         for field_value in field_value_stream:
@@ -1963,15 +2470,14 @@ class MongoDB(NoSqlDb):
         return doc_ref, field_ref, field_value_ref
 
     def delete_document_blocks(self, doc_id):
-        doc_ref = self.db["document"].find_one({"id": doc_id, "is_deleted": False})
-        if doc_ref and "blocks" in doc_ref:
-            blocks_ref = doc_ref["blocks"]
-            blocks = [b for b in blocks_ref]
+        doc_ref = self.db["document"].find_one(
+            {"id": doc_id, "is_deleted": False},
+            {"_id": 1},
+        )
+        blocks = self.get_document_payload(doc_id, "blocks") if doc_ref else None
+        if blocks is not None:
             self.logger.info(f"deleting {len(blocks)} for document id {doc_id}")
-            self.db["document"].find_one_and_update(
-                {"id": doc_id, "is_deleted": False},
-                {"$set": {"blocks": []}},
-            )
+            self.save_document_payload(doc_id, "blocks", None)
             return blocks
 
     def get_document_blocks(self, doc_id):
@@ -1990,23 +2496,20 @@ class MongoDB(NoSqlDb):
             return None
 
     def save_document_blocks(self, doc_id, blocks):
-        doc_ref = self.db["document"].find_one({"id": doc_id, "is_deleted": False})
+        doc_ref = self.db["document"].find_one(
+            {"id": doc_id, "is_deleted": False},
+            {"_id": 1},
+        )
         if doc_ref:
-            self.db["document"].update(
-                {"id": doc_id, "is_deleted": False},
-                {"$set": {"blocks": blocks}},
-            )
+            self.save_document_payload(doc_id, "blocks", blocks)
         else:
             self.logger.error("document not found")
         return doc_id
 
     def save_document_key_info(self, doc_id, key_info):
-        doc_ref = self.db["document"].find_one({"id": doc_id})
+        doc_ref = self.db["document"].find_one({"id": doc_id}, {"_id": 1})
         if doc_ref:
-            self.db["document"].update_one(
-                {"id": doc_id},
-                {"$set": {"key_info": key_info}},
-            )
+            self.save_document_payload(doc_id, "key_info", key_info)
         else:
             self.logger.error("document not found")
         return doc_id
@@ -2037,6 +2540,10 @@ class MongoDB(NoSqlDb):
             set_data["title"] = title
         if inferred_title:
             set_data["inferred_title"] = inferred_title
+            set_data["title_sort_key"] = str_utils.get_document_sort_keys(
+                inferred_title=inferred_title,
+            )["title_sort_key"]
+            set_data["title_grams"] = str_utils.get_search_grams(inferred_title)
         if rendered_file_location:
             set_data["rendered_file_location"] = rendered_file_location
         if rendered_json_file_location:
@@ -2048,8 +2555,11 @@ class MongoDB(NoSqlDb):
             {
                 "$set": set_data,
             },
+            projection=document_counters.COUNTED_PROJECTION,
         )
         if doc_ref:
+            if status:
+                self._update_document_counters(doc_ref, {**doc_ref, **set_data})
             self.logger.info(f"document {doc_id} updated with status {status}")
         else:
             self.logger.error(f"document {doc_id} not found, cannot update status")
@@ -2678,6 +3188,11 @@ class MongoDB(NoSqlDb):
         ]
 
     def create_access_log(self, access_log):
+        if (
+            access_log.get("status", None) == "success"
+            and random.random() >= ACCESS_LOG_SAMPLE_RATE
+        ):
+            return
         access_log.update(
             {
                 "datetime": datetime.datetime.now(),
@@ -2688,7 +3203,8 @@ class MongoDB(NoSqlDb):
                 "user_agent": request.headers.get("User-Agent", None),
             },
         )
-        self.db["access_logs"].insert_one(access_log)
+        # Written in the background, copied as the caller keeps updating it.
+        self.audit_writer.submit("access_logs", dict(access_log))
 
     # API for Active Learning
     def create_training_sample(self, training_sample):
@@ -2898,7 +3414,9 @@ class MongoDB(NoSqlDb):
 
         extracted_fields = self.escape_mongo_data(extracted_fields)
         field_id_list = []
+        file_id_list = []
         workspace_id = None
+        changes = []
 
         for field_values in extracted_fields:
             update_query = {
@@ -2909,12 +3427,29 @@ class MongoDB(NoSqlDb):
             }
             if update_query["field_idx"] not in field_id_list:
                 field_id_list.append(update_query["field_idx"])
+            if update_query["file_idx"] not in file_id_list:
+                file_id_list.append(update_query["file_idx"])
             if not workspace_id:
                 workspace_id = update_query["workspace_idx"]
 
             if field_values.get("batch_idx", None):
                 update_query["batch_idx"] = field_values.pop("batch_idx")
 
+            new_top_fact = (
+                field_values["topic_facts"][0]
+                if "topic_facts" in field_values and field_values["topic_facts"]
+                else {}
+            )
+            changes.append(
+                {
+                    "workspace_idx": update_query["workspace_idx"],
+                    "field_bundle_idx": update_query["field_bundle_idx"],
+                    "field_idx": update_query["field_idx"],
+                    "file_idx": update_query["file_idx"],
+                    "file_name": field_values.get("file_name", None),
+                    "new_top_fact": new_top_fact,
+                },
+            )
             query.append(
                 UpdateOne(
                     update_query,
@@ -2929,10 +3464,7 @@ class MongoDB(NoSqlDb):
                                                 "$top_fact.type",
                                             ],
                                         },
-                                        "then": field_values["topic_facts"][0]
-                                        if "topic_facts" in field_values
-                                        and field_values["topic_facts"]
-                                        else {},
+                                        "then": new_top_fact,
                                         "else": "$top_fact",
                                     },
                                 },
@@ -2944,59 +3476,103 @@ class MongoDB(NoSqlDb):
                     upsert=True,
                 ),
             )
+        # Existing values, to keep the derived data in sync with the update.
+        existing_top_facts = self._get_existing_top_facts(
+            {
+                "workspace_idx": workspace_id,
+                "field_idx": {"$in": field_id_list},
+                "file_idx": {"$in": file_id_list},
+            },
+        )
         ret_val = self.db["field_value"].bulk_write(query)
-        for f in field_id_list:
-            # Calculate distinct values.
-            dist_data_ref = self.db["field_value"].aggregate(
-                [
-                    {
-                        "$match": {
-                            "workspace_idx": workspace_id,
-                            "field_idx": f,
-                        },
-                    },
-                    {
-                        "$group": {
-                            "_id": "$top_fact.answer_details.raw_value",
-                        },
-                    },
-                ],
-            )
-            distinct_values = [d1["_id"] for d1 in dist_data_ref]
-            logger.info(
-                f"Calculating distinct values for field {f}",
-            )
-            # Update the distinct_values in field definition.
-            self.db["field"].update_one(
-                {
-                    "id": f,
-                },
-                {
-                    "$set": {
-                        "distinct_values": distinct_values,
-                    },
-                },
-            )
+        for change in changes:
+            key = (change["field_idx"], change["file_idx"])
+            change["old_exists"] = key in existing_top_facts
+            old_top_fact = existing_top_facts.get(key, {})
+            change["old_raw_value"] = get_raw_value(old_top_fact)
+            change["old_top_fact"] = old_top_fact
+            change["new_exists"] = True
+            # User selected answers are not overridden by the extraction.
+            if old_top_fact.get("type", None):
+                change["new_raw_value"] = change["old_raw_value"]
+                change["new_top_fact"] = None
+            else:
+                change["new_raw_value"] = get_raw_value(change["new_top_fact"])
+        logger.info(f"Updating distinct values and grid for fields {field_id_list}")
+        self.apply_field_value_changes(changes)
+        # The old values were read before the write, register the fields with the
+        # reconciler which recounts them.
+        self.db[FIELD_DISTINCT_VALUE_STATE_COLLECTION].bulk_write(
+            [
+                UpdateOne(
+                    {"field_idx": f_idx},
+                    {"$setOnInsert": {"workspace_idx": workspace_id}},
+                    upsert=True,
+                )
+                for f_idx in field_id_list
+            ],
+            ordered=False,
+        )
+        self.distinct_value_reconciler.start()
         return ret_val
 
     def bulk_approve_field_value(self, query):
         # only approve field_values that don't have top_fact.type
         query["top_fact.type"] = {"$exists": False}
+        approved = self._get_field_value_stat_changes(query, {"type": "approve"})
         res = self.db["field_value"].update_many(
             query,
-            {"$set": {"top_fact.type": "approve"}},
+            {
+                "$set": {"top_fact.type": "approve"},
+                "$currentDate": {"last_modified": {"$type": "date"}},
+            },
         )
+        if res.modified_count:
+            self._apply_top_fact_update_changes(
+                approved,
+                {"type": "approve"},
+                res.modified_count,
+            )
         return res.modified_count
 
     def bulk_disapprove_field_value(self, query):
         # unset disapprove fields with top_fact.type == "approve"
         query["top_fact.type"] = "approve"
+        disapproved = self._get_field_value_stat_changes(query, {"type": None})
         res = self.db["field_value"].update_many(
             query,
-            {"$unset": {"top_fact.type": ""}},
+            {
+                "$unset": {"top_fact.type": ""},
+                "$currentDate": {"last_modified": {"$type": "date"}},
+            },
         )
+        if res.modified_count:
+            self._apply_top_fact_update_changes(
+                disapproved,
+                {"type": None},
+                res.modified_count,
+            )
         return res.modified_count
 
+    def _apply_top_fact_update_changes(self, stat_changes, top_fact_update, count):
+        """
+        Applies an update_many of the top_fact of field values to the materialized
+        grids and the statistics of their bundles.
+        :param stat_changes: Changes read by _get_field_value_stat_changes.
+        :param top_fact_update: top_fact keys set by the update, None to unset them.
+        :param count: Number of field values modified, the grids and statistics are
+            marked stale when it does not match the changes.
+        :return: VOID
+        """
+        if count != len(stat_changes):
+            # Field values were written between the read and the update.
+            self.invalidate_field_bundle_grid_ids(
+                {change["field_bundle_idx"] for change in stat_changes},
+            )
+            return
+        self._apply_grid_top_fact_updates(stat_changes, top_fact_update)
+        self._apply_field_value_stat_deltas(stat_changes)
+
     def get_relation_edge_topic_facts(self, field_id, relation_head, relation_tail):
         relation_head = {"$regex": "^" + relation_head, "$options": "i"}
         relation_tail = {"$regex": "^" + relation_tail, "$options": "i"}
@@ -3039,62 +3615,126 @@ class MongoDB(NoSqlDb):
         field_value.selected_row = self.escape_mongo_data(field_value.selected_row)
         field_value.selected_row = correct_legacy_answers(field_value.selected_row)
         logger.info(f"Updating field_value for {field_value.field_id}")
-        ret_val = self.db["field_value"].update_one(
-            {
-                "field_idx": field_value.field_id,
-                "file_idx": field_value.doc_id,
-                "workspace_idx": field_value.workspace_id,
-                "field_bundle_idx": field_value.field_bundle_id,
-            },
+        field_value.history = field_value.history or []
+        fv_query = {
+            "field_idx": field_value.field_id,
+            "file_idx": field_value.doc_id,
+            "workspace_idx": field_value.workspace_id,
+            "field_bundle_idx": field_value.field_bundle_id,
+        }
+        old_fv = self.db["field_value"].find_one_and_update(
+            fv_query,
             {
                 "$push": {
-                    "field_value_history": {
-                        "$each": field_value.history,
-                        "$position": 0,
-                        # "$slice": 20
-                    },
+                    "field_value_history": get_history_push(field_value.history),
                 },
+                "$inc": {"field_value_history_count": len(field_value.history)},
                 "$set": {
                     "top_fact": field_value.selected_row,
                     "file_name": field_value.doc_name,
                 },
                 "$currentDate": {"last_modified": {"$type": "date"}},
             },
+            projection={
+                "_id": 0,
+                "top_fact.type": 1,
+                "top_fact.is_override": 1,
+                "top_fact.answer_details.raw_value": 1,
+                **get_dropped_history_projection(len(field_value.history)),
+            },
             upsert=True,
+            return_document=ReturnDocument.BEFORE,
         )
-        # Update the distinct_values in field definition.
+        self._archive_field_value_history(
+            fv_query,
+            get_dropped_history(field_value.history, old_fv),
+        )
+        existing_top_facts = {}
+        if old_fv is not None:
+            existing_top_facts[(field_value.field_id, field_value.doc_id)] = (
+                old_fv.get("top_fact", {}) or {}
+            )
+        # Update the distinct_values in field definition and the grid.
         # Don't update for relation extraction.
         if field_value.doc_id != "all_files":
-            logger.info(f"Calculating distinct values for field {field_value.field_id}")
-            dist_data_ref = self.db["field_value"].aggregate(
+            key = (field_value.field_id, field_value.doc_id)
+            self.apply_field_value_changes(
                 [
                     {
-                        "$match": {
-                            "workspace_idx": field_value.workspace_id,
-                            "field_idx": field_value.field_id,
-                        },
-                    },
-                    {
-                        "$group": {
-                            "_id": "$top_fact.answer_details.raw_value",
-                        },
+                        "workspace_idx": field_value.workspace_id,
+                        "field_bundle_idx": field_value.field_bundle_id,
+                        "field_idx": field_value.field_id,
+                        "file_idx": field_value.doc_id,
+                        "old_exists": key in existing_top_facts,
+                        "old_raw_value": get_raw_value(existing_top_facts.get(key)),
+                        "old_top_fact": existing_top_facts.get(key),
+                        "new_exists": True,
+                        "new_raw_value": get_raw_value(field_value.selected_row),
+                        "new_top_fact": field_value.selected_row,
+                        "file_name": field_value.doc_name,
                     },
                 ],
             )
-            distinct_values = [d1["_id"] for d1 in dist_data_ref]
-            self.db["field"].update_one(
-                {
-                    "id": field_value.field_id,
-                },
-                {
-                    "$set": {
-                        "distinct_values": distinct_values,
-                    },
-                },
-            )
         # UnEscape the data, so that UI can use it to display in the cell.
         field_value.selected_row = self.unescape_mongo_data(field_value.selected_row)
-        return ret_val
+        return field_value.id or field_value.field_id
+
+    def _archive_field_value_history(self, fv_query, dropped):
+        """
+        Moves the history entries which were pushed out of field_value to the
+        append-only field_value_history collection.
+        :param fv_query: Keys of the field value.
+        :param dropped: List of (sequence, entry), newest first.
+        :return: VOID
+        """
+        if dropped:
+            self.db[FIELD_VALUE_HISTORY_COLLECTION].bulk_write(
+                get_history_archive_requests(
+                    get_history_archive_docs(fv_query, dropped),
+                ),
+            )
+
+    def get_field_value_history(
+        self,
+        field_idx,
+        file_idx,
+        field_bundle_idx=None,
+        offset=0,
+        limit=20,
+    ):
+        """
+        Returns a page of the edit history of a field value, newest first, reading
+        the inline entries and then the archived ones.
+        :param field_idx: Field ID
+        :param file_idx: Document ID
+        :param field_bundle_idx: Field Bundle ID
+        :param offset: Number of entries to skip.
+        :param limit: Maximum number of entries to return.
+        :return: Dict with history and total.
+        """
+        fv_query = {"field_idx": field_idx, "file_idx": file_idx}
+        if field_bundle_idx:
+            fv_query["field_bundle_idx"] = field_bundle_idx
+        fv = self.db["field_value"].find_one(
+            fv_query,
+            {"_id": 0, "field_value_history": 1},
+        )
+        inline_history = (fv or {}).get("field_value_history", None) or []
+        history = inline_history[offset : offset + limit]
+        archive_col = self.db[FIELD_VALUE_HISTORY_COLLECTION]
+        if len(history) < limit:
+            archive_stream = (
+                archive_col.find(fv_query, {"_id": 0, "entry": 1})
+                .sort([("ts", -1), ("_id", -1)])
+                .skip(max(offset - len(inline_history), 0))
+                .limit(limit - len(history))
+            )
+            history.extend(d["entry"] for d in archive_stream)
+        total = len(inline_history) + archive_col.count_documents(fv_query)
+        return {
+            "history": self.unescape_mongo_data(history),
+            "total": total,
+        }
 
     def update_file_name_in_field_value(self, workspace_idx, file_idx, file_name):
         query = {
@@ -3129,6 +3769,17 @@ class MongoDB(NoSqlDb):
                         },
                     },
                 )
+            if self.is_field_bundle_grid_ready(field_bundle_idx):
+                self.db[
+                    get_field_bundle_grid_name(workspace_idx, field_bundle_idx)
+                ].update_one(
+                    {"file_idx": file_idx},
+                    {"$set": {"file_name": file_name}},
+                )
+            self.db[field_value_stats.STATS_COLLECTION].update_one(
+                field_value_stats.get_stats_key(field_bundle_idx, "file", file_idx),
+                {"$set": {"file_name": file_name}},
+            )
 
     def create_workflow_fields_from_doc_meta(
         self,
@@ -3156,6 +3807,12 @@ class MongoDB(NoSqlDb):
         else:
             doc_query["id"] = file_idx
         cnt = 0
+        writer = self.get_workflow_field_value_writer(
+            workspace_idx,
+            field_bundle_idx,
+            field_idx,
+            report_progress=not file_idx,
+        )
         for doc in self.db["document"].find(doc_query, doc_projection):
             cnt += 1
             meta_value = self.escape_mongo_data(doc["meta"].get(doc_meta_param, ""))
@@ -3177,61 +3834,14 @@ class MongoDB(NoSqlDb):
                 "modified": top_fact,
             }
             history_list = [history]
-            logger.info(
-                f"Creating meta dependent workflow field for document {doc['id']} "
-                f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
-            )
-            self.db["field_value"].update_one(
-                {
-                    "field_idx": field_idx,
-                    "file_idx": doc["id"],
-                    "workspace_idx": workspace_idx,
-                    "field_bundle_idx": field_bundle_idx,
-                },
-                {
-                    "$push": {
-                        "field_value_history": {
-                            "$each": history_list,
-                            "$position": 0,
-                            # "$slice": 20
-                        },
-                    },
-                    "$set": {
-                        "top_fact": top_fact,
-                        "file_name": doc["name"],
-                    },
-                    "$currentDate": {"last_modified": {"$type": "date"}},
-                },
-                upsert=True,
-            )
-
-        dist_data_ref = self.db["field_value"].aggregate(
-            [
-                {
-                    "$match": {
-                        "workspace_idx": workspace_idx,
-                        "field_bundle_idx": field_bundle_idx,
-                        "field_idx": field_idx,
-                    },
-                },
-                {
-                    "$group": {
-                        "_id": "$top_fact.answer_details.raw_value",
-                    },
-                },
-            ],
-        )
-        distinct_values = [d1["_id"] for d1 in dist_data_ref]
-        self.db["field"].update_one(
-            {
-                "id": field_idx,
-            },
-            {
-                "$set": {
-                    "distinct_values": distinct_values,
-                },
-            },
+            writer.add(doc["id"], doc["name"], history_list, top_fact)
+        writer.flush()
+        logger.info(
+            f"Created meta dependent workflow field for {cnt} documents "
+            f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
         )
+        if not file_idx:
+            self.update_field_extraction_status(field_idx, "done")
         return cnt
 
     def create_cast_workflow_field(
@@ -3261,6 +3871,12 @@ class MongoDB(NoSqlDb):
         }
         cast_options = field_options.get("cast_options", {})
         cnt = 0
+        writer = self.get_workflow_field_value_writer(
+            workspace_idx,
+            field_bundle_idx,
+            field_idx,
+            report_progress=not file_idx,
+        )
         for ingress_field_value in self.db["field_value"].find(query, projection):
             cnt += 1
             egress_history = (None,)
@@ -3305,19 +3921,17 @@ class MongoDB(NoSqlDb):
                 )
             if egress_history and egress_top_fact:
                 egress_history_list = [egress_history]
-                logger.info(
-                    f"Creating cast workflow field for document {ingress_field_value['file_idx']} "
-                    f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
-                )
-                self.upsert_workflow_field_value_entry(
-                    workspace_idx,
-                    field_bundle_idx,
-                    field_idx,
+                writer.add(
                     ingress_field_value["file_idx"],
                     ingress_field_value["file_name"],
                     egress_history_list,
                     egress_top_fact,
                 )
+        writer.flush()
+        logger.info(
+            f"Created cast workflow field for {writer.written} documents "
+            f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
+        )
         return cnt
 
     def create_boolean_multi_cast_workflow_field(
@@ -3341,6 +3955,12 @@ class MongoDB(NoSqlDb):
 
         cast_options = field_options.get("cast_options", {})
         cnt = 0
+        writer = self.get_workflow_field_value_writer(
+            workspace_idx,
+            field_bundle_idx,
+            field_idx,
+            report_progress=not file_idx,
+        )
 
         for field_value in field_values_ordered_by_file:
             cnt += 1
@@ -3376,19 +3996,17 @@ class MongoDB(NoSqlDb):
             )
             if egress_history and egress_top_fact:
                 egress_history_list = [egress_history]
-                logger.info(
-                    f"Creating boolean multi cast workflow field for document {field_value['file_idx']} "
-                    f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
-                )
-                self.upsert_workflow_field_value_entry(
-                    workspace_idx,
-                    field_bundle_idx,
-                    field_idx,
+                writer.add(
                     field_value["file_idx"],
                     field_value["file_name"],
                     egress_history_list,
                     egress_top_fact,
                 )
+        writer.flush()
+        logger.info(
+            f"Created boolean multi cast workflow field for {writer.written} documents "
+            f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
+        )
 
         return cnt
 
@@ -3423,22 +4041,36 @@ class MongoDB(NoSqlDb):
         }
         cnt = 0
 
+        new_field_values = []
         for field_value in field_values_ordered_by_file:
-            cnt += 1
-            value = None
             new_field_value = {}
             for k, v in field_value.items():
                 if k in formula_field_map:
                     new_field_value[formula_field_map[k]] = v
                 else:
                     new_field_value[k] = v
-            try:
-                value = evaluate_formula(formula_str, new_field_value)
-            except Exception as e:
-                logger.error(
-                    f"Evaluation failed {formula_str} - {str(e)}, err: {traceback.format_exc()}",
-                )
+            new_field_values.append(new_field_value)
+        try:
+            values = compile_formula(formula_str).evaluate_batch(new_field_values)
+        except Exception as e:
+            logger.error(
+                f"Evaluation failed {formula_str} - {str(e)}, err: {traceback.format_exc()}",
+            )
+            values = [None] * len(new_field_values)
+        num_failed = sum(1 for value in values if value is None)
+        if num_failed:
+            logger.info(
+                f"Evaluation of {formula_str} failed for {num_failed} of {len(values)} documents",
+            )
 
+        writer = self.get_workflow_field_value_writer(
+            workspace_idx,
+            field_bundle_idx,
+            field_idx,
+            report_progress=not file_idx,
+        )
+        for new_field_value, value in zip(new_field_values, values):
+            cnt += 1
             if value is not None and isinstance(value, bool):
                 value = str(value).lower()
             if value is None and NONE_CAST_OPTION_KEY in formula_output_cast:
@@ -3470,20 +4102,52 @@ class MongoDB(NoSqlDb):
                 edited_time,
             )
             egress_history_list = [egress_history]
-            logger.info(
-                f"Creating formula workflow field for document {new_field_value['file_idx']} "
-                f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
-            )
-            self.upsert_workflow_field_value_entry(
-                workspace_idx,
-                field_bundle_idx,
-                field_idx,
+            writer.add(
                 new_field_value["file_idx"],
                 new_field_value["file_name"],
                 egress_history_list,
                 egress_top_fact,
             )
-        return cnt
+        writer.flush()
+        logger.info(
+            f"Created formula workflow field for {writer.written} documents "
+            f"for {workspace_idx} - {field_bundle_idx} - {field_idx}",
+        )
+        return cnt
+
+    def get_workflow_field_value_writer(
+        self,
+        workspace_idx,
+        field_bundle_idx,
+        field_idx,
+        chunk_size=None,
+        report_progress=False,
+    ):
+        """
+        Returns a writer buffering the workflow field value upserts of a field,
+        the derived data is updated after each written chunk.
+        :param chunk_size: Number of upserts per bulk write.
+        :param report_progress: Report every flushed chunk in the status of the
+            field, for recomputations of all the documents.
+        """
+
+        def report_chunk_done(written):
+            self.update_field_extraction_status(
+                field_idx,
+                "chunk_done",
+                written=written,
+            )
+
+        return WorkflowFieldValueWriter(
+            self.db["field_value"],
+            self.db[FIELD_VALUE_HISTORY_COLLECTION],
+            workspace_idx,
+            field_bundle_idx,
+            field_idx,
+            changes_callback=self.apply_field_value_changes,
+            chunk_size=chunk_size or WORKFLOW_FIELD_BULK_WRITE_SIZE,
+            progress_callback=report_chunk_done if report_progress else None,
+        )
 
     def upsert_workflow_field_value_entry(
         self,
@@ -3494,29 +4158,61 @@ class MongoDB(NoSqlDb):
         file_name,
         history_list,
         top_fact,
+        changes=None,
     ):
-        self.db["field_value"].update_one(
-            {
-                "field_idx": field_idx,
-                "file_idx": file_idx,
-                "workspace_idx": workspace_idx,
-                "field_bundle_idx": field_bundle_idx,
-            },
+        """
+        Upserts the field value of a workflow field for a file.
+        :param changes: When given, the resulting value change is appended to it.
+        """
+        fv_query = {
+            "field_idx": field_idx,
+            "file_idx": file_idx,
+            "workspace_idx": workspace_idx,
+            "field_bundle_idx": field_bundle_idx,
+        }
+        old_fv = self.db["field_value"].find_one_and_update(
+            fv_query,
             {
                 "$push": {
-                    "field_value_history": {
-                        "$each": history_list,
-                        "$position": 0,
-                    },
+                    "field_value_history": get_history_push(history_list),
                 },
+                "$inc": {"field_value_history_count": len(history_list)},
                 "$set": {
                     "top_fact": top_fact,
                     "file_name": file_name,
                 },
                 "$currentDate": {"last_modified": {"$type": "date"}},
             },
+            projection={
+                "_id": 0,
+                "top_fact.type": 1,
+                "top_fact.is_override": 1,
+                "top_fact.answer_details.raw_value": 1,
+                **get_dropped_history_projection(len(history_list)),
+            },
             upsert=True,
+            return_document=ReturnDocument.BEFORE,
         )
+        self._archive_field_value_history(
+            fv_query,
+            get_dropped_history(history_list, old_fv),
+        )
+        if changes is not None:
+            changes.append(
+                {
+                    "workspace_idx": workspace_idx,
+                    "field_bundle_idx": field_bundle_idx,
+                    "field_idx": field_idx,
+                    "file_idx": file_idx,
+                    "file_name": file_name,
+                    "old_exists": old_fv is not None,
+                    "old_raw_value": get_raw_value((old_fv or {}).get("top_fact")),
+                    "old_top_fact": (old_fv or {}).get("top_fact"),
+                    "new_exists": True,
+                    "new_raw_value": get_raw_value(top_fact),
+                    "new_top_fact": top_fact,
+                },
+            )
 
     def create_fields_dependent_workflow_field_values(
         self,
@@ -3577,34 +4273,8 @@ class MongoDB(NoSqlDb):
                 file_idx,
             )
 
-        # Create the unique value list.
-        dist_data_ref = self.db["field_value"].aggregate(
-            [
-                {
-                    "$match": {
-                        "workspace_idx": workspace_idx,
-                        "field_bundle_idx": field_bundle_idx,
-                        "field_idx": field_idx,
-                    },
-                },
-                {
-                    "$group": {
-                        "_id": "$top_fact.answer_details.raw_value",
-                    },
-                },
-            ],
-        )
-        distinct_values = [d1["_id"] for d1 in dist_data_ref]
-        self.db["field"].update_one(
-            {
-                "id": field_idx,
-            },
-            {
-                "$set": {
-                    "distinct_values": distinct_values,
-                },
-            },
-        )
+        if not file_idx:
+            self.update_field_extraction_status(field_idx, "done")
         return cnt
 
     def delete_field_value(
@@ -3623,19 +4293,33 @@ class MongoDB(NoSqlDb):
         if field_bundle_idx:
             db_query["field_bundle_idx"] = field_bundle_idx
 
+        existing_field_values = self.db["field_value"].find_one(
+            db_query,
+            {
+                "_id": 0,
+                "workspace_idx": 1,
+                "field_bundle_idx": 1,
+                "field_idx": 1,
+                "file_idx": 1,
+                "top_fact.type": 1,
+                "top_fact.is_override": 1,
+                "top_fact.answer_details.raw_value": 1,
+            },
+        )
         if permanent:
             self.logger.info(f"Deleting field value for {field_id} from {doc_id}")
             ret_val = self.db["field_value"].delete_one(db_query)
+            self._apply_deleted_field_value_change(existing_field_values, None)
         else:
-            existing_field_values = self.read_extracted_field(
+            extracted_field_values = self.read_extracted_field(
                 db_query,
                 {"_id": 0, "topic_facts": 1},
             )
 
             try:
                 topic_facts = None
-                if len(existing_field_values) > 0:
-                    topic_facts = existing_field_values[0].get("topic_facts", None)
+                if len(extracted_field_values) > 0:
+                    topic_facts = extracted_field_values[0].get("topic_facts", None)
 
                 if topic_facts:
                     extracted_top_fact = topic_facts[0]
@@ -3648,47 +4332,52 @@ class MongoDB(NoSqlDb):
                     f"Field_value not found for field_idx: {field_id}, file_idx: {doc_id}",
                 )
 
+            extracted_top_fact = self.escape_mongo_data(extracted_top_fact)
             self.db["field_value"].update_one(
                 db_query,
                 {
                     "$set": {
-                        "top_fact": self.escape_mongo_data(extracted_top_fact),
+                        "top_fact": extracted_top_fact,
                     },
                     "$currentDate": {"last_modified": {"$type": "date"}},
                 },
             )
+            self._apply_deleted_field_value_change(
+                existing_field_values,
+                extracted_top_fact,
+            )
             ret_val = self.unescape_mongo_data(extracted_top_fact)
 
-        # Calculate distinct values.
-        dist_data_ref = self.db["field_value"].aggregate(
+        return ret_val
+
+    def _apply_deleted_field_value_change(self, old_field_value, new_top_fact):
+        """
+        Propagates the deletion (new_top_fact is None) or the reset of a field value.
+        :param old_field_value: Field value before the change, None if it was missing.
+        :param new_top_fact: Escaped top_fact the field value was reset to.
+        :return: VOID
+        """
+        if not old_field_value:
+            return
+        logger.info(
+            f"Updating distinct values and grid for field {old_field_value['field_idx']}",
+        )
+        self.apply_field_value_changes(
             [
                 {
-                    "$match": {
-                        "workspace_idx": workspace_id,
-                        "field_idx": field_id,
-                    },
-                },
-                {
-                    "$group": {
-                        "_id": "$top_fact.answer_details.raw_value",
-                    },
+                    "workspace_idx": old_field_value["workspace_idx"],
+                    "field_bundle_idx": old_field_value.get("field_bundle_idx", None),
+                    "field_idx": old_field_value["field_idx"],
+                    "file_idx": old_field_value["file_idx"],
+                    "old_exists": True,
+                    "old_raw_value": get_raw_value(old_field_value.get("top_fact")),
+                    "old_top_fact": old_field_value.get("top_fact"),
+                    "new_exists": new_top_fact is not None,
+                    "new_raw_value": get_raw_value(new_top_fact),
+                    "new_top_fact": new_top_fact,
                 },
             ],
         )
-        distinct_values = [d1["_id"] for d1 in dist_data_ref]
-        logger.info(f"Calculating distinct values for field {field_id}")
-        # Update the distinct_values in field definition.
-        self.db["field"].update_one(
-            {
-                "id": field_id,
-            },
-            {
-                "$set": {
-                    "distinct_values": distinct_values,
-                },
-            },
-        )
-        return ret_val
 
     def add_results_to_extracted_field(self, field_id, new_results, batch_idx=""):
         logger.info(
@@ -3704,7 +4393,21 @@ class MongoDB(NoSqlDb):
             {"$push": {"topic_facts": {"$each": new_results}}},
         )
 
-    def read_extracted_field(self, condition, projection=None, count_only=False):
+    def read_extracted_field(
+        self,
+        condition,
+        projection=None,
+        count_only=False,
+        analytics=False,
+    ):
+        """Reads the extracted field values matching the condition
+        :param condition: mongo filter on field_value
+        :param projection: fields to return
+        :param count_only: return the number of matches only
+        :param analytics: read through the analytics client, for reports
+        :return: list of field values or count
+        """
+        db = self.analytics_db if analytics else self.db
         if "field_idx" not in condition and "field_bundle_idx" not in condition:
             raise ValueError(
                 "must specify 'field_idx' or 'field_bundle_idx' when reading extracted fields",
@@ -3714,9 +4417,9 @@ class MongoDB(NoSqlDb):
                 "must specify 'file_idx' or 'workspace_idx' when reading extracted fields",
             )
         if count_only:
-            return self.db["field_value"].count_documents(condition, projection)
+            return db["field_value"].count_documents(condition, projection)
         else:
-            data = self.db["field_value"].find(condition, projection)
+            data = db["field_value"].find(condition, projection)
             return self.unescape_mongo_data(list(data))
 
     def delete_extracted_field(self, condition):
@@ -3725,7 +4428,291 @@ class MongoDB(NoSqlDb):
                 "must specify 'field_idx' or 'field_bundle_idx' when deleting extracted fields",
             )
 
-        return self.db["field_value"].delete_many(condition)
+        # Invalidated after the delete, so that a rebuild running meanwhile is
+        # not marked ready with the deleted values.
+        field_bundle_ids = self.db["field_value"].distinct(
+            "field_bundle_idx",
+            condition,
+        )
+        if set(condition.keys()) == {"field_idx"}:
+            self.db["field_distinct_value"].delete_many(
+                {"field_idx": condition["field_idx"]},
+            )
+            self.db[FIELD_DISTINCT_VALUE_STATE_COLLECTION].delete_many(
+                {"field_idx": condition["field_idx"]},
+            )
+            ret_val = self.db["field_value"].delete_many(condition)
+            self.invalidate_field_bundle_grid_ids(field_bundle_ids)
+            return ret_val
+        # Count the values which are going away.
+        deltas = []
+        for d in self.db["field_value"].aggregate(
+            [
+                {"$match": condition},
+                {
+                    "$group": {
+                        "_id": {
+                            "field_idx": "$field_idx",
+                            "raw_value": "$top_fact.answer_details.raw_value",
+                        },
+                        "count": {"$sum": 1},
+                    },
+                },
+            ],
+            allowDiskUse=True,
+        ):
+            deltas.append(
+                (d["_id"]["field_idx"], d["_id"].get("raw_value"), -d["count"]),
+            )
+        ret_val = self.db["field_value"].delete_many(condition)
+        self.invalidate_field_bundle_grid_ids(field_bundle_ids)
+        self._apply_distinct_value_deltas(deltas)
+        return ret_val
+
+    def _get_existing_top_facts(self, query):
+        """
+        Returns the stored top_fact type, is_override and raw value of the matching
+        field values.
+        :param query: Query on the field_value collection.
+        :return: Dict of (field_idx, file_idx) to the partial top_fact.
+        """
+        projection = {
+            "_id": 0,
+            "field_idx": 1,
+            "file_idx": 1,
+            "top_fact.type": 1,
+            "top_fact.is_override": 1,
+            "top_fact.answer_details.raw_value": 1,
+        }
+        return {
+            (fv["field_idx"], fv["file_idx"]): fv.get("top_fact", {}) or {}
+            for fv in self.db["field_value"].find(query, projection)
+        }
+
+    def apply_field_value_changes(self, changes):
+        """
+        Keeps the data derived from field values in sync with a write. Each change is a
+        dict with workspace_idx, field_bundle_idx, field_idx, file_idx, file_name,
+        old_exists, old_raw_value, old_top_fact, new_exists, new_raw_value and the
+        escaped new_top_fact.
+        :param changes: List of field value changes.
+        :return: VOID
+        """
+        if not changes:
+            return
+        self.apply_distinct_value_changes(changes)
+        self._apply_grid_changes(changes)
+        self._apply_field_value_stats_changes(changes)
+
+    def apply_distinct_value_changes(self, changes):
+        """
+        Updates the reference counted distinct values of the fields.
+        Each change is a dict with field_idx, old_exists, old_raw_value,
+        new_exists and new_raw_value of a single field value.
+        :param changes: List of field value changes.
+        :return: VOID
+        """
+        deltas = []
+        for change in changes:
+            old_exists = change.get("old_exists", False)
+            new_exists = change.get("new_exists", False)
+            old_raw_value = change.get("old_raw_value", None)
+            new_raw_value = change.get("new_raw_value", None)
+            if old_exists and new_exists and old_raw_value == new_raw_value:
+                continue
+            if old_exists:
+                deltas.append((change["field_idx"], old_raw_value, -1))
+            if new_exists:
+                deltas.append((change["field_idx"], new_raw_value, 1))
+        self._apply_distinct_value_deltas(deltas)
+
+    def _apply_distinct_value_deltas(self, deltas):
+        """
+        Applies (field_idx, raw_value, delta) to field_distinct_value and refreshes
+        field.distinct_values of the fields whose set of values changed.
+        :param deltas: List of (field_idx, raw_value, delta) tuples.
+        :return: VOID
+        """
+        merged = collections.OrderedDict()
+        for field_idx, raw_value, delta in deltas:
+            key = (field_idx, repr(raw_value))
+            if key in merged:
+                merged[key][2] += delta
+            else:
+                merged[key] = [field_idx, raw_value, delta]
+        ops = []
+        op_fields = []
+        decremented_fields = set()
+        for field_idx, raw_value, delta in merged.values():
+            if not delta:
+                continue
+            ops.append(
+                UpdateOne(
+                    {"field_idx": field_idx, "raw_value": raw_value},
+                    {"$inc": {"count": delta}},
+                    upsert=True,
+                ),
+            )
+            op_fields.append(field_idx)
+            if delta < 0:
+                decremented_fields.add(field_idx)
+        if not ops:
+            return
+        try:
+            res = self.db["field_distinct_value"].bulk_write(ops, ordered=False)
+            upserted_fields = [op_fields[idx] for idx in res.upserted_ids]
+        except BulkWriteError as e:
+            # A concurrent upsert of the same value won the unique index, the
+            # retry turns those upserts into plain increments.
+            failed = [
+                err["index"] for err in e.details["writeErrors"] if err["code"] == 11000
+            ]
+            if len(failed) != len(e.details["writeErrors"]):
+                raise
+            res = self.db["field_distinct_value"].bulk_write(
+                [ops[idx] for idx in failed],
+                ordered=False,
+            )
+            upserted_fields = [
+                op_fields[upsert["index"]] for upsert in e.details["upserted"]
+            ]
+            upserted_fields += [op_fields[failed[idx]] for idx in res.upserted_ids]
+        changed_fields = set(upserted_fields)
+        if decremented_fields:
+            stale_ids = []
+            for d in self.db["field_distinct_value"].find(
+                {
+                    "field_idx": {"$in": list(decremented_fields)},
+                    "count": {"$lte": 0},
+                },
+                {"_id": 1, "field_idx": 1},
+            ):
+                stale_ids.append(d["_id"])
+                changed_fields.add(d["field_idx"])
+            if stale_ids:
+                self.db["field_distinct_value"].delete_many(
+                    {"_id": {"$in": stale_ids}},
+                )
+        for field_idx in changed_fields:
+            self._refresh_field_distinct_values(field_idx)
+
+    def _refresh_field_distinct_values(self, field_idx):
+        distinct_values = []
+        for d in self.db["field_distinct_value"].find(
+            {"field_idx": field_idx, "count": {"$gt": 0}},
+            {"_id": 0, "raw_value": 1},
+        ):
+            raw_value = d.get("raw_value", None)
+            if raw_value not in distinct_values:
+                distinct_values.append(raw_value)
+        self.db["field"].update_one(
+            {
+                "id": field_idx,
+            },
+            {
+                "$set": {
+                    "distinct_values": distinct_values,
+                },
+            },
+        )
+
+    def rebuild_field_distinct_values(self, workspace_idx=None, field_idx=None):
+        """
+        Recounts field_distinct_value from the field_value collection. The counts
+        are corrected by their difference to the recount, so that the increments
+        made meanwhile are kept.
+        :param workspace_idx: Restrict the rebuild to a workspace.
+        :param field_idx: Restrict the rebuild to a field.
+        :return: Number of fields rebuilt.
+        """
+        match = {}
+        if workspace_idx:
+            match["workspace_idx"] = workspace_idx
+        if field_idx:
+            match["field_idx"] = field_idx
+        field_ids = self.db["field_value"].distinct("field_idx", match)
+        if field_idx and field_idx not in field_ids:
+            # The values of the field were all removed.
+            field_ids.append(field_idx)
+        for f_idx in field_ids:
+            stored = {}
+            for d in self.db["field_distinct_value"].find(
+                {"field_idx": f_idx},
+                {"_id": 0, "raw_value": 1, "count": 1},
+            ):
+                raw_value = d.get("raw_value", None)
+                entry = stored.setdefault(repr(raw_value), [raw_value, 0])
+                entry[1] += d.get("count", 0)
+            counted = {}
+            for d in self.db["field_value"].aggregate(
+                [
+                    {"$match": dict(match, field_idx=f_idx)},
+                    {
+                        "$group": {
+                            "_id": {
+                                "raw_value": "$top_fact.answer_details.raw_value",
+                            },
+                            "count": {"$sum": 1},
+                        },
+                    },
+                ],
+                allowDiskUse=True,
+            ):
+                raw_value = d["_id"].get("raw_value", None)
+                counted[repr(raw_value)] = [raw_value, d["count"]]
+            deltas = []
+            for key in set(stored) | set(counted):
+                raw_value, count = counted.get(key, None) or [stored[key][0], 0]
+                deltas.append((f_idx, raw_value, count - stored.get(key, [None, 0])[1]))
+            self._apply_distinct_value_deltas(deltas)
+            self._refresh_field_distinct_values(f_idx)
+            self.db[FIELD_DISTINCT_VALUE_STATE_COLLECTION].update_one(
+                {"field_idx": f_idx},
+                {
+                    "$set": {"checked_on": datetime.datetime.utcnow()},
+                    "$unset": {"claimed_until": ""},
+                },
+            )
+            logger.info(f"Recounted {len(counted)} distinct values for field {f_idx}")
+        return len(field_ids)
+
+    def claim_field_distinct_value_rebuilds(self, max_age, limit):
+        """
+        Claims the fields whose distinct values were recounted longer than max_age
+        ago, so that concurrent reconcilers do not recount the same field.
+        :param max_age: Seconds after which the distinct values are recounted.
+        :param limit: Maximum number of fields to claim.
+        :return: List of (workspace_idx, field_idx).
+        """
+        now = datetime.datetime.utcnow()
+        checked_before = now - datetime.timedelta(seconds=max_age)
+        query = {
+            "$and": [
+                {
+                    "$or": [
+                        {"checked_on": {"$exists": False}},
+                        {"checked_on": {"$lt": checked_before}},
+                    ],
+                },
+                {
+                    "$or": [
+                        {"claimed_until": {"$exists": False}},
+                        {"claimed_until": {"$lt": now}},
+                    ],
+                },
+            ],
+        }
+        keys = []
+        for _ in range(limit):
+            state = self.db[FIELD_DISTINCT_VALUE_STATE_COLLECTION].find_one_and_update(
+                query,
+                {"$set": {"claimed_until": now + datetime.timedelta(minutes=10)}},
+                projection={"_id": 0, "workspace_idx": 1, "field_idx": 1},
+            )
+            if not state:
+                break
+            keys.append((state.get("workspace_idx", None), state["field_idx"]))
+        return keys
 
     def retrieve_grid_data(
         self,
@@ -3794,7 +4781,7 @@ class MongoDB(NoSqlDb):
             f"Extracting Grid data for workspace {workspace_id} "
             f"and field bundle {field_bundle_id}",
         )
-        grid_collection_name = f"field_bundle_grid_{workspace_id}_{field_bundle_id}"
+        grid_collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
         # Performing a check for the existence of the collection name increases the latency manifold.
         output = {}
         result = []
@@ -3943,6 +4930,7 @@ class MongoDB(NoSqlDb):
         distinct_field=None,
         return_only_file_ids=False,
         return_top_fact_answer=False,
+        continuation_token=None,
     ):
         """
         workspace_id (Mandatory): Determines the workspace for which the field bundle data needs to be retrieved.
@@ -3994,6 +4982,8 @@ class MongoDB(NoSqlDb):
         distinct_field (Optional): Field Id for which we have to retrieve the distinct values.
         return_only_file_ids (Optional): Specifies whether to return only file_ids.
         return_top_fact_answer(Optional): Specifies whether we need to return only the top_fact answer details.
+        continuation_token (Optional): continuationToken returned with the previous page. When provided,
+            the page starts right after the last row of the previous page and skip is ignored.
         """
         if not (workspace_id and field_bundle_id):
             logger.info(
@@ -4009,97 +4999,48 @@ class MongoDB(NoSqlDb):
         output = {}
         pipeline = []
         do_distinct_calc = False
+        use_keyset = False
+        token_total_count = None
+        grid_collection_name = self.ensure_field_bundle_grid(
+            workspace_id,
+            field_bundle_id,
+        )
 
-        fixed_match_query = {
-            "workspace_idx": f"{workspace_id}",
-            "field_bundle_idx": f"{field_bundle_id}",
-        }
-        if field_ids:
-            fixed_match_query["field_idx"] = {
-                "$in": field_ids,
-            }
+        fixed_match_query = {}
+        grid_field_ids = list(field_ids or [])
         if filter_dict:
-            field_ids_list = []
             for item in filter_dict.keys():
-                field_ids_list.append(item.split(".answer_details")[0])
-            if field_ids_list:
-                if not fixed_match_query.get("field_idx", {}):
-                    fixed_match_query["field_idx"] = {
-                        "$in": field_ids_list,
-                    }
-                else:
-                    existing_fields = fixed_match_query["field_idx"]["$in"]
-                    for f in field_ids_list:
-                        if f not in existing_fields:
-                            existing_fields.append(f)
-                    fixed_match_query["field_idx"] = {
-                        "$in": existing_fields,
-                    }
-
+                f = item.split(".answer_details")[0]
+                if f not in grid_field_ids:
+                    grid_field_ids.append(f)
+        if grid_field_ids:
+            # Only the files having any of the fields, with only those fields.
+            fixed_match_query["_field_ids"] = {
+                "$in": grid_field_ids,
+            }
         if file_ids:
             fixed_match_query["file_idx"] = {"$in": file_ids}
 
-        fixed_pipeline_init_proj = {
-            "file_idx": 1,
-            "file_name": 1,
-            "field_idx": 1,
+        grid_projection = {
+            "_id": 0,
         }
-        if return_top_fact_answer:
-            fixed_pipeline_init_proj["top_fact.answer"] = 1
-            fixed_pipeline_init_proj["top_fact.formatted_answer"] = 1
-            fixed_pipeline_init_proj["top_fact.answer_details"] = 1
+        if grid_field_ids:
+            grid_projection["file_idx"] = 1
+            grid_projection["file_name"] = 1
+            for f in grid_field_ids:
+                if return_top_fact_answer:
+                    grid_projection[f"{f}.answer"] = 1
+                    grid_projection[f"{f}.formatted_answer"] = 1
+                    grid_projection[f"{f}.answer_details"] = 1
+                else:
+                    grid_projection[f] = 1
         else:
-            fixed_pipeline_init_proj["top_fact"] = 1
+            grid_projection["_field_ids"] = 0
 
         fixed_pipeline = [
-            # Pipeline for Grid style output except for file_name
             {
                 "$match": fixed_match_query,
             },
-            {
-                "$sort": {
-                    "file_name": 1,
-                },
-            },
-            {
-                "$project": fixed_pipeline_init_proj,
-            },
-            {
-                "$group": {
-                    "_id": "$file_idx",
-                    "file_name": {"$first": "$file_name"},
-                    "cols": {
-                        "$push": {
-                            "k": "$field_idx",
-                            "v": "$top_fact",
-                        },
-                    },
-                },
-            },
-            {
-                "$addFields": {
-                    "cols": {
-                        "$arrayToObject": "$cols",
-                    },
-                    "file_idx": "$_id",
-                },
-            },
-            {
-                "$replaceRoot": {
-                    "newRoot": {
-                        "$mergeObjects": [
-                            "$cols",
-                            "$$ROOT",
-                        ],
-                    },
-                },
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "cols": 0,  # Discard the cols array created using group by.
-                },
-            },
         ]
         # Add fixed pipeline to pipeline list.
         pipeline.extend(fixed_pipeline)
@@ -4110,6 +5051,11 @@ class MongoDB(NoSqlDb):
 
         if group_by_list:
             grp_len = len(group_by_list)
+            variable_pipeline.append(
+                {
+                    "$project": grid_projection,
+                },
+            )
             # consider only filter_dict, group_by_list and value_aggregate_list
             if filter_dict:
                 variable_pipeline.append(
@@ -4249,11 +5195,59 @@ class MongoDB(NoSqlDb):
                 # Perform sorting.
                 if "file_name" not in next(iter(list(zip(*sort_tuple_list))), []):
                     sort_tuple_list.append(("file_name", 1))
+                # file_idx is the tie-breaker for keyset pagination.
+                if "file_idx" not in next(iter(list(zip(*sort_tuple_list))), []):
+                    sort_tuple_list.append(("file_idx", 1))
+                use_keyset = True
+                # Grid columns may mix types (e.g. numbers and "N/A") and $gt / $lt only
+                # match values of their own type, sort each column by its type first.
+                sort_types = {}
+                keyset_sort_list = []
+                for idx, (k, v) in enumerate(sort_tuple_list):
+                    if k not in ("file_name", "file_idx"):
+                        sort_types[f"t{idx}"] = get_sort_type_expression(k)
+                        keyset_sort_list.append((f"_sort_types.t{idx}", v))
+                    keyset_sort_list.append((k, v))
+                if sort_types:
+                    variable_pipeline.append(
+                        {
+                            "$addFields": {
+                                "_sort_types": sort_types,
+                            },
+                        },
+                    )
+                if continuation_token:
+                    sort_values, token_total_count = decode_continuation_token(
+                        continuation_token,
+                    )
+                    variable_pipeline.append(
+                        {
+                            "$match": build_keyset_query(keyset_sort_list, sort_values),
+                        },
+                    )
+                    skip = 0
+                variable_pipeline.append(
+                    {
+                        "$sort": {k: v for (k, v) in keyset_sort_list},
+                    },
+                )
+                # The projection may drop sort keys, keep their values for the token.
                 variable_pipeline.append(
                     {
-                        "$sort": {k: v for (k, v) in sort_tuple_list},
+                        "$addFields": {
+                            "_sort_values": [f"${k}" for (k, _) in keyset_sort_list],
+                        },
                     },
                 )
+                if grid_field_ids:
+                    grid_projection["_sort_values"] = 1
+                elif sort_types:
+                    grid_projection["_sort_types"] = 0
+            variable_pipeline.append(
+                {
+                    "$project": grid_projection,
+                },
+            )
 
         if do_distinct_calc:
             last_pipeline = [
@@ -4289,6 +5283,10 @@ class MongoDB(NoSqlDb):
                     },
                 },
             )
+            if use_keyset:
+                temp_last_pipeline[-1]["$group"]["lastSortValues"] = {
+                    "$last": "$_sort_values",
+                }
             if group_by_list:
                 temp_last_pipeline.append(
                     {
@@ -4303,53 +5301,80 @@ class MongoDB(NoSqlDb):
                     {
                         "$project": {
                             "_id": 0,
-                            "results": 1,
+                            "totalMatchCount": 0,
+                            "results._sort_values": 0,
                         },
                     },
                 )
-                last_pipeline = [
-                    {
-                        "$facet": {
-                            "totalMatchCount": [
-                                {"$count": "totalMatchCount"},
-                            ],
-                            "results": temp_last_pipeline,
-                        },
-                    },
-                    {
-                        "$addFields": {
-                            "totalMatchCount": {
-                                "$ifNull": [
-                                    {
-                                        "$arrayElemAt": [
-                                            "$totalMatchCount.totalMatchCount",
-                                            0,
-                                        ],
-                                    },
-                                    0,
+                if continuation_token:
+                    # The total count is carried over from the first page.
+                    last_pipeline = temp_last_pipeline
+                else:
+                    last_pipeline = [
+                        {
+                            "$facet": {
+                                "totalMatchCount": [
+                                    {"$count": "totalMatchCount"},
                                 ],
+                                "results": temp_last_pipeline,
                             },
-                            "results": {
-                                "$ifNull": [
-                                    {"$arrayElemAt": ["$results.results", 0]},
-                                    [],
-                                ],
+                        },
+                        {
+                            "$addFields": {
+                                "totalMatchCount": {
+                                    "$ifNull": [
+                                        {
+                                            "$arrayElemAt": [
+                                                "$totalMatchCount.totalMatchCount",
+                                                0,
+                                            ],
+                                        },
+                                        0,
+                                    ],
+                                },
+                                "results": {
+                                    "$ifNull": [
+                                        {"$arrayElemAt": ["$results.results", 0]},
+                                        [],
+                                    ],
+                                },
+                                "lastSortValues": {
+                                    "$arrayElemAt": ["$results.lastSortValues", 0],
+                                },
                             },
                         },
-                    },
-                ]
+                    ]
         variable_pipeline.extend(last_pipeline)
         # Add variable pipeline to pipeline list
         pipeline.extend(variable_pipeline)
         # Execute the aggregation pipeline.
-        db_data = self.db["field_value"].aggregate(pipeline, allowDiskUse=True)
+        db_data = self.db[grid_collection_name].aggregate(
+            pipeline,
+            allowDiskUse=True,
+        )
         if db_data and do_distinct_calc:
             output = [self.unescape_mongo_data(d1["_id"]) for d1 in db_data]
             return output
+        last_sort_values = None
         if db_data:
             for d in db_data:
+                # Sort values are returned as stored, they are compared with the stored data.
+                last_sort_values = d.pop("lastSortValues", None)
                 output = self.unescape_mongo_data(d)
                 break
+        if use_keyset and not group_by_list:
+            if continuation_token:
+                output = output or {"results": []}
+                output["totalMatchCount"] = token_total_count
+            if last_sort_values and len(output.get("results", [])) == limit:
+                output["continuationToken"] = encode_continuation_token(
+                    last_sort_values,
+                    output.get("totalMatchCount", None),
+                )
+        if output and return_top_fact_answer and not grid_field_ids:
+            for row in output.get("results", []):
+                if isinstance(row, dict):
+                    trim_to_top_fact_answer(row)
         if output and group_by_list:
             new_output = {
                 "totalMatchCount": output["totalMatchCount"],
@@ -4402,6 +5427,35 @@ class MongoDB(NoSqlDb):
         :param include_file_idx:
         :return:
         """
+        return list(
+            self.iter_grid_data_from_field_values(
+                workspace_id,
+                field_bundle_id,
+                file_idx=file_idx,
+                field_ids=field_ids,
+                include_file_idx=include_file_idx,
+            ),
+        )
+
+    def iter_grid_data_from_field_values(
+        self,
+        workspace_id,
+        field_bundle_id,
+        file_idx=None,
+        field_ids=None,
+        include_file_idx=False,
+        batch_size=1000,
+    ):
+        """
+        Yields the grid data row by row in file_name order, straight from the cursor.
+        :param workspace_id:
+        :param field_bundle_id:
+        :param file_idx:
+        :param field_ids:
+        :param include_file_idx:
+        :param batch_size: number of rows fetched per round trip
+        :return: generator of dicts
+        """
         if not (workspace_id and field_bundle_id):
             logger.info(
                 "One or Both of the mandatory fields (Workspace ID or Field Bundle Id) is missing while downloading",
@@ -4413,129 +5467,44 @@ class MongoDB(NoSqlDb):
             f"Downloading Grid data for workspace {workspace_id} "
             f"and field bundle {field_bundle_id}",
         )
-        output = []
-        pipeline = []
-        fixed_match_query = {
-            "workspace_idx": f"{workspace_id}",
-            "field_bundle_idx": f"{field_bundle_id}",
+        grid_collection_name = self.ensure_field_bundle_grid(
+            workspace_id,
+            field_bundle_id,
+        )
+        query = {}
+        projection = {
+            "_id": 0,
+            "file_idx": 1,
+            "file_name": 1,
+            "_field_ids": 1,
         }
         if field_ids:
-            fixed_match_query["field_idx"] = {
-                "$in": field_ids,
-            }
+            query["_field_ids"] = {"$in": field_ids}
+            for f_id in field_ids:
+                projection[f"{f_id}.answer_details.raw_value"] = 1
+                projection[f"{f_id}.matches.answer_details.raw_value"] = 1
+        else:
+            projection = {"_id": 0}
         if file_idx:
-            fixed_match_query["file_idx"] = file_idx
-
-        final_projection = {
-            "_id": 0,
-            "cols": 0,  # Discard the cols array created using group by.
-        }
-        if not include_file_idx:
-            final_projection["file_idx"] = 0
+            query["file_idx"] = file_idx
 
-        fixed_pipeline = [
-            # Pipeline for Grid style output except for file_name
-            {
-                "$match": fixed_match_query,
-            },
-            {
-                "$sort": {
-                    "file_name": 1,
-                },
-            },
-            {
-                "$project": {
-                    "file_idx": 1,
-                    "file_name": 1,
-                    "field_idx": 1,
-                    "top_fact.answer_details.raw_value": 1,
-                    "top_fact.matches.answer_details.raw_value": 1,
-                },
-            },
-            {
-                "$group": {
-                    "_id": "$file_idx",
-                    "file_name": {"$first": "$file_name"},
-                    "cols": {
-                        "$push": {
-                            "k": "$field_idx",
-                            "v": {
-                                "$cond": {
-                                    "if": {
-                                        "$eq": [
-                                            {
-                                                "$ifNull": [
-                                                    "$top_fact.answer_details.raw_value",
-                                                    "",
-                                                ],
-                                            },
-                                            "",
-                                        ],
-                                    },
-                                    "then": {
-                                        "$ifNull": [
-                                            {
-                                                "$reduce": {
-                                                    "input": "$top_fact.matches.answer_details",
-                                                    "initialValue": None,
-                                                    "in": {
-                                                        "$cond": [
-                                                            "$$value",
-                                                            {
-                                                                "$concat": [
-                                                                    "$$value",
-                                                                    "\n",
-                                                                    {
-                                                                        "$toString": "$$this.raw_value",
-                                                                    },
-                                                                ],
-                                                            },
-                                                            {
-                                                                "$toString": "$$this.raw_value",
-                                                            },
-                                                        ],
-                                                    },
-                                                },
-                                            },
-                                            None,
-                                        ],
-                                    },
-                                    "else": "$top_fact.answer_details.raw_value",
-                                },
-                            },
-                        },
-                    },
-                },
-            },
-            {
-                "$addFields": {
-                    "cols": {
-                        "$arrayToObject": "$cols",
-                    },
-                    "file_idx": "$_id",
-                },
-            },
-            {
-                "$replaceRoot": {
-                    "newRoot": {
-                        "$mergeObjects": [
-                            "$cols",
-                            "$$ROOT",
-                        ],
-                    },
-                },
-            },
-            {
-                "$project": final_projection,
-            },
-        ]
-        # Add fixed pipeline to pipeline list.
-        pipeline.extend(fixed_pipeline)
-        db_data = self.db["field_value"].aggregate(pipeline)
-        if db_data:
-            for d in db_data:
-                output.append(self.unescape_mongo_data(d))
-        return output
+        cursor = (
+            self.db[grid_collection_name]
+            .find(query, projection)
+            .sort("file_name", 1)
+            .batch_size(batch_size)
+        )
+        for row in cursor:
+            row_field_ids = [
+                f_id for f_id in row.get("_field_ids", []) if f_id in row
+            ]
+            if field_ids:
+                row_field_ids = [f_id for f_id in row_field_ids if f_id in field_ids]
+            d = {f_id: get_download_value(row[f_id]) for f_id in row_field_ids}
+            d["file_name"] = row.get("file_name", None)
+            if include_file_idx:
+                d["file_idx"] = row["file_idx"]
+            yield self.unescape_mongo_data(d)
 
     def build_field_value_stats(
         self,
@@ -4570,101 +5539,262 @@ class MongoDB(NoSqlDb):
             f"Constructing stats table for workspace {workspace_id} "
             f"and field bundle {field_bundle_id}",
         )
-        pipeline = [
+        self.field_stats_reconciler.start()
+        if not self.is_field_value_stats_ready(field_bundle_id):
+            self.rebuild_field_value_stats(workspace_id, field_bundle_id)
+        stat_docs = self.db[field_value_stats.STATS_COLLECTION].find(
+            {"field_bundle_idx": field_bundle_id},
+            {"_id": 0},
+        )
+        return field_value_stats.build_stats_table(stat_docs, field_ids)
+
+    def is_field_value_stats_ready(self, field_bundle_id):
+        """
+        Checks whether the field value statistics of the bundle are maintained.
+        :param field_bundle_id: Field Bundle ID
+        :return: True if the statistics can be read.
+        """
+        state = self.db[field_value_stats.STATS_STATE_COLLECTION].find_one(
+            {"field_bundle_id": field_bundle_id},
+            {"_id": 0, "ready": 1},
+        )
+        return bool(state and state.get("ready", False))
+
+    def invalidate_field_value_stats(self, field_bundle_ids):
+        """
+        Marks the field value statistics of the bundles as stale, they are rebuilt
+        by the reconciler or on the next read.
+        :param field_bundle_ids: List of Field Bundle IDs
+        :return: VOID
+        """
+        self.db[field_value_stats.STATS_STATE_COLLECTION].update_many(
+            {"field_bundle_id": {"$in": list(field_bundle_ids)}},
+            {"$set": {"ready": False}, "$inc": {"generation": 1}},
+        )
+
+    def rebuild_field_value_stats(self, workspace_id, field_bundle_id):
+        """
+        Recomputes the field value statistics of a bundle from field_value.
+        :param workspace_id: Workspace ID
+        :param field_bundle_id: Field Bundle ID
+        :return: VOID
+        """
+        logger.info(f"Rebuilding field value statistics of {field_bundle_id}")
+        state_col = self.db[field_value_stats.STATS_STATE_COLLECTION]
+        stats_col = self.db[field_value_stats.STATS_COLLECTION]
+        # Allow for clock skew between the server and the database.
+        started_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        # Stop the incremental updates while the documents are replaced, removals
+        # meanwhile bump the generation.
+        generation = state_col.find_one_and_update(
+            {"field_bundle_id": field_bundle_id},
             {
-                "$match": {
-                    "workspace_idx": workspace_id,
-                    "field_bundle_idx": field_bundle_id,
-                    "field_idx": {"$in": field_ids},
-                },
+                "$set": {"workspace_id": workspace_id, "ready": False},
+                "$inc": {"generation": 1},
             },
-            {"$sort": {"file_name": 1}},
-            # Retrieve only what is needed.
+            projection={"_id": 0, "generation": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )["generation"]
+        match_query = {
+            "workspace_idx": workspace_id,
+            "field_bundle_idx": field_bundle_id,
+        }
+        field_pipeline, file_pipeline = field_value_stats.get_rebuild_pipelines(
+            match_query,
+        )
+        stat_docs = []
+        for pipeline, kind in ((field_pipeline, "field"), (file_pipeline, "file")):
+            # Read from the primary, the result becomes the authoritative state.
+            for d in self.db["field_value"].aggregate(pipeline, allowDiskUse=True):
+                key = d.pop("_id")
+                d.update(field_value_stats.get_stats_key(field_bundle_id, kind, key))
+                stat_docs.append(d)
+        stats_col.delete_many({"field_bundle_idx": field_bundle_id})
+        if stat_docs:
+            stats_col.insert_many(stat_docs, ordered=False)
+        res = state_col.update_one(
+            {"field_bundle_id": field_bundle_id, "generation": generation},
             {
-                "$project": {
-                    "file_idx": 1,
-                    "file_name": 1,
-                    "field_idx": 1,
-                    "top_fact.is_override": 1,
-                    "top_fact.type": 1,
+                "$set": {
+                    "ready": True,
+                    "built_on": datetime.datetime.utcnow(),
                 },
+                "$unset": {"claimed_until": ""},
             },
-            {
-                "$facet": {
-                    "rowStats": [
-                        {
-                            "$group": {
-                                "_id": "$file_idx",
-                                "fileName": {"$first": "$file_name"},
-                                "nEdits": {
-                                    "$sum": {
-                                        "$cond": [
-                                            {"$eq": [True, "$top_fact.is_override"]},
-                                            1,
-                                            0,
-                                        ],
-                                    },
-                                },
-                                "nApprovals": {
-                                    "$sum": {
-                                        "$cond": [
-                                            {"$eq": ["approve", "$top_fact.type"]},
-                                            1,
-                                            0,
-                                        ],
-                                    },
-                                },
-                            },
-                        },
+        )
+        if not res.modified_count:
+            logger.info(f"Statistics of {field_bundle_id} changed during rebuild")
+            state_col.update_one(
+                {"field_bundle_id": field_bundle_id},
+                {"$unset": {"claimed_until": ""}},
+            )
+            return
+        # Writes which raced with the rebuild may be missing, try again later.
+        if self.db["field_value"].find_one(
+            dict(match_query, last_modified={"$gte": started_at}),
+            {"_id": 1},
+        ):
+            self.invalidate_field_value_stats([field_bundle_id])
+
+    def claim_field_value_stats_rebuilds(self, max_age, limit):
+        """
+        Claims the bundles whose statistics are stale or older than max_age, so
+        that concurrent reconcilers do not rebuild the same bundle.
+        :param max_age: Seconds after which the statistics are rebuilt.
+        :param limit: Maximum number of bundles to claim.
+        :return: List of (workspace_id, field_bundle_id).
+        """
+        now = datetime.datetime.utcnow()
+        built_before = now - datetime.timedelta(seconds=max_age)
+        query = {
+            "$and": [
+                {
+                    "$or": [
+                        {"ready": False},
+                        {"built_on": {"$lt": built_before}},
                     ],
-                    "colStats": [
-                        {
-                            "$group": {
-                                "_id": "$field_idx",
-                                "nEdits": {
-                                    "$sum": {
-                                        "$cond": [
-                                            {"$eq": [True, "$top_fact.is_override"]},
-                                            1,
-                                            0,
-                                        ],
-                                    },
-                                },
-                                "nApprovals": {
-                                    "$sum": {
-                                        "$cond": [
-                                            {"$eq": ["approve", "$top_fact.type"]},
-                                            1,
-                                            0,
-                                        ],
-                                    },
-                                },
-                            },
-                        },
+                },
+                {
+                    "$or": [
+                        {"claimed_until": {"$exists": False}},
+                        {"claimed_until": {"$lt": now}},
                     ],
                 },
-            },
-            {
-                "$project": {
-                    "totalEdits": {"$sum": "$rowStats.nEdits"},
-                    "totalApprovals": {"$sum": "$rowStats.nApprovals"},
-                    "totalFiles": {"$size": "$rowStats"},
-                    "totalFields": {
-                        "$multiply": [{"$size": "$rowStats"}, {"$size": "$colStats"}],
-                    },
-                    "rowStats": 1,
-                    "colStats": 1,
+            ],
+        }
+        state_col = self.db[field_value_stats.STATS_STATE_COLLECTION]
+        bundles = []
+        for _ in range(limit):
+            state = state_col.find_one_and_update(
+                query,
+                {"$set": {"claimed_until": now + datetime.timedelta(minutes=10)}},
+                projection={"_id": 0, "workspace_id": 1, "field_bundle_id": 1},
+            )
+            if not state:
+                break
+            bundles.append((state["workspace_id"], state["field_bundle_id"]))
+        return bundles
+
+    def _apply_field_value_stats_changes(self, changes):
+        """
+        Applies field value changes to the statistics of the bundles which are ready.
+        Changes without old_top_fact mark the statistics of their bundle as stale.
+        :param changes: List of field value changes.
+        :return: VOID
+        """
+        stat_changes = []
+        stale_bundles = set()
+        for change in changes:
+            if not change.get("field_bundle_idx", None):
+                continue
+            old_counters = None
+            if change.get("old_exists", False):
+                if "old_top_fact" not in change:
+                    stale_bundles.add(change["field_bundle_idx"])
+                    continue
+                old_counters = field_value_stats.get_stat_counters(
+                    change["old_top_fact"],
+                )
+            new_counters = None
+            if change.get("new_exists", False):
+                # None means the stored top_fact was kept as is.
+                if change.get("new_top_fact", None) is None and old_counters:
+                    new_counters = old_counters
+                else:
+                    new_counters = field_value_stats.get_stat_counters(
+                        change.get("new_top_fact", None),
+                    )
+            stat_changes.append(
+                {
+                    "field_bundle_idx": change["field_bundle_idx"],
+                    "field_idx": change["field_idx"],
+                    "file_idx": change["file_idx"],
+                    "file_name": change.get("file_name", None),
+                    "old": old_counters,
+                    "new": new_counters,
                 },
+            )
+        if stale_bundles:
+            self.invalidate_field_value_stats(stale_bundles)
+        self._apply_field_value_stat_deltas(stat_changes)
+
+    def _get_field_value_stat_changes(self, query, top_fact_update):
+        """
+        Reads the changes an update_many of the top_fact of the field values
+        matching the query is going to make, for the grids and the statistics.
+        :param query: Query on the field_value collection.
+        :param top_fact_update: top_fact keys set by the update, None to unset them.
+        :return: List of statistics changes.
+        """
+        stat_changes = []
+        for fv in self.db["field_value"].find(
+            query,
+            {
+                "_id": 0,
+                "workspace_idx": 1,
+                "field_bundle_idx": 1,
+                "field_idx": 1,
+                "file_idx": 1,
+                "top_fact.type": 1,
+                "top_fact.is_override": 1,
             },
-        ]
+        ):
+            if not fv.get("field_bundle_idx", None):
+                continue
+            old_top_fact = fv.get("top_fact", {}) or {}
+            new_top_fact = {
+                k: v
+                for k, v in {**old_top_fact, **top_fact_update}.items()
+                if v is not None
+            }
+            stat_changes.append(
+                {
+                    "workspace_idx": fv["workspace_idx"],
+                    "field_bundle_idx": fv["field_bundle_idx"],
+                    "field_idx": fv["field_idx"],
+                    "file_idx": fv["file_idx"],
+                    "old": field_value_stats.get_stat_counters(old_top_fact),
+                    "new": field_value_stats.get_stat_counters(new_top_fact),
+                },
+            )
+        return stat_changes
 
-        db_data = self.db["field_value"].aggregate(pipeline)
-        output = {}
-        if db_data:
-            for d in db_data:
-                output = d
-                break
-        return output
+    def _apply_field_value_stat_deltas(self, stat_changes):
+        """
+        Increments the statistics of the bundles which are ready.
+        :param stat_changes: List of statistics changes.
+        :return: VOID
+        """
+        if not stat_changes:
+            return
+        bundle_ids = {change["field_bundle_idx"] for change in stat_changes}
+        ready_bundles = {
+            state["field_bundle_id"]
+            for state in self.db[field_value_stats.STATS_STATE_COLLECTION].find(
+                {"field_bundle_id": {"$in": list(bundle_ids)}, "ready": True},
+                {"_id": 0, "field_bundle_id": 1},
+            )
+        }
+        removed_bundles = {
+            change["field_bundle_idx"]
+            for change in stat_changes
+            if change["new"] is None and change["field_bundle_idx"] not in ready_bundles
+        }
+        if removed_bundles:
+            # A rebuild in progress may have counted the removed values.
+            self.db[field_value_stats.STATS_STATE_COLLECTION].update_many(
+                {"field_bundle_id": {"$in": list(removed_bundles)}, "ready": False},
+                {"$inc": {"generation": 1}},
+            )
+        updates = field_value_stats.get_stats_updates(
+            [c for c in stat_changes if c["field_bundle_idx"] in ready_bundles],
+        )
+        if updates:
+            self.db[field_value_stats.STATS_COLLECTION].bulk_write(
+                updates,
+                ordered=False,
+            )
 
     def upsert_usage_metrics(self, user_id, usage_data, upsert=False):
         """
@@ -4710,24 +5840,12 @@ class MongoDB(NoSqlDb):
             # Find the latest metric to copy over
             latest_metric = self.retrieve_latest_usage(user_id)
             if latest_metric["reported_on"] != date:
-                latest_metric["reported_on"] = date
-                catalogs = self.retrieve_catalogs()
-                for key in ["general_usage", "dev_api_usage"]:
-                    for catalog_key in latest_metric.get(key, {key: {}}):
-                        if catalog_key in catalogs:
-                            if (
-                                catalogs[catalog_key]["renewable"][key]
-                                and not PAYMENT_CONTROLLED_RENEWABLE_RESOURCES
-                            ):
-                                latest_metric[key][catalog_key] = usage_data.get(
-                                    key,
-                                    {catalog_key: 0},
-                                ).get(catalog_key, 0)
-                            else:
-                                latest_metric[key][catalog_key] += usage_data.get(
-                                    key,
-                                    {catalog_key: 0},
-                                ).get(catalog_key, 0)
+                latest_metric = get_carried_over_usage(
+                    latest_metric,
+                    usage_data,
+                    self.retrieve_catalogs(),
+                    date,
+                )
                 # self.db["usage"].insert_one(latest_metric)
                 self.db["usage"].update_one(
                     {"user_id": user_id, "reported_on": date},
@@ -4735,6 +5853,97 @@ class MongoDB(NoSqlDb):
                     upsert=True,
                 )
 
+    def bulk_upsert_usage_metrics(self, usage_by_user):
+        """
+        Increments the usage metrics of many users for the current month in a
+        single round trip. The usage documents created by the write carry over
+        the latest metrics of the previous months, as in upsert_usage_metrics.
+        :param usage_by_user: Dict of User ID to usage data, as in upsert_usage_metrics.
+        :return: Dict of User ID to the usage data which was not written.
+        """
+        date = datetime.datetime.now().strftime(DATE_TIME_YEAR_MONTH)
+        ops = []
+        op_users = []
+        for user_id, usage_data in usage_by_user.items():
+            inc_data = {
+                k: v
+                for k, v in flatten_dict(usage_data).items()
+                if not isinstance(v, str)
+            }
+            if inc_data:
+                ops.append(
+                    UpdateOne(
+                        {"user_id": user_id, "reported_on": date},
+                        {
+                            "$inc": inc_data,
+                            "$setOnInsert": {"user_id": user_id, "reported_on": date},
+                        },
+                        upsert=True,
+                    ),
+                )
+                op_users.append(user_id)
+        if not ops:
+            return {}
+        failed_users = {}
+        try:
+            update_res = self.db["usage"].bulk_write(ops, ordered=False)
+            upserted_ids = update_res.upserted_ids
+        except BulkWriteError as e:
+            # The other writes are applied, only the failed ones are returned.
+            for error in e.details["writeErrors"]:
+                user_id = op_users[error["index"]]
+                failed_users[user_id] = usage_by_user[user_id]
+            upserted_ids = {
+                upserted["index"]: upserted["_id"]
+                for upserted in e.details.get("upserted", [])
+            }
+        for idx in upserted_ids:
+            try:
+                self._carry_over_usage_metrics(op_users[idx], date)
+            except Exception as e:
+                # The usage itself is written, retrying it would count it twice.
+                logger.error(
+                    f"Error carrying over the usage metrics of {op_users[idx]}, err: {e}",
+                )
+        return failed_users
+
+    def _carry_over_usage_metrics(self, user_id, date):
+        """
+        Adds the metrics carried over from the previous months to the usage
+        document of a month, created with only the usage of the month.
+        :param user_id: User ID.
+        :param date: Month of the usage document, YYYY-MM.
+        :return: Void
+        """
+        latest_metric = self.db["usage"].find_one(
+            {"user_id": user_id, "reported_on": {"$lt": date}},
+            {"_id": 0},
+            sort=[("reported_on", -1)],
+        )
+        if not latest_metric:
+            return
+        carried_over = get_carried_over_usage(
+            latest_metric,
+            {},
+            self.retrieve_catalogs(),
+            date,
+        )
+        inc_data = {
+            k: v
+            for k, v in flatten_dict(
+                {
+                    key: carried_over.get(key, None) or {}
+                    for key in ["general_usage", "dev_api_usage"]
+                },
+            ).items()
+            if v and not isinstance(v, str)
+        }
+        if inc_data:
+            self.db["usage"].update_one(
+                {"user_id": user_id, "reported_on": date},
+                {"$inc": inc_data},
+            )
+
     def reset_renewable_resources(self, user_id, subs_name):
         """
         Resets the renewable resources for the user (possibly upon payment).
@@ -5043,7 +6252,7 @@ class MongoDB(NoSqlDb):
         return notifications
 
     def create_field_bundle_grid(self, workspace_id, field_bundle_id):
-        collection_name = f"field_bundle_grid_{workspace_id}_{field_bundle_id}"
+        collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
         try:
             self.db.create_collection(collection_name)
             logger.info(f"creating field_bundle_grid {collection_name}")
@@ -5053,17 +6262,360 @@ class MongoDB(NoSqlDb):
             return False
 
     def insert_field_bundle_grid_rows(self, workspace_id, field_bundle_id, rows):
-        collection_name = f"field_bundle_grid_{workspace_id}_{field_bundle_id}"
+        collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
         logger.info(f"inserting {len(rows)} rows into {collection_name}")
         self.db[collection_name].insert_many(rows)
 
     def get_field_bundle_grid_rows(self, workspace_id, field_bundle_id):
-        collection_name = f"field_bundle_grid_{workspace_id}_{field_bundle_id}"
+        collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
         rows = []
-        for row in self.db[collection_name].find({}, {"_id": 0}):
+        for row in self.db[collection_name].find({}, {"_id": 0, "_field_ids": 0}):
             rows.append(row)
         return rows
 
+    def is_field_bundle_grid_ready(self, field_bundle_id):
+        """
+        Checks whether the materialized grid of the field bundle is up-to-date.
+        :param field_bundle_id: Field Bundle ID
+        :return: True if the grid can be read.
+        """
+        state = self.db["field_bundle_grid_state"].find_one(
+            {"field_bundle_id": field_bundle_id},
+            {"_id": 0, "ready": 1},
+        )
+        return bool(state and state.get("ready", False))
+
+    def ensure_field_bundle_grid(self, workspace_id, field_bundle_id):
+        """
+        Returns the materialized grid of the field bundle. A stale grid is rebuilt
+        by the reader which claims the rebuild, in the background when a previous
+        build can be served meanwhile. Without a previous build, the other readers
+        wait for the first one.
+        :param workspace_id: Workspace ID
+        :param field_bundle_id: Field Bundle ID
+        :return: Name of the grid collection.
+        """
+        collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
+        state = self.db["field_bundle_grid_state"].find_one(
+            {"field_bundle_id": field_bundle_id},
+            {"_id": 0, "ready": 1, "built_on": 1},
+        )
+        if state and state.get("ready", False):
+            return collection_name
+        built = bool(state and state.get("built_on", None))
+        if self._claim_field_bundle_grid_rebuild(workspace_id, field_bundle_id):
+            if not built:
+                self._rebuild_claimed_field_bundle_grid(workspace_id, field_bundle_id)
+                return collection_name
+
+            def rebuild_in_background():
+                try:
+                    self._rebuild_claimed_field_bundle_grid(
+                        workspace_id,
+                        field_bundle_id,
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to rebuild field bundle grid {collection_name}, "
+                        f"err: {e}",
+                    )
+
+            threading.Thread(target=rebuild_in_background, daemon=True).start()
+        elif not built:
+            deadline = time.monotonic() + FIELD_BUNDLE_GRID_BUILD_WAIT_SECONDS
+            while (
+                not self.is_field_bundle_grid_ready(field_bundle_id)
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.5)
+        return collection_name
+
+    def _claim_field_bundle_grid_rebuild(self, workspace_id, field_bundle_id):
+        """
+        Claims the rebuild of a grid, so that concurrent readers do not rebuild it.
+        :param workspace_id: Workspace ID
+        :param field_bundle_id: Field Bundle ID
+        :return: True when claimed, False when another rebuild is running.
+        """
+        now = datetime.datetime.utcnow()
+        try:
+            self.db["field_bundle_grid_state"].update_one(
+                {
+                    "field_bundle_id": field_bundle_id,
+                    "$or": [
+                        {"claimed_until": {"$exists": False}},
+                        {"claimed_until": {"$lt": now}},
+                    ],
+                },
+                {
+                    "$set": {
+                        "workspace_id": workspace_id,
+                        "claimed_until": now + datetime.timedelta(minutes=10),
+                    },
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # The state exists and the rebuild is claimed.
+            return False
+        return True
+
+    def _rebuild_claimed_field_bundle_grid(self, workspace_id, field_bundle_id):
+        try:
+            self.rebuild_field_bundle_grid(workspace_id, field_bundle_id)
+        finally:
+            self.db["field_bundle_grid_state"].update_one(
+                {"field_bundle_id": field_bundle_id},
+                {"$unset": {"claimed_until": ""}},
+            )
+
+    def rebuild_field_bundle_grid(self, workspace_id, field_bundle_id):
+        """
+        Rebuilds the one-row-per-file grid of a field bundle from field_value.
+        Field values written while the rebuild runs are re-applied afterwards.
+        :param workspace_id: Workspace ID
+        :param field_bundle_id: Field Bundle ID
+        :return: VOID
+        """
+        collection_name = get_field_bundle_grid_name(workspace_id, field_bundle_id)
+        logger.info(f"Rebuilding field bundle grid {collection_name}")
+        # Allow for clock skew between the server and the database.
+        started_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        # Removals while the grid is not ready bump the generation, they cannot be
+        # caught up from last_modified.
+        generation = self.db["field_bundle_grid_state"].find_one_and_update(
+            {"field_bundle_id": field_bundle_id},
+            {
+                "$set": {"workspace_id": workspace_id, "ready": False},
+                "$inc": {"generation": 1},
+            },
+            projection={"_id": 0, "generation": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )["generation"]
+        match_query = {
+            "workspace_idx": workspace_id,
+            "field_bundle_idx": field_bundle_id,
+        }
+        self.db["field_value"].aggregate(
+            [
+                {
+                    "$match": match_query,
+                },
+                {
+                    "$project": {
+                        "file_idx": 1,
+                        "file_name": 1,
+                        "field_idx": 1,
+                        "top_fact": 1,
+                    },
+                },
+                {
+                    "$group": {
+                        "_id": "$file_idx",
+                        "file_name": {"$first": "$file_name"},
+                        "_field_ids": {"$push": "$field_idx"},
+                        "cols": {
+                            "$push": {
+                                "k": "$field_idx",
+                                "v": "$top_fact",
+                            },
+                        },
+                    },
+                },
+                {
+                    "$addFields": {
+                        "cols": {
+                            "$arrayToObject": "$cols",
+                        },
+                        "file_idx": "$_id",
+                    },
+                },
+                {
+                    "$replaceRoot": {
+                        "newRoot": {
+                            "$mergeObjects": [
+                                "$cols",
+                                "$$ROOT",
+                            ],
+                        },
+                    },
+                },
+                {
+                    "$project": {
+                        "_id": 0,
+                        "cols": 0,
+                    },
+                },
+                {
+                    "$out": collection_name,
+                },
+            ],
+            allowDiskUse=True,
+        )
+        self.db[collection_name].create_index([("file_idx", 1)], unique=True)
+        self.db[collection_name].create_index([("file_name", 1)])
+        self.db[collection_name].create_index([("_field_ids", 1), ("file_name", 1)])
+        res = self.db["field_bundle_grid_state"].update_one(
+            {"field_bundle_id": field_bundle_id, "generation": generation},
+            {
+                "$set": {
+                    "ready": True,
+                    "built_on": datetime.datetime.utcnow(),
+                },
+            },
+        )
+        if not res.modified_count:
+            logger.info(f"Field bundle grid {collection_name} changed during rebuild")
+            return
+        # Catch up with the writes which happened during the rebuild.
+        changes = []
+        for fv in self.db["field_value"].find(
+            dict(match_query, last_modified={"$gte": started_at}),
+            {"_id": 0, "file_idx": 1, "file_name": 1, "field_idx": 1, "top_fact": 1},
+        ):
+            changes.append(
+                {
+                    "workspace_idx": workspace_id,
+                    "field_bundle_idx": field_bundle_id,
+                    "field_idx": fv["field_idx"],
+                    "file_idx": fv["file_idx"],
+                    "file_name": fv.get("file_name", None),
+                    "new_exists": True,
+                    "new_top_fact": fv.get("top_fact", {}),
+                },
+            )
+        self._apply_grid_changes(changes)
+
+    def invalidate_field_bundle_grids(self, query, stats=True):
+        """
+        Marks the grids holding the field values matching the query as stale,
+        they are rebuilt on the next read.
+        :param query: Query on field_value collection.
+        :param stats: Also mark the field value statistics as stale.
+        :return: VOID
+        """
+        self.invalidate_field_bundle_grid_ids(
+            self.db["field_value"].distinct("field_bundle_idx", query),
+            stats=stats,
+        )
+
+    def invalidate_field_bundle_grid_ids(self, field_bundle_ids, stats=True):
+        """
+        Marks the grids of the field bundles as stale, a rebuild running for them
+        does not mark them ready.
+        :param field_bundle_ids: List of Field Bundle IDs
+        :param stats: Also mark the field value statistics as stale.
+        :return: VOID
+        """
+        field_bundle_ids = list(field_bundle_ids)
+        if field_bundle_ids:
+            logger.info(f"Invalidating field bundle grids {field_bundle_ids}")
+            self.db["field_bundle_grid_state"].update_many(
+                {"field_bundle_id": {"$in": field_bundle_ids}},
+                {"$set": {"ready": False}, "$inc": {"generation": 1}},
+            )
+            if stats:
+                self.invalidate_field_value_stats(field_bundle_ids)
+
+    def drop_field_bundle_grid(self, workspace_id, field_bundle_id):
+        self.db["field_bundle_grid_state"].delete_one(
+            {"field_bundle_id": field_bundle_id},
+        )
+        self.db[get_field_bundle_grid_name(workspace_id, field_bundle_id)].drop()
+
+    def _apply_grid_changes(self, changes):
+        """
+        Applies field value changes to the materialized grids which are ready.
+        :param changes: List of field value changes.
+        :return: VOID
+        """
+        changes_by_grid = collections.OrderedDict()
+        for change in changes:
+            workspace_idx = change.get("workspace_idx", None)
+            field_bundle_idx = change.get("field_bundle_idx", None)
+            if workspace_idx and field_bundle_idx:
+                changes_by_grid.setdefault(
+                    (workspace_idx, field_bundle_idx),
+                    [],
+                ).append(change)
+        for (workspace_idx, field_bundle_idx), grid_changes in changes_by_grid.items():
+            if not self.is_field_bundle_grid_ready(field_bundle_idx):
+                if any(not c.get("new_exists", True) for c in grid_changes):
+                    # A rebuild in progress may have read the removed values.
+                    self.db["field_bundle_grid_state"].update_one(
+                        {"field_bundle_id": field_bundle_idx, "ready": False},
+                        {"$inc": {"generation": 1}},
+                    )
+                continue
+            ops = []
+            has_removals = False
+            for change in grid_changes:
+                field_idx = change["field_idx"]
+                row_query = {"file_idx": change["file_idx"]}
+                if not change.get("new_exists", True):
+                    has_removals = True
+                    ops.append(
+                        UpdateOne(
+                            row_query,
+                            {
+                                "$unset": {field_idx: ""},
+                                "$pull": {"_field_ids": field_idx},
+                            },
+                        ),
+                    )
+                    continue
+                update = {"$addToSet": {"_field_ids": field_idx}}
+                set_dict = {}
+                if change.get("file_name", None):
+                    set_dict["file_name"] = change["file_name"]
+                # None means the stored top_fact was kept as is.
+                if change.get("new_top_fact", None) is not None:
+                    set_dict[field_idx] = change["new_top_fact"]
+                if set_dict:
+                    update["$set"] = set_dict
+                ops.append(UpdateOne(row_query, update, upsert=True))
+            if not ops:
+                continue
+            grid = self.db[get_field_bundle_grid_name(workspace_idx, field_bundle_idx)]
+            grid.bulk_write(ops)
+            if has_removals:
+                grid.delete_many({"_field_ids": {"$size": 0}})
+
+    def _apply_grid_top_fact_updates(self, stat_changes, top_fact_update):
+        """
+        Sets the top_fact keys of a bulk update on the grid rows which are ready.
+        :param stat_changes: Changes read by _get_field_value_stat_changes.
+        :param top_fact_update: top_fact keys set by the update, None to unset them.
+        :return: VOID
+        """
+        changes_by_grid = collections.OrderedDict()
+        for change in stat_changes:
+            changes_by_grid.setdefault(
+                (change["workspace_idx"], change["field_bundle_idx"]),
+                [],
+            ).append(change)
+        for (workspace_idx, field_bundle_idx), grid_changes in changes_by_grid.items():
+            if not self.is_field_bundle_grid_ready(field_bundle_idx):
+                continue
+            ops = []
+            for change in grid_changes:
+                field_idx = change["field_idx"]
+                update = {}
+                for k, v in top_fact_update.items():
+                    if v is None:
+                        update.setdefault("$unset", {})[f"{field_idx}.{k}"] = ""
+                    else:
+                        update.setdefault("$set", {})[f"{field_idx}.{k}"] = v
+                ops.append(
+                    UpdateOne(
+                        {"file_idx": change["file_idx"], field_idx: {"$exists": True}},
+                        update,
+                    ),
+                )
+            grid = self.db[get_field_bundle_grid_name(workspace_idx, field_bundle_idx)]
+            grid.bulk_write(ops, ordered=False)
+
     def add_subscription_session(self, user_id, session_id, price_id):
         self.db["user"].update_one(
             {"id": user_id},
@@ -5077,6 +6629,7 @@ class MongoDB(NoSqlDb):
                 },
             },
         )
+        self.user_cache.invalidate(user_id=user_id)
 
     def set_subscription_session_status(
         self,
@@ -5108,30 +6661,23 @@ class MongoDB(NoSqlDb):
                 {"subscription_sessions.session_id": session_id},
                 {"$set": {"subscription_sessions.$.status": status}},
             )
+        # The session does not tell which user is updated.
+        self.user_cache.invalidate()
 
     def escape_mongo_data(self, data):
-        if isinstance(data, dict):
-            for key, value in data.items():
-                data[key] = self.escape_mongo_data(value)
-        elif isinstance(data, list):
-            for idx, value in enumerate(data):
-                data[idx] = self.escape_mongo_data(value)
-        elif isinstance(data, str):
-            data = data.replace(".", "_dot_").replace("$", "_dollar_")
-
-        return data
+        """Escapes the dict keys of the data in place, values are stored as is."""
+        return mongo_codec.escape_mongo_data(data)
 
     def unescape_mongo_data(self, data):
-        if isinstance(data, dict):
-            for key, value in data.items():
-                data[key] = self.unescape_mongo_data(value)
-        elif isinstance(data, list):
-            for idx, value in enumerate(data):
-                data[idx] = self.unescape_mongo_data(value)
-        elif isinstance(data, str):
-            data = data.replace("_dot_", ".").replace("_dollar_", "$")
+        """Unescapes the dict keys of the data in place, and the values stored escaped."""
+        return mongo_codec.unescape_mongo_data(data)
 
-        return data
+    def escape_mongo_key(self, key):
+        return mongo_codec.escape_mongo_key(key)
+
+    def escape_mongo_filter(self, condition):
+        """Matches a filter condition on the values stored escaped too."""
+        return mongo_codec.escape_mongo_filter(condition)
 
     def save_inference_doc(self, doc_id, pages):
         self.db["ml_bbox"].delete_many({"file_idx": doc_id})
@@ -5531,6 +7077,68 @@ def store_screen_shot(image_base64_string, dest_blob_name):
     return screen_shot_path
 
 
+def get_field_bundle_grid_name(workspace_id, field_bundle_id):
+    return f"field_bundle_grid_{workspace_id}_{field_bundle_id}"
+
+
+def trim_to_top_fact_answer(row):
+    """
+    Keeps only the answer, formatted_answer and answer_details of each field in a grid row.
+    :param row: Grid row
+    :return: VOID
+    """
+    for key, value in row.items():
+        if key not in ("file_idx", "file_name") and isinstance(value, dict):
+            row[key] = {
+                k: v
+                for k, v in value.items()
+                if k in ("answer", "formatted_answer", "answer_details")
+            }
+
+
+def get_download_value(top_fact):
+    """
+    Returns the value of a top_fact as exported in the grid download. When the top_fact
+    does not have a raw value, the raw values of its matches are joined by newlines.
+    :param top_fact: top_fact of a field value.
+    :return: value
+    """
+    raw_value = get_raw_value(top_fact)
+    if raw_value is not None and raw_value != "":
+        return raw_value
+    matches = top_fact.get("matches", None) if isinstance(top_fact, dict) else None
+    if not isinstance(matches, list):
+        return None
+    value = None
+    for match in matches:
+        match_value = get_raw_value(match)
+        if isinstance(match_value, bool):
+            match_value = str(match_value).lower()
+        elif match_value is not None:
+            match_value = str(match_value)
+        if value is None:
+            value = match_value
+        elif match_value is None:
+            value = None
+        else:
+            value = f"{value}\n{match_value}"
+    return value
+
+
+def get_raw_value(top_fact):
+    """
+    Returns the raw value of a top_fact, None if it does not have one.
+    :param top_fact: top_fact of a field value.
+    :return: raw value
+    """
+    if not isinstance(top_fact, dict):
+        return None
+    answer_details = top_fact.get("answer_details", None) or {}
+    if not isinstance(answer_details, dict):
+        return None
+    return answer_details.get("raw_value", None)
+
+
 def flatten_dict(d, parent_key="", sep="."):
     """
     Flatten the nested dictionary for usage with metrics.
@@ -5560,6 +7168,36 @@ def flatten_dict(d, parent_key="", sep="."):
     return dict(items)
 
 
+def get_carried_over_usage(latest_metric, usage_data, catalogs, date):
+    """
+    Returns the usage metric of a new month from the latest metric of a previous
+    month. Renewable resources restart from usage_data, the others carry over.
+    :param latest_metric: Latest usage metric of the user, updated in place.
+    :param usage_data: Usage data of the new month, as in upsert_usage_metrics.
+    :param catalogs: Catalogs, as returned by retrieve_catalogs.
+    :param date: Month of the new metric, YYYY-MM.
+    :return: Usage metric of the new month.
+    """
+    latest_metric["reported_on"] = date
+    for key in ["general_usage", "dev_api_usage"]:
+        for catalog_key in latest_metric.get(key, {key: {}}):
+            if catalog_key in catalogs:
+                if (
+                    catalogs[catalog_key]["renewable"][key]
+                    and not PAYMENT_CONTROLLED_RENEWABLE_RESOURCES
+                ):
+                    latest_metric[key][catalog_key] = usage_data.get(
+                        key,
+                        {catalog_key: 0},
+                    ).get(catalog_key, 0)
+                else:
+                    latest_metric[key][catalog_key] += usage_data.get(
+                        key,
+                        {catalog_key: 0},
+                    ).get(catalog_key, 0)
+    return latest_metric
+
+
 def correct_legacy_answers(top_fact):
     top_fact_answer = top_fact.get("answer", None)
     if top_fact_answer is None and "matches" not in top_fact:
@@ -5612,3 +7250,295 @@ def create_workflow_field_value_params(value, user_name, edited_time):
         "modified": top_fact,
     }
     return history, top_fact
+
+
+def get_history_push(history_list):
+    """
+    Returns the $push of new field value history entries, newest first, keeping
+    FIELD_VALUE_HISTORY_INLINE_SIZE entries inline.
+    :param history_list: New history entries.
+    :return: $push argument of field_value_history.
+    """
+    return {
+        "$each": history_list,
+        "$position": 0,
+        "$slice": FIELD_VALUE_HISTORY_INLINE_SIZE,
+    }
+
+
+def get_numbered_history(history, history_count, start=0):
+    """
+    Numbers history entries with their push sequence. field_value_history_count
+    counts the entries ever pushed, so that the number of an entry does not
+    change when newer ones are pushed.
+    :param history: Inline history entries from index start on, newest first.
+    :param history_count: field_value_history_count of the field value.
+    :param start: Index of the first entry in the inline history.
+    :return: List of (sequence, entry), newest first.
+    """
+    return [
+        (history_count - 1 - idx, entry) for idx, entry in enumerate(history, start)
+    ]
+
+
+def get_dropped_history_projection(num_pushed):
+    """
+    Returns the projection of the inline history entries which are pushed out
+    by num_pushed new entries.
+    :param num_pushed: Number of entries pushed.
+    :return: Projection on the field_value collection.
+    """
+    skip = max(FIELD_VALUE_HISTORY_INLINE_SIZE - num_pushed, 0)
+    # Documents written before the cap can hold more entries than the limit.
+    return {
+        "field_value_history": {"$slice": [skip, 2**31 - 1]},
+        "field_value_history_count": 1,
+    }
+
+
+def get_dropped_history(history_list, old_fv, num_pushed=None):
+    """
+    Returns the history entries which do not fit inline anymore, newest first.
+    :param history_list: New history entries.
+    :param old_fv: Field value before the push, projected with
+        get_dropped_history_projection, None if it was missing.
+    :param num_pushed: Number of entries the projection was made for.
+    :return: List of (sequence, entry), as in get_numbered_history.
+    """
+    if num_pushed is None:
+        num_pushed = len(history_list)
+    projected_skip = max(FIELD_VALUE_HISTORY_INLINE_SIZE - num_pushed, 0)
+    kept_old = max(FIELD_VALUE_HISTORY_INLINE_SIZE - len(history_list), 0)
+    old_history = (old_fv or {}).get("field_value_history", None) or []
+    # Field values written before the count was kept count from 0.
+    old_count = (old_fv or {}).get("field_value_history_count", None) or 0
+    dropped = get_numbered_history(
+        history_list,
+        old_count + len(history_list),
+    )[FIELD_VALUE_HISTORY_INLINE_SIZE:]
+    # The projection can include old entries which still fit after this push.
+    dropped.extend(
+        get_numbered_history(
+            old_history[kept_old - projected_skip :],
+            old_count,
+            start=kept_old,
+        ),
+    )
+    return dropped
+
+
+def get_history_entry_time(entry):
+    """
+    :param entry: History entry.
+    :return: edited_time of the entry as datetime, None if it is missing or invalid.
+    """
+    try:
+        return datetime.datetime.strptime(
+            entry["edited_time"],
+            FIELD_VALUE_HISTORY_TIME_FORMAT,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def get_history_entry_key(sequence, entry):
+    """
+    :param sequence: Push sequence of the entry, see get_numbered_history.
+    :param entry: History entry.
+    :return: Key identifying the entry within the history of a field value.
+    """
+    payload = json_util.dumps(entry, sort_keys=True)
+    return f"{sequence}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+def get_history_archive_docs(fv_query, dropped):
+    """
+    Returns the field_value_history documents of the dropped entries, oldest
+    first so that the insertion order follows the edits.
+    :param fv_query: Keys of the field value.
+    :param dropped: List of (sequence, entry), newest first.
+    :return: List of documents.
+    """
+    return [
+        {
+            "workspace_idx": fv_query["workspace_idx"],
+            "field_bundle_idx": fv_query.get("field_bundle_idx", None),
+            "field_idx": fv_query["field_idx"],
+            "file_idx": fv_query["file_idx"],
+            "ts": get_history_entry_time(entry),
+            "entry_key": get_history_entry_key(sequence, entry),
+            "entry": entry,
+        }
+        for sequence, entry in reversed(dropped)
+    ]
+
+
+def get_history_archive_requests(archive_docs):
+    """
+    Returns the upserts of the archive documents, an entry which is already
+    archived is left as is so that retrying a write archives it only once.
+    :param archive_docs: Documents from get_history_archive_docs.
+    :return: List of UpdateOne for the field_value_history collection.
+    """
+    return [
+        UpdateOne(
+            {
+                "field_idx": doc["field_idx"],
+                "file_idx": doc["file_idx"],
+                "entry_key": doc["entry_key"],
+            },
+            {"$setOnInsert": doc},
+            upsert=True,
+        )
+        for doc in archive_docs
+    ]
+
+
+class WorkflowFieldValueWriter:
+    """Buffers the upserts of workflow field values of a field and writes them
+    with unordered bulk writes, one chunk at a time."""
+
+    def __init__(
+        self,
+        collection,
+        history_collection,
+        workspace_idx,
+        field_bundle_idx,
+        field_idx,
+        changes_callback=None,
+        chunk_size=WORKFLOW_FIELD_BULK_WRITE_SIZE,
+        progress_callback=None,
+    ):
+        """
+        :param collection: field_value collection
+        :param history_collection: field_value_history collection
+        :param changes_callback: Called with the value changes of each written chunk.
+        :param chunk_size: Number of upserts per bulk write.
+        :param progress_callback: Called with the number of written values after each chunk.
+        """
+        self.collection = collection
+        self.history_collection = history_collection
+        self.workspace_idx = workspace_idx
+        self.field_bundle_idx = field_bundle_idx
+        self.field_idx = field_idx
+        self.changes_callback = changes_callback
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.buffer = []
+        self.written = 0
+
+    def add(self, file_idx, file_name, history_list, top_fact):
+        self.buffer.append((file_idx, file_name, history_list, top_fact))
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        chunk, self.buffer = self.buffer, []
+        old_top_facts = {}
+        old_fvs = {}
+        # Bulk writes do not return the previous documents, read them upfront.
+        # Every upsert pushes the same number of entries, one per value.
+        num_pushed = max(len(item[2]) for item in chunk)
+        for fv in self.collection.find(
+            {
+                "field_idx": self.field_idx,
+                "workspace_idx": self.workspace_idx,
+                "field_bundle_idx": self.field_bundle_idx,
+                "file_idx": {"$in": [item[0] for item in chunk]},
+            },
+            {
+                "_id": 0,
+                "file_idx": 1,
+                "top_fact.type": 1,
+                "top_fact.is_override": 1,
+                "top_fact.answer_details.raw_value": 1,
+                **get_dropped_history_projection(num_pushed),
+            },
+        ):
+            old_top_facts[fv["file_idx"]] = fv.get("top_fact", {}) or {}
+            old_fvs[fv["file_idx"]] = fv
+        archived = []
+        operations = []
+        changes = []
+        for file_idx, file_name, history_list, top_fact in chunk:
+            fv_query = {
+                "field_idx": self.field_idx,
+                "file_idx": file_idx,
+                "workspace_idx": self.workspace_idx,
+                "field_bundle_idx": self.field_bundle_idx,
+            }
+            dropped = get_dropped_history(
+                history_list,
+                old_fvs.get(file_idx, None),
+                num_pushed=num_pushed,
+            )
+            archived.append(get_history_archive_docs(fv_query, dropped))
+            operations.append(
+                UpdateOne(
+                    fv_query,
+                    {
+                        "$push": {
+                            "field_value_history": get_history_push(history_list),
+                        },
+                        "$inc": {"field_value_history_count": len(history_list)},
+                        "$set": {
+                            "top_fact": top_fact,
+                            "file_name": file_name,
+                        },
+                        "$currentDate": {"last_modified": {"$type": "date"}},
+                    },
+                    upsert=True,
+                ),
+            )
+            changes.append(
+                {
+                    "workspace_idx": self.workspace_idx,
+                    "field_bundle_idx": self.field_bundle_idx,
+                    "field_idx": self.field_idx,
+                    "file_idx": file_idx,
+                    "file_name": file_name,
+                    "old_exists": file_idx in old_top_facts,
+                    "old_raw_value": get_raw_value(old_top_facts.get(file_idx)),
+                    "old_top_fact": old_top_facts.get(file_idx),
+                    "new_exists": True,
+                    "new_raw_value": get_raw_value(top_fact),
+                    "new_top_fact": top_fact,
+                },
+            )
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Archive and apply what the written upserts changed, a retry of the
+            # chunk skips the entries which are already archived.
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self._written(
+                [d for i, d in enumerate(archived) if i not in failed],
+                [c for i, c in enumerate(changes) if i not in failed],
+            )
+            raise
+        self._written(archived, changes)
+        self.written += len(operations)
+        logger.info(
+            f"Wrote {self.written} workflow field values for "
+            f"{self.workspace_idx} - {self.field_bundle_idx} - {self.field_idx}",
+        )
+        if self.progress_callback:
+            self.progress_callback(self.written)
+
+    def _written(self, archived, changes):
+        """
+        Archives the dropped history and applies the value changes of the written
+        upserts.
+        :param archived: Archive documents of each written upsert.
+        :param changes: Value changes of each written upsert.
+        :return: VOID
+        """
+        requests = get_history_archive_requests(
+            [doc for docs in archived for doc in docs],
+        )
+        if requests:
+            self.history_collection.bulk_write(requests)
+        if self.changes_callback and changes:
+            self.changes_callback(changes)
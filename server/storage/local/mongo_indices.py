@@ -0,0 +1,564 @@
+import logging
+import os
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Bump this whenever INDEX_MANIFEST changes, so that running services pick up
+# the new indices on their next start.
+INDEX_MANIFEST_VERSION = 16
+INDEX_MANIFEST_SETTING_ID = "index_manifest_version"
+# access_logs older than this are removed by a TTL index.
+ACCESS_LOG_RETENTION_DAYS = int(os.getenv("ACCESS_LOG_RETENTION_DAYS", 90))
+
+# Every index the MongoDB class relies on. Each entry in "indices" is either a
+# list of (field, direction) tuples or a dict with "keys" and index options.
+INDEX_MANIFEST = [
+    {
+        "col_name": "document",
+        "indices": [
+            [("id", 1)],
+            [("workspace_id", 1), ("is_deleted", 1)],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("name_sort_key", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("title_sort_key", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("created_on", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("file_size", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("meta.pubDate", 1),
+                ("id", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("status", 1),
+                ("created_on", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("name", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("name_grams", 1),
+            ],
+            [
+                ("is_deleted", 1),
+                ("parent_folder", 1),
+                ("workspace_id", 1),
+                ("title_grams", 1),
+            ],
+            [("source_url", 1)],
+        ],
+    },
+    {
+        "col_name": "document_payload",
+        "indices": [
+            {"keys": [("doc_id", 1)], "unique": True},
+        ],
+    },
+    {
+        "col_name": "field_value",
+        "indices": [
+            [
+                ("workspace_idx", 1),
+                ("field_bundle_idx", 1),
+                ("field_idx", 1),
+                ("file_idx", 1),
+            ],
+            [
+                ("workspace_idx", 1),
+                ("field_bundle_idx", 1),
+                ("file_name", 1),
+            ],
+            [("field_idx", 1), ("file_idx", 1)],
+            [("file_idx", 1)],
+            [("workspace_idx", 1), ("last_modified", 1)],
+        ],
+    },
+    {
+        "col_name": "field_distinct_value",
+        "indices": [
+            [("field_idx", 1), ("count", 1)],
+            {"keys": [("field_idx", 1), ("raw_value", 1)], "unique": True},
+        ],
+    },
+    {
+        "col_name": "field_distinct_value_state",
+        "indices": [
+            {"keys": [("field_idx", 1)], "unique": True},
+            [("checked_on", 1)],
+        ],
+    },
+    {
+        "col_name": "field_bundle_grid_state",
+        "indices": [
+            {"keys": [("field_bundle_id", 1)], "unique": True},
+        ],
+    },
+    {
+        "col_name": "field_value_history",
+        "indices": [
+            [("field_idx", 1), ("file_idx", 1), ("ts", -1)],
+        ],
+    },
+    {
+        "col_name": "field_value_stats",
+        "indices": [
+            {
+                "keys": [("field_bundle_idx", 1), ("kind", 1), ("key", 1)],
+                "unique": True,
+            },
+        ],
+    },
+    {
+        "col_name": "field_value_stats_state",
+        "indices": [
+            {"keys": [("field_bundle_id", 1)], "unique": True},
+            [("ready", 1), ("built_on", 1)],
+        ],
+    },
+    {
+        "col_name": "field_bundle_version",
+        "indices": [
+            {"keys": [("field_bundle_id", 1)], "unique": True},
+        ],
+    },
+    {
+        "col_name": "document_counter",
+        "indices": [
+            {"keys": [("workspace_id", 1), ("folder_id", 1)], "unique": True},
+        ],
+    },
+    {
+        "col_name": "field",
+        "indices": [
+            [("id", 1)],
+            [("workspace_id", 1)],
+            [("parent_bundle_id", 1)],
+        ],
+    },
+    {
+        "col_name": "field_bundle",
+        "indices": [
+            [("id", 1)],
+            [("workspace_id", 1)],
+            [("field_ids", 1)],
+        ],
+    },
+    {
+        "col_name": "workspace",
+        "indices": [
+            [("id", 1)],
+            [("user_id", 1), ("active", 1)],
+            [("principals.principal", 1), ("active", 1)],
+        ],
+    },
+    {
+        "col_name": "user",
+        "indices": [
+            [("id", 1)],
+            [("email_id", 1)],
+            [("subscription_sessions.session_id", 1)],
+        ],
+    },
+    {
+        "col_name": "task",
+        "indices": [
+            [("user_id", 1), ("_id", -1)],
+            [("task_name", 1), ("status", 1), ("_id", -1)],
+        ],
+    },
+    {
+        "col_name": "search_history",
+        "indices": [
+            [("user_id", 1), ("timestamp", -1)],
+            [("user_id", 1), ("workspace_id", 1), ("timestamp", -1)],
+        ],
+    },
+    {
+        "col_name": "access_logs",
+        "indices": [
+            {
+                "keys": [("datetime", 1)],
+                "expireAfterSeconds": ACCESS_LOG_RETENTION_DAYS * 24 * 60 * 60,
+            },
+        ],
+    },
+    {
+        "col_name": "usage",
+        "indices": [
+            [("user_id", 1)],
+            [("user_id", 1), ("reported_on", 1)],
+        ],
+    },
+    {
+        "col_name": "history",
+        "indices": [
+            [("user_id", 1), ("workspace_id", 1), ("action", 1)],
+        ],
+    },
+    {
+        "col_name": "notifications",
+        "indices": [
+            [("user_id", 1), ("is_read", 1), ("notify_action", 1)],
+        ],
+    },
+    {
+        "col_name": "bboxes",
+        "indices": [
+            [("file_idx", 1), ("audited", 1)],
+        ],
+    },
+    {
+        "col_name": "saved_search_results",
+        "indices": [
+            [("doc_id", 1)],
+            [("unique_id", 1)],
+        ],
+    },
+    {
+        "col_name": "training_samples",
+        "indices": [
+            [("model_to_train", 1), ("train_state", 1)],
+        ],
+    },
+    {
+        "col_name": "template",
+        "indices": [
+            [("id", 1)],
+            [("workspace_id", 1)],
+        ],
+    },
+    {
+        "col_name": "folder",
+        "indices": [
+            [("id", 1)],
+        ],
+    },
+    {
+        "col_name": "user_acl",
+        "indices": [
+            [("email_id", 1)],
+        ],
+    },
+    {
+        "col_name": "nlm_subscriptions",
+        "indices": [
+            [("subs_name", 1)],
+        ],
+    },
+    {
+        "col_name": "nlm_settings",
+        "indices": [
+            [("id", 1)],
+        ],
+    },
+    {
+        "col_name": "nlm_catalog",
+        "indices": [
+            [("id", 1)],
+        ],
+    },
+]
+
+# Representative query shapes issued by the MongoDB class. The advisor runs
+# explain() on each of these and flags plans that do not use an index.
+QUERY_SHAPES = [
+    {
+        "name": "get_folder_contents",
+        "col_name": "document",
+        "filter": {
+            "workspace_id": "__ws__",
+            "parent_folder": "root",
+            "is_deleted": False,
+        },
+        "sort": [("name_sort_key", 1), ("id", 1)],
+    },
+    {
+        "name": "get_folder_contents_by_status",
+        "col_name": "document",
+        "filter": {
+            "workspace_id": "__ws__",
+            "parent_folder": "root",
+            "is_deleted": False,
+            "status": "ready_for_ingestion",
+        },
+        "sort": [("created_on", -1)],
+    },
+    {
+        "name": "get_folder_contents_by_name",
+        "col_name": "document",
+        "filter": {
+            "workspace_id": "__ws__",
+            "parent_folder": "root",
+            "is_deleted": False,
+            "name_grams": {"$all": ["k_2", "021"]},
+            "name": {"$regex": "k_2021", "$options": "i"},
+        },
+    },
+    {
+        "name": "get_document_counters",
+        "col_name": "document_counter",
+        "filter": {"workspace_id": "__ws__", "folder_id": "root"},
+    },
+    {
+        "name": "get_document",
+        "col_name": "document",
+        "filter": {"id": "__doc__"},
+    },
+    {
+        "name": "read_extracted_field",
+        "col_name": "field_value",
+        "filter": {
+            "workspace_idx": "__ws__",
+            "field_bundle_idx": "__bundle__",
+            "field_idx": "__field__",
+            "file_idx": "__doc__",
+        },
+    },
+    {
+        "name": "rebuild_field_bundle_grid",
+        "col_name": "field_value",
+        "filter": {
+            "workspace_idx": "__ws__",
+            "field_bundle_idx": "__bundle__",
+        },
+    },
+    {
+        "name": "is_field_bundle_grid_ready",
+        "col_name": "field_bundle_grid_state",
+        "filter": {"field_bundle_id": "__bundle__"},
+    },
+    {
+        "name": "get_field_value_history",
+        "col_name": "field_value_history",
+        "filter": {"field_idx": "__field__", "file_idx": "__doc__"},
+        "sort": [("ts", -1), ("_id", -1)],
+    },
+    {
+        "name": "build_field_value_stats",
+        "col_name": "field_value_stats",
+        "filter": {"field_bundle_idx": "__bundle__"},
+    },
+    {
+        "name": "refresh_field_distinct_values",
+        "col_name": "field_distinct_value",
+        "filter": {"field_idx": "__field__", "count": {"$gt": 0}},
+    },
+    {
+        "name": "get_fields_in_bundle",
+        "col_name": "field",
+        "filter": {"parent_bundle_id": "__bundle__"},
+    },
+    {
+        "name": "get_field_bundles_in_workspace",
+        "col_name": "field_bundle",
+        "filter": {"workspace_id": "__ws__"},
+    },
+    {
+        "name": "get_user_by_email",
+        "col_name": "user",
+        "filter": {"email_id": "__email__"},
+    },
+    {
+        "name": "get_workspaces_for_user",
+        "col_name": "workspace",
+        "filter": {"user_id": "__user__", "active": True},
+    },
+    {
+        "name": "get_shared_workspaces",
+        "col_name": "workspace",
+        "filter": {
+            "principals.principal": {"$in": ["__user__", "__domain__", "*"]},
+            "active": True,
+        },
+    },
+    {
+        "name": "get_task",
+        "col_name": "task",
+        "filter": {"user_id": "__user__"},
+        "sort": [("_id", -1)],
+    },
+    {
+        "name": "get_search_history",
+        "col_name": "search_history",
+        "filter": {"user_id": "__user__", "timestamp": {"$gte": 0}},
+        "sort": [("timestamp", -1)],
+    },
+    {
+        "name": "retrieve_usage_metrics",
+        "col_name": "usage",
+        "filter": {"user_id": "__user__", "reported_on": "__month__"},
+    },
+]
+
+
+def _index_keys(index):
+    if isinstance(index, dict):
+        return list(index["keys"])
+    return list(index)
+
+
+def _index_options(index):
+    if isinstance(index, dict):
+        return {k: v for k, v in index.items() if k != "keys"}
+    return {}
+
+
+def _is_text_index(keys):
+    return any(direction == "text" for _, direction in keys)
+
+
+def _find_existing_index(keys, index_info):
+    """
+    Returns the name of the existing index matching the given keys, or None.
+    :param keys: List of (field, direction) tuples.
+    :param index_info: Output of Collection.index_information().
+    :return: Name of the index or None.
+    """
+    if _is_text_index(keys):
+        # Only a single text index is allowed per collection.
+        for name, info in index_info.items():
+            if any(field == "_fts" for field, _ in info["key"]):
+                return name
+        return None
+    wanted = [(field, int(direction)) for field, direction in keys]
+    for name, info in index_info.items():
+        existing = []
+        for field, direction in info["key"]:
+            try:
+                existing.append((field, int(direction)))
+            except (TypeError, ValueError):
+                existing.append((field, direction))
+        if existing == wanted:
+            return name
+    return None
+
+
+def reconcile_indices(db, manifest=None, drop_extra=False, dry_run=False):
+    """
+    Creates every index in the manifest that is missing from the database.
+    :param db: pymongo Database.
+    :param manifest: Index manifest, defaults to INDEX_MANIFEST.
+    :param drop_extra: Drop indices that are not part of the manifest.
+    :param dry_run: Only report, do not change anything.
+    :return: Dict of collection name to created, existing and extra indices.
+    """
+    manifest = manifest if manifest is not None else INDEX_MANIFEST
+    report = {}
+    for col in manifest:
+        col_name = col["col_name"]
+        index_info = db[col_name].index_information()
+        col_report = {"created": [], "existing": [], "extra": [], "failed": []}
+        matched = {"_id_"}
+        for index in col["indices"]:
+            keys = _index_keys(index)
+            existing_name = _find_existing_index(keys, index_info)
+            if existing_name:
+                matched.add(existing_name)
+                col_report["existing"].append(existing_name)
+                continue
+            if dry_run:
+                col_report["created"].append(keys)
+                continue
+            try:
+                name = db[col_name].create_index(keys, **_index_options(index))
+                matched.add(name)
+                col_report["created"].append(name)
+                logger.info(f"Created index {name} on {col_name}")
+            except OperationFailure as e:
+                col_report["failed"].append(keys)
+                logger.error(f"Failed to create index {keys} on {col_name}, err: {e}")
+        for name in index_info:
+            if name in matched:
+                continue
+            col_report["extra"].append(name)
+            if drop_extra and not dry_run:
+                db[col_name].drop_index(name)
+                logger.info(f"Dropped index {name} on {col_name}")
+        report[col_name] = col_report
+    return report
+
+
+def _collect_plan_stages(plan, stages):
+    if not isinstance(plan, dict):
+        return stages
+    if "stage" in plan:
+        stages.append(plan["stage"])
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            _collect_plan_stages(plan[key], stages)
+    for child in plan.get("inputStages", []):
+        _collect_plan_stages(child, stages)
+    return stages
+
+
+def advise_indices(db, query_shapes=None):
+    """
+    Runs explain() on each query shape and reports plans with a COLLSCAN or an
+    in-memory SORT stage.
+    :param db: pymongo Database.
+    :param query_shapes: Query shapes to check, defaults to QUERY_SHAPES.
+    :return: List of dicts describing the offending query shapes.
+    """
+    query_shapes = query_shapes if query_shapes is not None else QUERY_SHAPES
+    problems = []
+    for shape in query_shapes:
+        cursor = db[shape["col_name"]].find(shape["filter"], {"_id": 1})
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explain = cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _collect_plan_stages(winning_plan, [])
+        issues = [stage for stage in stages if stage in ("COLLSCAN", "SORT")]
+        if issues:
+            problems.append(
+                {
+                    "name": shape["name"],
+                    "col_name": shape["col_name"],
+                    "issues": issues,
+                    "stages": stages,
+                },
+            )
+            logger.info(f"Query shape {shape['name']} uses {issues}, stages: {stages}")
+    return problems
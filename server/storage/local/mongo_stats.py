@@ -0,0 +1,166 @@
+import contextlib
+import logging
+import os
+import threading
+
+import bson
+from flask import has_request_context
+from flask import request
+from nlm_utils.utils.utils import ensure_bool
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+# Aggregates the commands per endpoint, needs to re-encode every reply to count the bytes.
+MONGO_COMMAND_STATS = ensure_bool(os.getenv("MONGO_COMMAND_STATS", False))
+# Commands slower than this are logged with the shape of their filter, 0 disables it.
+MONGO_SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", 500))
+# Commands which are in flight for longer are not reported.
+MAX_PENDING_COMMANDS = 10000
+# Location of the filter of each command.
+FILTER_KEYS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+_scope = threading.local()
+
+
+@contextlib.contextmanager
+def command_scope(name):
+    """Attributes the mongo commands sent by this thread to name, for the
+    worker tasks which do not run in a flask request
+    :param name: name of the task
+    """
+    previous = getattr(_scope, "name", None)
+    _scope.name = name
+    try:
+        yield
+    finally:
+        _scope.name = previous
+
+
+def get_scope_name():
+    """Returns the flask endpoint or the task the current thread works for"""
+    name = getattr(_scope, "name", None)
+    if name:
+        return name
+    if has_request_context():
+        return request.endpoint or request.path
+    return threading.current_thread().name
+
+
+def get_query_shape(query):
+    """Returns the query with every value replaced by "?", keeping the keys and
+    operators, e.g. {"id": {"$in": "?"}}
+    :param query: mongo filter
+    :return: shape of the filter
+    """
+    if isinstance(query, dict):
+        return {k: get_query_shape(v) for k, v in query.items()}
+    if isinstance(query, list) and query and isinstance(query[0], dict):
+        return [get_query_shape(v) for v in query]
+    return "?"
+
+
+def get_command_filter(command_name, command):
+    """Returns the filter of a command, None when it does not have one
+    :param command_name: name of the command, e.g. find
+    :param command: command document
+    :return: mongo filter
+    """
+    if command_name in FILTER_KEYS:
+        return command.get(FILTER_KEYS[command_name], None)
+    if command_name == "update" and command.get("updates", None):
+        return command["updates"][0].get("q", None)
+    if command_name == "delete" and command.get("deletes", None):
+        return command["deletes"][0].get("q", None)
+    if command_name == "aggregate" and command.get("pipeline", None):
+        return command["pipeline"][0].get("$match", None)
+    return None
+
+
+class CommandStatsListener(monitoring.CommandListener):
+    """Aggregates count, duration and returned bytes of the mongo commands per
+    endpoint (or worker task), command and collection, and logs the slow ones."""
+
+    def __init__(self, collect_stats=MONGO_COMMAND_STATS, slow_ms=MONGO_SLOW_QUERY_MS):
+        """
+        :param collect_stats: aggregate the commands
+        :param slow_ms: log the commands slower than this, 0 disables it
+        """
+        self.collect_stats = collect_stats
+        self.slow_ms = slow_ms
+        self.pending = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def started(self, event):
+        if not self.collect_stats and not self.slow_ms:
+            return
+        if len(self.pending) >= MAX_PENDING_COMMANDS:
+            return
+        collection = event.command.get(event.command_name, None)
+        self.pending[event.request_id] = (
+            get_scope_name(),
+            collection if isinstance(collection, str) else None,
+            get_command_filter(event.command_name, event.command),
+        )
+
+    def _finish(self, event, reply=None, failed=False):
+        info = self.pending.pop(event.request_id, None)
+        if info is None:
+            return
+        scope, collection, query = info
+        duration_ms = event.duration_micros / 1000
+        if self.collect_stats:
+            num_bytes = len(bson.encode(reply)) if reply else 0
+            key = (scope, event.command_name, collection)
+            with self.lock:
+                entry = self.stats.setdefault(
+                    key,
+                    {"count": 0, "failed": 0, "total_ms": 0, "max_ms": 0, "bytes": 0},
+                )
+                entry["count"] += 1
+                entry["failed"] += int(failed)
+                entry["total_ms"] += duration_ms
+                entry["max_ms"] = max(entry["max_ms"], duration_ms)
+                entry["bytes"] += num_bytes
+        if self.slow_ms and duration_ms >= self.slow_ms:
+            logger.info(
+                f"Slow mongo command {event.command_name} on {collection} from {scope} "
+                f"took {duration_ms:.1f}ms, filter: {get_query_shape(query)}",
+            )
+
+    def succeeded(self, event):
+        self._finish(event, reply=event.reply)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def get_stats(self, reset=False):
+        """Returns the aggregated commands, slowest in total first
+        :param reset: start a new aggregation
+        :return: list of dicts
+        """
+        with self.lock:
+            stats = self.stats
+            if reset:
+                self.stats = {}
+        rows = []
+        for (scope, command_name, collection), entry in stats.items():
+            row = {
+                "endpoint": scope,
+                "command": command_name,
+                "collection": collection,
+                **entry,
+            }
+            row["avg_ms"] = entry["total_ms"] / entry["count"] if entry["count"] else 0
+            rows.append(row)
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+
+command_stats = CommandStatsListener()
@@ -0,0 +1,61 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class BackgroundReconciler:
+    """Periodically claims a batch of stale entries and rebuilds them, from a
+    background daemon thread."""
+
+    def __init__(self, name, claim, rebuild, interval, max_age, batch_size):
+        """
+        :param name: name used in the logs
+        :param claim: called with max_age and batch_size, returns the list of
+            claimed keys, tuples of the arguments of rebuild
+        :param rebuild: called with the items of a claimed key
+        :param interval: seconds between two runs, 0 disables the reconciler
+        :param max_age: seconds after which an entry is rebuilt
+        :param batch_size: entries rebuilt per run
+        """
+        self.name = name
+        self.claim = claim
+        self.rebuild = rebuild
+        self.interval = interval
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        if self.interval <= 0 or (self.thread and self.thread.is_alive()):
+            return
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def run_once(self):
+        """Rebuilds one batch of entries
+        :return: number of entries rebuilt
+        """
+        keys = self.claim(self.max_age, self.batch_size)
+        for key in keys:
+            try:
+                self.rebuild(*key)
+            except Exception as e:
+                logger.error(f"Failed to rebuild the {self.name} of {key}, err: {e}")
+        return len(keys)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Reconciler of the {self.name} failed, err: {e}")
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,95 @@
+import copy
+import logging
+import os
+
+from flask import g
+from flask import has_request_context
+from flask import request
+from nlm_utils.utils.utils import ensure_bool
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+REQUEST_CACHE_ENABLED = ensure_bool(os.getenv("REQUEST_CACHE_ENABLED", True))
+MONGO_ROUND_TRIP_DEBUG = ensure_bool(os.getenv("MONGO_ROUND_TRIP_DEBUG", False))
+# Commands which change the documents of the collection they are sent to.
+WRITE_COMMANDS = {"insert", "update", "delete", "findandmodify"}
+
+
+def _get_identity_map():
+    if not REQUEST_CACHE_ENABLED or not has_request_context():
+        return None
+    if "mongo_identity_map" not in g:
+        g.mongo_identity_map = {}
+    return g.mongo_identity_map
+
+
+def get_cached(col_name, key, loader):
+    """Returns the raw document returned by loader, memoized for the current request.
+    Outside a request, loader is always called.
+    :param col_name: collection the document belongs to, writes to it drop the entries
+    :param key: hashable key of the document within the collection
+    :param loader: function fetching the document from mongo
+    :return: copy of the document, callers are free to modify it
+    """
+    identity_map = _get_identity_map()
+    if identity_map is None:
+        return loader()
+    col_map = identity_map.setdefault(col_name, {})
+    if key not in col_map:
+        col_map[key] = loader()
+    return copy.deepcopy(col_map[key])
+
+
+def invalidate(col_name=None):
+    """Drops the cached documents of the current request
+    :param col_name: collection to drop, all collections when not set
+    """
+    identity_map = _get_identity_map()
+    if identity_map is None:
+        return
+    if col_name:
+        identity_map.pop(col_name, None)
+    else:
+        identity_map.clear()
+
+
+def get_round_trip_count():
+    """Returns the number of mongo commands sent in the current request"""
+    if not has_request_context():
+        return 0
+    return g.get("mongo_round_trips", 0)
+
+
+class RequestCommandListener(monitoring.CommandListener):
+    """Counts the mongo commands of a request and drops the cached documents of
+    the collections written to. Events are published in the thread sending the
+    command, so flask.g is the one of the request issuing it."""
+
+    def started(self, event):
+        if not has_request_context():
+            return
+        g.mongo_round_trips = g.get("mongo_round_trips", 0) + 1
+        if event.command_name.lower() in WRITE_COMMANDS:
+            invalidate(event.command.get(event.command_name, None))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def init_request_stats(flask_app):
+    """Reports the mongo round trips of each request when MONGO_ROUND_TRIP_DEBUG is set
+    :param flask_app: Flask app
+    """
+    if not MONGO_ROUND_TRIP_DEBUG:
+        return
+
+    @flask_app.after_request
+    def report_mongo_round_trips(resp):
+        count = get_round_trip_count()
+        resp.headers["X-Mongo-Round-Trips"] = str(count)
+        logger.info(f"{request.method} {request.path}: {count} mongo round trips")
+        return resp
@@ -0,0 +1,68 @@
+import collections
+import copy
+import os
+import threading
+import time
+
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 5000))
+
+
+class UserProfileCache:
+    """In process TTL cache of raw user documents keyed by email. Writes made by
+    this process invalidate the entries right away, writes made by other
+    processes are picked up after at most ttl seconds."""
+
+    def __init__(self, ttl=USER_CACHE_TTL_SECONDS, max_size=USER_CACHE_SIZE):
+        """
+        :param ttl: seconds a user document is served from memory, 0 disables the cache
+        :param max_size: maximum number of users to keep
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, email):
+        """Returns a copy of the cached user document, None when missing or stale
+        :param email: email of the user
+        :return: user dict
+        """
+        with self.lock:
+            entry = self.entries.get(email, None)
+            if entry is None:
+                return None
+            user_dict, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[email]
+                return None
+            self.entries.move_to_end(email)
+        return copy.deepcopy(user_dict)
+
+    def put(self, email, user_dict):
+        """
+        :param email: email of the user
+        :param user_dict: raw user document
+        """
+        if self.ttl <= 0 or not user_dict:
+            return
+        with self.lock:
+            self.entries[email] = (copy.deepcopy(user_dict), time.monotonic() + self.ttl)
+            self.entries.move_to_end(email)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, email="", user_id=""):
+        """Drops a user from the cache, everybody when neither email nor user_id is set
+        :param email: email of the user
+        :param user_id: id of the user
+        """
+        with self.lock:
+            if email:
+                self.entries.pop(email, None)
+            elif user_id:
+                for key, (user_dict, _) in list(self.entries.items()):
+                    if user_dict.get("id", None) == user_id:
+                        del self.entries[key]
+            else:
+                self.entries.clear()
@@ -0,0 +1,123 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+from pymongo import UpdateOne
+
+from server.storage.local import document_counters
+from server.test import BaseTestCase
+
+
+class TestDocumentCounters(BaseTestCase):
+    """Document counters unit tests"""
+
+    def assert_transition(self, old_doc, new_doc, expected):
+        self.assertEqual(
+            document_counters.get_transition_updates(old_doc, new_doc),
+            [
+                UpdateOne(
+                    {"workspace_id": "ws", "folder_id": folder_id},
+                    {"$inc": inc},
+                    upsert=True,
+                )
+                for folder_id, inc in expected
+            ],
+        )
+
+    def test_get_transition_updates(self):
+        """Test case for get_transition_updates
+
+        Moves a document between the counters when it is created, removed,
+        changes status, is soft deleted or moves to another folder
+        """
+        doc = {"workspace_id": "ws", "parent_folder": None, "status": "ingest_ok"}
+        self.assert_transition(
+            None,
+            doc,
+            [("root", {"total": 1, "status.ingest_ok": 1})],
+        )
+        self.assert_transition(
+            doc,
+            None,
+            [("root", {"total": -1, "status.ingest_ok": -1})],
+        )
+        self.assert_transition(
+            {**doc, "status": "ingest_inprogress"},
+            doc,
+            [("root", {"status.ingest_inprogress": -1, "status.ingest_ok": 1})],
+        )
+        self.assert_transition(
+            doc,
+            {**doc, "is_deleted": True},
+            [("root", {"total": -1, "status.ingest_ok": -1, "deleted": 1})],
+        )
+        self.assert_transition(
+            {**doc, "parent_folder": "f1"},
+            {**doc, "parent_folder": "f2"},
+            [
+                ("f1", {"total": -1, "status.ingest_ok": -1}),
+                ("f2", {"total": 1, "status.ingest_ok": 1}),
+            ],
+        )
+        self.assert_transition(doc, dict(doc), [])
+        self.assert_transition(None, {"status": "ingest_ok"}, [])
+
+    def test_build_counters(self):
+        """Test case for build_counters
+
+        Builds the counters of every folder from the grouped documents
+        """
+        rows = [
+            {"_id": {"workspace_id": "ws", "status": "ingest_ok"}, "count": 3},
+            {"_id": {"workspace_id": "ws", "status": "ingest_failed"}, "count": 1},
+            {
+                "_id": {
+                    "workspace_id": "ws",
+                    "is_deleted": True,
+                    "status": "ingest_ok",
+                },
+                "count": 2,
+            },
+            {"_id": {"workspace_id": "ws", "parent_folder": "f1"}, "count": 4},
+        ]
+        counters = document_counters.build_counters(rows)
+        self.assertEqual(set(counters), {("ws", "root"), ("ws", "f1")})
+        self.assertEqual(counters[("ws", "root")]["total"], 4)
+        self.assertEqual(counters[("ws", "root")]["deleted"], 2)
+        self.assertEqual(
+            counters[("ws", "root")]["status"],
+            {"ingest_ok": 3, "ingest_failed": 1},
+        )
+        self.assertEqual(counters[("ws", "f1")]["total"], 4)
+        self.assertEqual(counters[("ws", "f1")]["status"], {})
+
+    def test_get_recount_inc(self):
+        """Test case for get_recount_inc
+
+        Corrects a counter to the recounted values with an increment
+        """
+        recounted = document_counters.new_counter("ws", "root")
+        recounted.update(total=5, deleted=1, status={"ingest_ok": 4, "failed": 1})
+        self.assertEqual(
+            document_counters.get_recount_inc(None, recounted),
+            {"total": 5, "deleted": 1, "status.ingest_ok": 4, "status.failed": 1},
+        )
+        counter = {"total": 6, "status": {"ingest_ok": 4, "ingest_inprogress": 2}}
+        self.assertEqual(
+            document_counters.get_recount_inc(counter, recounted),
+            {
+                "total": -1,
+                "deleted": 1,
+                "status.ingest_inprogress": -2,
+                "status.failed": 1,
+            },
+        )
+        self.assertEqual(
+            document_counters.get_recount_inc(recounted, recounted),
+            {"total": 0, "deleted": 0},
+        )
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
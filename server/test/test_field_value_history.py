@@ -0,0 +1,147 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+import datetime
+
+from server.storage.local.mongo_db import FIELD_VALUE_HISTORY_INLINE_SIZE
+from server.storage.local.mongo_db import get_dropped_history
+from server.storage.local.mongo_db import get_dropped_history_projection
+from server.storage.local.mongo_db import get_history_archive_docs
+from server.storage.local.mongo_db import get_history_archive_requests
+from server.storage.local.mongo_db import get_numbered_history
+from server.test import BaseTestCase
+
+
+def get_entries(prefix, count):
+    return [
+        {
+            "username": "user",
+            "edited_time": f"2023-01-01 00:00:{idx:02d}",
+            "previous": None,
+            "modified": {"answer": f"{prefix}{idx}"},
+        }
+        for idx in range(count)
+    ]
+
+
+def project_old_fv(history, num_pushed, history_count=None):
+    """Applies the $slice of get_dropped_history_projection to the history"""
+    projection = get_dropped_history_projection(num_pushed)
+    skip, _ = projection["field_value_history"]["$slice"]
+    old_fv = {"field_value_history": history[skip:]}
+    if history_count is not None:
+        old_fv["field_value_history_count"] = history_count
+    return old_fv
+
+
+class TestFieldValueHistory(BaseTestCase):
+    """Field value history unit tests"""
+
+    def test_get_dropped_history(self):
+        """Test case for get_dropped_history
+
+        Returns the entries pushed out of the inline history with their
+        push sequence
+        """
+        size = FIELD_VALUE_HISTORY_INLINE_SIZE
+        new_history = get_entries("new", 1)
+        old_history = get_entries("old", size - 1)
+        old_fv = project_old_fv(old_history, 1, size - 1)
+        self.assertEqual(get_dropped_history(new_history, old_fv), [])
+        self.assertEqual(get_dropped_history(new_history, None), [])
+        old_history = get_entries("old", size)
+        old_fv = project_old_fv(old_history, 1, size + 4)
+        self.assertEqual(
+            get_dropped_history(new_history, old_fv),
+            [(4, old_history[-1])],
+        )
+        new_history = get_entries("new", size + 2)
+        old_history = get_entries("old", 3)
+        old_fv = project_old_fv(old_history, len(new_history), 3)
+        self.assertEqual(
+            get_dropped_history(new_history, old_fv),
+            [
+                (4, new_history[-2]),
+                (3, new_history[-1]),
+                (2, old_history[0]),
+                (1, old_history[1]),
+                (0, old_history[2]),
+            ],
+        )
+
+    def test_get_dropped_history_legacy(self):
+        """Test case for get_dropped_history
+
+        Handles the histories written before the cap and the count
+        """
+        size = FIELD_VALUE_HISTORY_INLINE_SIZE
+        old_history = get_entries("old", size + 5)
+        new_history = get_entries("new", 1)
+        old_fv = project_old_fv(old_history, 1)
+        # Without a count, the entries are numbered below the new ones.
+        self.assertEqual(
+            get_dropped_history(new_history, old_fv),
+            [(-idx, old_history[idx - 1]) for idx in range(size, size + 6)],
+        )
+        # Bulk writes project for the largest push of the chunk.
+        old_history = get_entries("old", size)
+        old_fv = project_old_fv(old_history, 3, size)
+        self.assertEqual(
+            get_dropped_history(new_history, old_fv, num_pushed=3),
+            [(0, old_history[-1])],
+        )
+
+    def test_get_numbered_history(self):
+        """Test case for get_numbered_history
+
+        Keeps the number of an entry when newer ones are pushed
+        """
+        history = get_entries("old", 3)
+        self.assertEqual(
+            get_numbered_history(history, 3),
+            [(2, history[0]), (1, history[1]), (0, history[2])],
+        )
+        pushed = get_entries("new", 2) + history
+        self.assertEqual(
+            get_numbered_history(pushed, 5)[2:],
+            get_numbered_history(history, 3),
+        )
+        self.assertEqual(get_numbered_history(history[1:], 3, start=1)[0][0], 1)
+
+    def test_get_history_archive_docs(self):
+        """Test case for get_history_archive_docs
+
+        Archives the entries oldest first, keyed by their push sequence
+        """
+        fv_query = {
+            "workspace_idx": "ws",
+            "field_bundle_idx": "b1",
+            "field_idx": "f1",
+            "file_idx": "d1",
+        }
+        entry = {"username": "user", "modified": None}
+        dropped = [(3, entry), (2, dict(entry))] + get_numbered_history(
+            get_entries("old", 2)[::-1],
+            2,
+        )
+        docs = get_history_archive_docs(fv_query, dropped)
+        self.assertEqual(
+            [doc["entry"] for doc in docs],
+            [e for _, e in reversed(dropped)],
+        )
+        self.assertEqual(docs[0]["ts"], datetime.datetime(2023, 1, 1, 0, 0, 0))
+        self.assertEqual(docs[1]["ts"], datetime.datetime(2023, 1, 1, 0, 0, 1))
+        self.assertIsNone(docs[2]["ts"])
+        # Identical edits get distinct keys.
+        self.assertEqual(len({doc["entry_key"] for doc in docs}), 4)
+        # A retry archives the same entries under the same keys.
+        self.assertEqual(
+            get_history_archive_requests(get_history_archive_docs(fv_query, dropped)),
+            get_history_archive_requests(docs),
+        )
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
@@ -0,0 +1,149 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+from pymongo import UpdateOne
+
+from server.storage.local.field_value_stats import build_stats_table
+from server.storage.local.field_value_stats import get_stat_counters
+from server.storage.local.field_value_stats import get_stats_key
+from server.storage.local.field_value_stats import get_stats_updates
+from server.test import BaseTestCase
+
+
+class TestFieldValueStats(BaseTestCase):
+    """Field value statistics unit tests"""
+
+    def test_get_stat_counters(self):
+        """Test case for get_stat_counters
+
+        Returns the counters a field value contributes to
+        """
+        self.assertEqual(
+            get_stat_counters(None),
+            {"n": 1, "n_edits": 0, "n_approvals": 0},
+        )
+        self.assertEqual(
+            get_stat_counters({"type": "approve", "is_override": True}),
+            {"n": 1, "n_edits": 1, "n_approvals": 1},
+        )
+
+    def test_get_stats_updates(self):
+        """Test case for get_stats_updates
+
+        Merges the changes of a write into one $inc per field and per file
+        """
+        edited = {"n": 1, "n_edits": 1, "n_approvals": 0}
+        approved = {"n": 1, "n_edits": 0, "n_approvals": 1}
+        changes = [
+            {
+                "field_bundle_idx": "b1",
+                "field_idx": "f1",
+                "file_idx": "d1",
+                "file_name": "doc 1",
+                "old": None,
+                "new": edited,
+            },
+            {
+                "field_bundle_idx": "b1",
+                "field_idx": "f2",
+                "file_idx": "d1",
+                "old": approved,
+                "new": {**approved, "n_approvals": 0},
+            },
+            {
+                "field_bundle_idx": "b1",
+                "field_idx": "f1",
+                "file_idx": "d2",
+                "old": edited,
+                "new": None,
+            },
+            {
+                "field_bundle_idx": "b1",
+                "field_idx": "f3",
+                "file_idx": "d3",
+                "old": approved,
+                "new": dict(approved),
+            },
+        ]
+        # The changes of f1 in d1 and d2 cancel out, f3 did not change.
+        self.assertEqual(
+            get_stats_updates(changes),
+            [
+                UpdateOne(
+                    get_stats_key("b1", "field", "f2"),
+                    {"$inc": {"n_approvals": -1}},
+                    upsert=True,
+                ),
+                UpdateOne(
+                    get_stats_key("b1", "file", "d1"),
+                    {
+                        "$inc": {
+                            "fields.f1.n": 1,
+                            "fields.f1.n_edits": 1,
+                            "fields.f2.n_approvals": -1,
+                        },
+                        "$set": {"file_name": "doc 1"},
+                    },
+                    upsert=True,
+                ),
+                UpdateOne(
+                    get_stats_key("b1", "file", "d2"),
+                    {"$inc": {"fields.f1.n": -1, "fields.f1.n_edits": -1}},
+                    upsert=True,
+                ),
+            ],
+        )
+
+    def test_build_stats_table(self):
+        """Test case for build_stats_table
+
+        Builds the rows and columns of the requested fields, sorted by file name
+        """
+        stat_docs = [
+            {"kind": "field", "key": "f1", "n": 2, "n_edits": 1, "n_approvals": 2},
+            {"kind": "field", "key": "f2", "n": 0, "n_edits": 0, "n_approvals": 0},
+            {"kind": "field", "key": "f3", "n": 1, "n_edits": 1, "n_approvals": 0},
+            {
+                "kind": "file",
+                "key": "d2",
+                "file_name": "b.pdf",
+                "fields": {
+                    "f1": {"n": 1, "n_edits": 1, "n_approvals": 1},
+                    "f3": {"n": 1, "n_edits": 1, "n_approvals": 0},
+                },
+            },
+            {
+                "kind": "file",
+                "key": "d1",
+                "file_name": "a.pdf",
+                "fields": {"f1": {"n": 1, "n_edits": 0, "n_approvals": 1}},
+            },
+            {
+                "kind": "file",
+                "key": "d3",
+                "file_name": "c.pdf",
+                "fields": {"f2": {"n": 0}},
+            },
+        ]
+        table = build_stats_table(stat_docs, ["f1", "f2"])
+        self.assertEqual(
+            table["rowStats"],
+            [
+                {"_id": "d1", "fileName": "a.pdf", "nEdits": 0, "nApprovals": 1},
+                {"_id": "d2", "fileName": "b.pdf", "nEdits": 1, "nApprovals": 1},
+            ],
+        )
+        self.assertEqual(
+            table["colStats"],
+            [{"_id": "f1", "nEdits": 1, "nApprovals": 2}],
+        )
+        self.assertEqual(table["totalEdits"], 1)
+        self.assertEqual(table["totalApprovals"], 2)
+        self.assertEqual(table["totalFiles"], 2)
+        self.assertEqual(table["totalFields"], 2)
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
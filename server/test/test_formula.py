@@ -0,0 +1,90 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+from server.test import BaseTestCase
+from server.utils.formula import compile_formula
+from server.utils.formula import evaluate_formula
+from server.utils.formula import FormulaError
+from server.utils.formula import FormulaRuntimeError
+from server.utils.formula import FormulaSyntaxError
+
+
+class TestFormula(BaseTestCase):
+    """Formula unit tests"""
+
+    def test_compile_formula(self):
+        """Test case for compile_formula
+
+        Compiles a formula once and rejects the ones which do not parse
+        """
+        self.assertIs(compile_formula("a + b"), compile_formula("a + b"))
+        with self.assertRaises(FormulaSyntaxError):
+            compile_formula("a +")
+
+    def test_evaluate_formula(self):
+        """Test case for evaluate_formula
+
+        Evaluates a formula for a single row
+        """
+        self.assertEqual(evaluate_formula("a * (b - 1) / 2", {"a": 3, "b": "5"}), 6.0)
+        self.assertEqual(evaluate_formula("a + b", {"a": "Yes", "b": "No"}), 1)
+        self.assertIs(evaluate_formula("not a", {"a": 0}), True)
+        with self.assertRaises(FormulaSyntaxError):
+            evaluate_formula("a ** 2", {"a": 1})
+        with self.assertRaises(FormulaSyntaxError):
+            evaluate_formula("a + c", {"a": 1})
+        with self.assertRaises(FormulaRuntimeError):
+            evaluate_formula("a / b", {"a": 1, "b": 0})
+
+    def test_evaluate_batch(self):
+        """Test case for CompiledFormula.evaluate_batch
+
+        Evaluates a formula for many rows with the results and the types of
+        the row by row evaluation
+        """
+        rows = [
+            {"a": 1, "b": 2},
+            {"a": "3.5", "b": 0},
+            {"a": "Yes", "b": "No"},
+            {"a": True, "b": True},
+            {"a": "Yes", "b": 1.5},
+            {"a": 0, "b": "No"},
+            {"a": "x", "b": 1},
+            {"b": 1},
+        ]
+        formulas = [
+            "a + b",
+            "a - b * 2",
+            "a / b",
+            "-a",
+            "-(a + b)",
+            "a and b",
+            "a or b",
+            "not a and b",
+            "(a or b) + 1",
+            "a ** b",
+            "a < b",
+            "'x'",
+        ]
+        for formula in formulas:
+            compiled = compile_formula(formula)
+            expected = []
+            for params in rows:
+                try:
+                    expected.append(compiled(params))
+                except FormulaError:
+                    expected.append(None)
+            results = compiled.evaluate_batch(rows)
+            self.assertEqual(results, expected, formula)
+            self.assertEqual(
+                [type(r) for r in results],
+                [type(e) for e in expected],
+                formula,
+            )
+        self.assertEqual(compile_formula("a + b").evaluate_batch([]), [])
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
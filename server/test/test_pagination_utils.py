@@ -0,0 +1,133 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+import base64
+import datetime
+
+from server.test import BaseTestCase
+from server.utils.pagination_utils import build_keyset_query
+from server.utils.pagination_utils import decode_continuation_token
+from server.utils.pagination_utils import encode_continuation_token
+from server.utils.pagination_utils import get_sort_type_expression
+from server.utils.pagination_utils import get_sort_value
+
+
+class TestPaginationUtils(BaseTestCase):
+    """Pagination utils unit tests"""
+
+    def test_continuation_token(self):
+        """Test case for encode_continuation_token and decode_continuation_token
+
+        Round trips the sort values and the total count of a page
+        """
+        sort_values = [datetime.datetime(2023, 5, 1, 12, 30), "name", 3, None]
+        token = encode_continuation_token(sort_values, total_count=42)
+        self.assertEqual(decode_continuation_token(token), (sort_values, 42))
+        token = encode_continuation_token(("a", 1))
+        self.assertEqual(decode_continuation_token(token), (["a", 1], None))
+
+    def test_decode_invalid_continuation_token(self):
+        """Test case for decode_continuation_token
+
+        Rejects malformed and tampered tokens
+        """
+        raw = base64.urlsafe_b64decode(encode_continuation_token(["a"], 1))
+        tampered = base64.urlsafe_b64encode(raw.replace(b'"t": 1', b'"t": 9'))
+        for token in ("not a token", "e30=", "", tampered.decode("ascii")):
+            with self.assertRaises(ValueError):
+                decode_continuation_token(token)
+
+    def test_get_sort_value(self):
+        """Test case for get_sort_value
+
+        Reads a dotted key of a row, None when missing
+        """
+        row = {"meta": {"pubDate": 1}, "name": "a", "title": None}
+        self.assertEqual(get_sort_value(row, "meta.pubDate"), 1)
+        self.assertEqual(get_sort_value(row, "name"), "a")
+        self.assertIsNone(get_sort_value(row, "name.first"))
+        self.assertIsNone(get_sort_value(row, "title"))
+        self.assertIsNone(get_sort_value(row, "missing.key"))
+
+    def test_get_sort_type_expression(self):
+        """Test case for get_sort_type_expression
+
+        Ranks the value types of a key in the sort order
+        """
+        expression = get_sort_type_expression("f1.answer_details.raw_value")
+        ranks = {
+            branch["case"]["$eq"][1]: branch["then"]
+            for branch in expression["$switch"]["branches"]
+        }
+        for branch in expression["$switch"]["branches"]:
+            self.assertEqual(
+                branch["case"]["$eq"][0],
+                {"$type": "$f1.answer_details.raw_value"},
+            )
+        self.assertEqual(ranks["null"], ranks["missing"])
+        self.assertEqual(ranks["int"], ranks["double"])
+        self.assertLess(ranks["null"], ranks["double"])
+        self.assertLess(ranks["double"], ranks["string"])
+        self.assertLess(ranks["string"], ranks["bool"])
+        self.assertGreater(expression["$switch"]["default"], max(ranks.values()))
+
+    def test_build_keyset_query(self):
+        """Test case for build_keyset_query
+
+        Matches the rows after the sort values in both directions
+        """
+        self.assertEqual(
+            build_keyset_query([("name", 1), ("_id", 1)], ["b", 5]),
+            {"$or": [{"name": {"$gt": "b"}}, {"name": "b", "_id": {"$gt": 5}}]},
+        )
+        self.assertEqual(
+            build_keyset_query([("date", -1), ("_id", 1)], [10, 5]),
+            {
+                "$or": [
+                    {"$and": [{"$or": [{"date": {"$lt": 10}}, {"date": None}]}]},
+                    {"date": 10, "_id": {"$gt": 5}},
+                ],
+            },
+        )
+        with self.assertRaises(ValueError):
+            build_keyset_query([("name", 1), ("_id", 1)], ["b"])
+
+    def test_build_keyset_query_missing_values(self):
+        """Test case for build_keyset_query
+
+        Sorts the missing values before any value
+        """
+        self.assertEqual(
+            build_keyset_query([("name", 1), ("_id", 1)], [None, 5]),
+            {"$or": [{"name": {"$ne": None}}, {"name": None, "_id": {"$gt": 5}}]},
+        )
+        self.assertEqual(
+            build_keyset_query([("name", -1), ("_id", 1)], [None, 5]),
+            {"$or": [{"name": None, "_id": {"$gt": 5}}]},
+        )
+        self.assertEqual(
+            build_keyset_query([("name", -1)], [None]),
+            {"_id": {"$exists": False}},
+        )
+
+    def test_build_keyset_query_mixed_types(self):
+        """Test case for build_keyset_query
+
+        Compares a key holding mixed types within the type rank of the last row
+        """
+        self.assertEqual(
+            build_keyset_query([("_t0", 1), ("v", 1), ("_id", 1)], [2, 7, "x"]),
+            {
+                "$or": [
+                    {"_t0": {"$gt": 2}},
+                    {"_t0": 2, "v": {"$gt": 7}},
+                    {"_t0": 2, "v": 7, "_id": {"$gt": "x"}},
+                ],
+            },
+        )
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
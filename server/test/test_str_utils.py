@@ -0,0 +1,111 @@
+# coding: utf-8
+
+from __future__ import absolute_import
+
+from server.test import BaseTestCase
+from server.utils.str_utils import get_document_key_updates
+from server.utils.str_utils import get_document_sort_keys
+from server.utils.str_utils import get_natural_sort_key
+from server.utils.str_utils import get_search_grams
+from server.utils.str_utils import get_search_query_grams
+from server.utils.str_utils import SEARCH_EDGE_GRAM_MAX
+
+
+class TestStrUtils(BaseTestCase):
+    """String utils unit tests"""
+
+    def test_get_natural_sort_key(self):
+        """Test case for get_natural_sort_key
+
+        Sorts the numbers within names by their value, case insensitive
+        """
+        names = ["file10", "file2", "File1", "file1b", "file", "10", "9"]
+        self.assertEqual(
+            sorted(names, key=get_natural_sort_key),
+            ["9", "10", "File1", "file", "file1b", "file2", "file10"],
+        )
+        self.assertLess(get_natural_sort_key("a1b2"), get_natural_sort_key("a1b10"))
+        self.assertEqual(get_natural_sort_key("file007"), get_natural_sort_key("file7"))
+        self.assertEqual(get_natural_sort_key(None), "")
+        self.assertEqual(get_natural_sort_key(12), get_natural_sort_key("12"))
+
+    def test_get_document_sort_keys(self):
+        """Test case for get_document_sort_keys
+
+        Sorts the documents without a title last
+        """
+        keys = get_document_sort_keys("doc2", "Title")
+        self.assertEqual(keys["name_sort_key"], get_natural_sort_key("doc2"))
+        untitled = get_document_sort_keys("doc2")
+        self.assertLess(keys["title_sort_key"], untitled["title_sort_key"])
+
+    def test_get_document_key_updates(self):
+        """Test case for get_document_key_updates
+
+        Derives the sort keys and search grams of the name and title being set
+        """
+        self.assertEqual(get_document_key_updates({"status": "ingest_ok"}), {})
+        self.assertEqual(
+            get_document_key_updates({"name": "doc2"}),
+            {
+                "name_sort_key": get_natural_sort_key("doc2"),
+                "name_grams": get_search_grams("doc2"),
+            },
+        )
+        self.assertEqual(
+            get_document_key_updates({"inferred_title": None}),
+            {
+                "title_sort_key": get_document_sort_keys()["title_sort_key"],
+                "title_grams": [],
+            },
+        )
+
+    def test_get_search_grams(self):
+        """Test case for get_search_grams
+
+        Returns the edge n-grams and the trigrams of a value
+        """
+        self.assertEqual(
+            get_search_grams("AbcD"),
+            ["^a", "^ab", "^abc", "^abcd", "abc", "bcd"],
+        )
+        self.assertEqual(get_search_grams("ab"), ["^a", "^ab"])
+        self.assertEqual(get_search_grams(""), [])
+        self.assertEqual(get_search_grams(None), [])
+        long_grams = get_search_grams("x" * (SEARCH_EDGE_GRAM_MAX + 5))
+        self.assertIn("^" + "x" * SEARCH_EDGE_GRAM_MAX, long_grams)
+        self.assertNotIn("^" + "x" * (SEARCH_EDGE_GRAM_MAX + 1), long_grams)
+
+    def test_get_search_query_grams(self):
+        """Test case for get_search_query_grams
+
+        Returns the grams a matching document must contain, all of them
+        found in the grams of the matching names
+        """
+        self.assertEqual(get_search_query_grams("bcd"), ["bcd"])
+        self.assertEqual(get_search_query_grams("abcde"), ["abc", "cde"])
+        self.assertEqual(get_search_query_grams("abcdef"), ["abc", "def"])
+        self.assertEqual(get_search_query_grams("ab"), [])
+        self.assertEqual(get_search_query_grams(None), [])
+        self.assertEqual(get_search_query_grams("Ab", prefix=True), ["^ab"])
+        long_prefix = "a" * SEARCH_EDGE_GRAM_MAX + "bcd"
+        self.assertEqual(
+            get_search_query_grams(long_prefix, prefix=True)[0],
+            "^" + "a" * SEARCH_EDGE_GRAM_MAX,
+        )
+        document_grams = set(get_search_grams("Quarterly Report 2021-Q3.pdf"))
+        for query in ("report", "ort 20", "2021-q3.pdf", "qua", "rterly rep"):
+            self.assertLessEqual(set(get_search_query_grams(query)), document_grams)
+        for prefix in ("q", "quarterly", "quarterly report 2021"):
+            self.assertLessEqual(
+                set(get_search_query_grams(prefix, prefix=True)),
+                document_grams,
+            )
+        self.assertFalse(
+            set(get_search_query_grams("report", prefix=True)) <= document_grams,
+        )
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
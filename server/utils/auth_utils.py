@@ -7,7 +7,7 @@ from pytz import timezone
 
 import server.config as cfg
 from server.storage import nosql_db
-from server.utils.metric_utils import create_default_metric_for
+from server.utils.metric_utils import usage_meter
 
 logger = logging.getLogger(__name__)
 logger.setLevel(cfg.log_level())
@@ -194,16 +194,10 @@ def perform_rate_limit(
         # If the subscription plan has mentioned not to do perform_rate_limit, respect it.
         if subs_name in subscription_plans and not subscription_plans[subs_name].get("perform_rate_limit", False):
             return True, None, subscription_plans, excluded_domains
-        # Retrieve the usage metrics for the current month
-        usage_metric_list = nosql_db.retrieve_usage_metrics(user_profile["id"])
-        if not usage_metric_list:
-            latest_usage_metric = nosql_db.retrieve_latest_usage(user_profile["id"])
-            if latest_usage_metric:
-                usage_metric_list = [latest_usage_metric]
-            else:
-                usage_metric_list = create_default_metric_for(user_profile["id"])
+        # Usage metrics for the current month, including the unflushed usage.
+        usage_metric = usage_meter.get_usage(user_profile["id"])
         allow_access, err_resp = allow_api_request(
-            usage_metric_list[0],
+            usage_metric,
             subscription_plans.get(subs_name, None),
             user_profile,
             req,
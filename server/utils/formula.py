@@ -1,9 +1,14 @@
 import ast
 import logging
 import operator
+from functools import lru_cache
 from functools import reduce
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -59,118 +64,286 @@ class FormulaRuntimeError(FormulaError):
     pass
 
 
-def eval_node(source: str, node: ast.AST, params: Dict[str, Any]) -> float:
-    evaluators = {
-        ast.Expression: eval_expression,
-        ast.Constant: eval_constant,
-        ast.Name: eval_name,
-        ast.BinOp: eval_binop,
-        ast.UnaryOp: eval_unaryop,
-        ast.BoolOp: eval_boolop,
+Evaluator = Callable[[Dict[str, Any]], Any]
+
+# Value kinds tracked by the batch evaluator, mirroring the python types of the
+# row evaluator: float, int (arithmetic on booleans) and bool.
+FLOAT_KIND = 0
+INT_KIND = 1
+BOOL_KIND = 2
+
+
+def _unsupported(source: str, node: ast.AST, msg: str, *operands: Evaluator):
+    # Raised only when evaluated, after the operands, as the tree walk used to.
+    def evaluate(params):
+        for operand in operands:
+            operand(params)
+        raise FormulaSyntaxError.from_ast_node(source, node, msg)
+
+    return evaluate
+
+
+def compile_node(source: str, node: ast.AST) -> Evaluator:
+    compilers = {
+        ast.Expression: compile_expression,
+        ast.Constant: compile_constant,
+        ast.Name: compile_name,
+        ast.BinOp: compile_binop,
+        ast.UnaryOp: compile_unaryop,
+        ast.BoolOp: compile_boolop,
     }
 
-    for ast_type, evaluator in evaluators.items():
+    for ast_type, compiler in compilers.items():
         if isinstance(node, ast_type):
-            return evaluator(source, node, params)
+            return compiler(source, node)
 
-    raise FormulaSyntaxError.from_ast_node(source, node, "This syntax is not supported")
+    return _unsupported(source, node, "This syntax is not supported")
 
 
-def eval_expression(source: str, node: ast.Expression, params: Dict[str, Any]) -> float:
-    return eval_node(source, node.body, params)
+def compile_expression(source: str, node: ast.Expression) -> Evaluator:
+    return compile_node(source, node.body)
 
 
-def eval_constant(source: str, node: ast.Constant, _params: Dict[str, Any]) -> float:
+def compile_constant(source: str, node: ast.Constant) -> Evaluator:
     if isinstance(node.value, int) or isinstance(node.value, float):
-        return float(node.value)
+        value = float(node.value)
+        return lambda _params: value
     else:
-        raise FormulaSyntaxError.from_ast_node(
-            source,
-            node,
-            "Literals of this type are not supported",
-        )
+        return _unsupported(source, node, "Literals of this type are not supported")
 
 
-def eval_name(source: str, node: ast.Name, params: Dict[str, Any]) -> float or bool:
-    try:
-        if isinstance(params[node.id], bool):
-            return bool(params[node.id])
-        elif isinstance(params[node.id], str) and params[node.id] in ["Yes", "No"]:
-            return True if params[node.id] == "Yes" else False
-
-        return float(params[node.id])
-    except KeyError:
-        raise FormulaSyntaxError.from_ast_node(
-            source,
-            node,
-            f"Undefined variable: {node.id}",
-        )
+def get_param_value(value: Any) -> float or bool:
+    if isinstance(value, bool):
+        return bool(value)
+    elif isinstance(value, str) and value in ["Yes", "No"]:
+        return True if value == "Yes" else False
 
+    return float(value)
 
-def eval_binop(source: str, node: ast.BinOp, params: Dict[str, Any]) -> float:
-    operations = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-    }
 
-    left_value = eval_node(source, node.left, params)
-    right_value = eval_node(source, node.right, params)
+def compile_name(source: str, node: ast.Name) -> Evaluator:
+    name = node.id
 
-    try:
-        apply = operations[type(node.op)]
-    except KeyError:
-        raise FormulaSyntaxError.from_ast_node(
+    def evaluate(params):
+        try:
+            value = params[name]
+        except KeyError:
+            raise FormulaSyntaxError.from_ast_node(
+                source,
+                node,
+                f"Undefined variable: {name}",
+            )
+        return get_param_value(value)
+
+    return evaluate
+
+
+BINARY_OPERATIONS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+UNARY_OPERATIONS = {
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+}
+BOOL_OPERATIONS = {
+    ast.And: operator.and_,
+    ast.Or: operator.or_,
+}
+
+
+def compile_binop(source: str, node: ast.BinOp) -> Evaluator:
+    left = compile_node(source, node.left)
+    right = compile_node(source, node.right)
+    apply = BINARY_OPERATIONS.get(type(node.op), None)
+    if apply is None:
+        return _unsupported(
             source,
             node,
             "Operations of this type are not supported",
+            left,
+            right,
         )
 
-    return apply(left_value, right_value)
-
-
-def eval_unaryop(
-    source: str,
-    node: ast.UnaryOp,
-    params: Dict[str, Any],
-) -> float:
-    operations = {
-        ast.USub: operator.neg,
-        ast.Not: operator.not_,
-    }
+    return lambda params: apply(left(params), right(params))
 
-    operand_value = eval_node(source, node.operand, params)
 
-    try:
-        apply = operations[type(node.op)]
-    except KeyError:
-        raise FormulaSyntaxError.from_ast_node(
+def compile_unaryop(source: str, node: ast.UnaryOp) -> Evaluator:
+    operand = compile_node(source, node.operand)
+    apply = UNARY_OPERATIONS.get(type(node.op), None)
+    if apply is None:
+        return _unsupported(
             source,
             node,
             "Operations of this type are not supported",
+            operand,
         )
 
-    return apply(operand_value)
+    return lambda params: apply(operand(params))
 
 
-def eval_boolop(source: str, node: ast.BoolOp, params: Dict[str, Any]) -> float:
-    operations = {
-        ast.And: operator.and_,
-        ast.Or: operator.or_,
-    }
-    values = [eval_node(source, val, params) for val in node.values]
-
-    try:
-        apply = operations[type(node.op)]
-    except KeyError:
-        raise FormulaSyntaxError.from_ast_node(
+def compile_boolop(source: str, node: ast.BoolOp) -> Evaluator:
+    operands = [compile_node(source, val) for val in node.values]
+    apply = BOOL_OPERATIONS.get(type(node.op), None)
+    if apply is None:
+        return _unsupported(
             source,
             node,
             "Operations of this type are not supported",
+            *operands,
         )
 
-    return reduce(apply, values)
+    return lambda params: reduce(apply, [operand(params) for operand in operands])
+
+
+class CompiledFormula:
+    """A formula parsed and compiled once, to be evaluated over many rows."""
+
+    def __init__(self, formula: str):
+        try:
+            self.node = ast.parse(formula, "<string>", mode="eval")
+        except SyntaxError as e:
+            raise FormulaSyntaxError.from_syntax_error(e, "Could not parse")
+        self.formula = formula
+        self.evaluator = compile_node(formula, self.node)
+
+    def __call__(self, params: Dict[str, Any]):
+        try:
+            return self.evaluator(params)
+        except FormulaSyntaxError:
+            raise
+        except Exception as e:
+            raise FormulaRuntimeError(f"Evaluation failed: {e}")
+
+    def evaluate_batch(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Evaluates the formula for every row with NumPy.
+        :param rows: list of params
+        :return: list of results, None for the rows which failed to evaluate
+        """
+        if not rows:
+            return []
+        columns = {}
+        values, kinds, valid = _eval_batch_node(self.formula, self.node, rows, columns)
+        output = []
+        for value, kind, is_valid in zip(
+            values.tolist(),
+            kinds.tolist(),
+            valid.tolist(),
+        ):
+            if not is_valid:
+                output.append(None)
+            elif kind == BOOL_KIND:
+                output.append(bool(value))
+            elif kind == INT_KIND:
+                output.append(int(value))
+            else:
+                output.append(value)
+        return output
+
+
+@lru_cache(maxsize=256)
+def compile_formula(formula: str) -> CompiledFormula:
+    return CompiledFormula(formula)
+
+
+def _get_batch_column(name: str, rows: List[Dict[str, Any]], columns: Dict):
+    if name not in columns:
+        num_rows = len(rows)
+        values = np.zeros(num_rows, dtype=np.float64)
+        kinds = np.full(num_rows, FLOAT_KIND, dtype=np.int8)
+        valid = np.zeros(num_rows, dtype=bool)
+        for idx, params in enumerate(rows):
+            if name not in params:
+                continue
+            try:
+                value = get_param_value(params[name])
+            except (TypeError, ValueError, OverflowError):
+                continue
+            values[idx] = value
+            valid[idx] = True
+            if isinstance(value, bool):
+                kinds[idx] = BOOL_KIND
+        columns[name] = (values, kinds, valid)
+    return columns[name]
+
+
+def _eval_batch_node(
+    source: str,
+    node: ast.AST,
+    rows: List[Dict[str, Any]],
+    columns: Dict,
+):
+    """Evaluates the node over all the rows.
+    :return: tuple of values, kinds and valid arrays
+    """
+    num_rows = len(rows)
+    if isinstance(node, ast.Expression):
+        return _eval_batch_node(source, node.body, rows, columns)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return (
+            np.full(num_rows, float(node.value), dtype=np.float64),
+            np.full(num_rows, FLOAT_KIND, dtype=np.int8),
+            np.ones(num_rows, dtype=bool),
+        )
+    if isinstance(node, ast.Name):
+        return _get_batch_column(node.id, rows, columns)
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATIONS:
+        left = _eval_batch_node(source, node.left, rows, columns)
+        right = _eval_batch_node(source, node.right, rows, columns)
+        l_values, l_kinds, l_valid = left
+        r_values, r_kinds, r_valid = right
+        valid = l_valid & r_valid
+        if isinstance(node.op, ast.Div):
+            valid &= r_values != 0
+            kinds = np.full(num_rows, FLOAT_KIND, dtype=np.int8)
+            with np.errstate(all="ignore"):
+                values = np.divide(l_values, np.where(valid, r_values, 1.0))
+        else:
+            # Arithmetic on booleans gives an int, anything with a float gives a float.
+            kinds = np.where(
+                (l_kinds == FLOAT_KIND) | (r_kinds == FLOAT_KIND),
+                FLOAT_KIND,
+                INT_KIND,
+            ).astype(np.int8)
+            with np.errstate(all="ignore"):
+                values = BINARY_OPERATIONS[type(node.op)](l_values, r_values)
+        return values, kinds, valid
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATIONS:
+        values, kinds, valid = _eval_batch_node(source, node.operand, rows, columns)
+        if isinstance(node.op, ast.Not):
+            return (
+                (values == 0).astype(np.float64),
+                np.full(num_rows, BOOL_KIND, dtype=np.int8),
+                valid,
+            )
+        kinds = np.where(kinds == BOOL_KIND, INT_KIND, kinds).astype(np.int8)
+        return -values, kinds, valid
+    if isinstance(node, ast.BoolOp) and type(node.op) in BOOL_OPERATIONS:
+        operands = [_eval_batch_node(source, val, rows, columns) for val in node.values]
+        values, kinds, valid = operands[0]
+        for o_values, o_kinds, o_valid in operands[1:]:
+            # Bitwise and / or are not defined for floats.
+            valid = valid & o_valid & (kinds != FLOAT_KIND) & (o_kinds != FLOAT_KIND)
+            l_ints = np.where(valid, values, 0).astype(np.int64)
+            r_ints = np.where(valid, o_values, 0).astype(np.int64)
+            if isinstance(node.op, ast.And):
+                values = np.bitwise_and(l_ints, r_ints).astype(np.float64)
+            else:
+                values = np.bitwise_or(l_ints, r_ints).astype(np.float64)
+            kinds = np.where(
+                (kinds == BOOL_KIND) & (o_kinds == BOOL_KIND),
+                BOOL_KIND,
+                INT_KIND,
+            ).astype(np.int8)
+        return values, kinds, valid
+    # Unsupported syntax fails for every row, the same as the row evaluator.
+    return (
+        np.zeros(num_rows, dtype=np.float64),
+        np.full(num_rows, FLOAT_KIND, dtype=np.int8),
+        np.zeros(num_rows, dtype=bool),
+    )
 
 
 def validate_formula(
@@ -190,16 +363,4 @@ def validate_formula(
 
 
 def evaluate_formula(formula: str, params: Dict[str, Any]):
-    logger.info(f"Evaluating formula: {formula} --- {params}")
-
-    try:
-        node = ast.parse(formula, "<string>", mode="eval")
-    except SyntaxError as e:
-        raise FormulaSyntaxError.from_syntax_error(e, "Could not parse")
-
-    try:
-        return eval_node(formula, node, params)
-    except FormulaSyntaxError:
-        raise
-    except Exception as e:
-        raise FormulaRuntimeError(f"Evaluation failed: {e}")
+    return compile_formula(formula)(params)
@@ -115,6 +115,7 @@ def create_knowledge_graph(workspace_id):
             existing_field_values = nosql_db.read_extracted_field(
                 {"field_idx": field.id, "file_idx": "all_files"},
                 {"_id": 0, "topic_facts": 1},
+                analytics=True,
             )
             topic_facts = []
             for item in existing_field_values:
@@ -1007,7 +1007,7 @@ class ElasticsearchClient:
                         if not found_longer_match:
                             if match_key not in match_keys:
                                 matched_refs.append((start_index, end_index, (insert_order, original_value)))
-                                match_keys[nosql_db.escape_mongo_data(match_key)] = original_value[1]
+                                match_keys[nosql_db.escape_mongo_key(match_key)] = original_value[1]
                 if match_keys:
                     _db_data["cross_references"] = match_keys
 
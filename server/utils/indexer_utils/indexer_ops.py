@@ -20,6 +20,7 @@ from server.utils.indexer_utils.misc_utils import ingest_data_row_file
 from server.utils.indexer_utils.bbox_detector import BBOXDetector
 from server.utils.indexer_utils.es_client import es_client
 from server.utils.indexer_utils.info_extractor import extract_key_data
+from server.utils.metric_utils import usage_meter
 from nlm_utils.utils import ensure_bool, file_utils
 from bs4 import BeautifulSoup
 from nlm_ingestor.ingestor import ingestor_api
@@ -418,7 +419,7 @@ def ingest_document(doc: DocumentInfo,
                     data = {
                         "general_usage": res_data,
                     }
-                nosql_db.upsert_usage_metrics(user_profile["id"], data)
+                usage_meter.record(user_profile["id"], data)
             return doc
         except Exception:
             logger.info("error running extraction")
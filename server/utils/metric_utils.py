@@ -1,8 +1,27 @@
+import atexit
+import copy
 import datetime
+import logging
+import os
+import threading
+import time
+import traceback
 
 from server.storage import nosql_db
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
 catalog_data_dict: dict = {}
+# Seconds between two flushes of the metered usage, 0 writes every call through.
+USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", 5))
+# Metered calls per user kept in memory before an early flush. Together with the
+# flush interval, this bounds how far a quota can be overshot per worker.
+USAGE_FLUSH_SLACK = int(os.getenv("USAGE_FLUSH_SLACK", 20))
+# Seconds the stored usage of a user is reused by the rate limiter, capped at the
+# flush interval so that the usage flushed by other workers is seen as soon.
+USAGE_SNAPSHOT_TTL_SECONDS = float(
+    os.getenv("USAGE_SNAPSHOT_TTL_SECONDS", USAGE_FLUSH_INTERVAL_SECONDS),
+)
 
 
 def update_metric_data(user_json, metric_data):
@@ -25,7 +44,7 @@ def update_metric_data(user_json, metric_data):
         data = {
             "general_usage": res_data,
         }
-    nosql_db.upsert_usage_metrics(user_json["id"], data)
+    usage_meter.record(user_json["id"], data)
 
 
 def get_catalogs():
@@ -66,6 +85,167 @@ def add_default_usage_metrics(user_id):
     nosql_db.upsert_usage_metrics(user_id, metric_data, upsert=True)
 
 
+def _add_usage(metric, usage_data):
+    for section, values in usage_data.items():
+        metric_section = metric.setdefault(section, {})
+        for key, value in values.items():
+            metric_section[key] = (metric_section.get(key, 0) or 0) + value
+
+
+def _load_usage(user_id):
+    usage_metric_list = nosql_db.retrieve_usage_metrics(user_id)
+    if not usage_metric_list:
+        latest_usage_metric = nosql_db.retrieve_latest_usage(user_id)
+        if latest_usage_metric:
+            usage_metric_list = [latest_usage_metric]
+        else:
+            usage_metric_list = create_default_metric_for(user_id)
+    return usage_metric_list[0]
+
+
+class UsageMeter:
+    """Write-behind usage metering. Increments are kept per user in memory and
+    written to the usage collection in one bulk write every flush_interval
+    seconds, or as soon as a user has `slack` unflushed calls. The rate limiter
+    reads the stored usage again after each flush and at least once per
+    snapshot_ttl (at most flush_interval), and adds the unflushed increments of
+    this process on top. The usage of other workers is therefore seen within
+    about two flush intervals."""
+
+    def __init__(
+        self,
+        flush_interval=USAGE_FLUSH_INTERVAL_SECONDS,
+        slack=USAGE_FLUSH_SLACK,
+        snapshot_ttl=USAGE_SNAPSHOT_TTL_SECONDS,
+    ):
+        self.flush_interval = flush_interval
+        self.slack = slack
+        self.snapshot_ttl = (
+            min(snapshot_ttl, flush_interval) if flush_interval > 0 else snapshot_ttl
+        )
+        # user_id -> {"general_usage": {...}, "dev_api_usage": {...}}
+        self.pending = {}
+        self.pending_calls = {}
+        self.in_flight = {}
+        # user_id -> (reported_on, metric, fetched_at)
+        self.snapshots = {}
+        # Incremented by every flush, snapshots read across a flush are not kept.
+        self.flush_count = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def _start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        if self.thread is None:
+            atexit.register(self.flush)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def record(self, user_id, usage_data):
+        """
+        Meters the usage of a user
+        :param user_id: User ID
+        :param usage_data: Usage data, as in upsert_usage_metrics
+        :return: VOID
+        """
+        if self.flush_interval <= 0:
+            nosql_db.upsert_usage_metrics(user_id, usage_data)
+            self.invalidate(user_id)
+            return
+        with self.lock:
+            _add_usage(self.pending.setdefault(user_id, {}), usage_data)
+            self.pending_calls[user_id] = self.pending_calls.get(user_id, 0) + 1
+            if self.pending_calls[user_id] >= self.slack:
+                self.wakeup.set()
+            self._start()
+
+    def get_usage(self, user_id):
+        """
+        Returns the usage metric of the current month including the unflushed usage
+        :param user_id: User ID
+        :return: usage metric dict
+        """
+        month = datetime.datetime.now().strftime("%Y-%m")
+        now = time.monotonic()
+        with self.lock:
+            snapshot = self.snapshots.get(user_id, None)
+            flush_count = self.flush_count
+        if (
+            not snapshot
+            or snapshot[0] != month
+            or now - snapshot[2] > self.snapshot_ttl
+        ):
+            metric = _load_usage(user_id)
+            with self.lock:
+                if flush_count == self.flush_count:
+                    self.snapshots[user_id] = (month, metric, now)
+        else:
+            metric = snapshot[1]
+        with self.lock:
+            metric = copy.deepcopy(metric)
+            for usage_data in (self.in_flight, self.pending):
+                if user_id in usage_data:
+                    _add_usage(metric, usage_data[user_id])
+        return metric
+
+    def invalidate(self, user_id):
+        """
+        Drops the stored usage of a user, it is read again on the next request
+        :param user_id: User ID
+        :return: VOID
+        """
+        with self.lock:
+            self.snapshots.pop(user_id, None)
+
+    def flush(self):
+        """
+        Writes the pending increments to the usage collection
+        :return: VOID
+        """
+        with self.flush_lock:
+            with self.lock:
+                batch = self.pending
+                self.pending = {}
+                self.pending_calls = {}
+                self.in_flight = batch
+            if not batch:
+                return
+            try:
+                failed = nosql_db.bulk_upsert_usage_metrics(batch)
+            except Exception as e:
+                logger.error(
+                    f"Error flushing usage metrics, err: {traceback.format_exc()} .. {str(e)}",
+                )
+                with self.lock:
+                    self.in_flight = {}
+                    for user_id, usage_data in batch.items():
+                        _add_usage(self.pending.setdefault(user_id, {}), usage_data)
+                return
+            if failed:
+                logger.error(f"Error flushing the usage metrics of {list(failed)}")
+            with self.lock:
+                self.in_flight = {}
+                # Only the usage which was not written is retried.
+                for user_id, usage_data in failed.items():
+                    _add_usage(self.pending.setdefault(user_id, {}), usage_data)
+                self.flush_count += 1
+                # Read again with the usage other workers flushed meanwhile.
+                for user_id in batch:
+                    self.snapshots.pop(user_id, None)
+
+
+usage_meter = UsageMeter()
+
+
 def update_global_params():
     """
     Update the Global Parameters. Basically set the global variables to None,
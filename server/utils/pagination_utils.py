@@ -0,0 +1,130 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+
+from bson import json_util
+
+# Key signing the continuation tokens, set it when several server processes serve the same clients.
+CONTINUATION_TOKEN_SECRET = (
+    os.getenv("CONTINUATION_TOKEN_SECRET") or os.getenv("AUTH_SECRET") or ""
+).encode("utf-8") or os.urandom(32)
+
+# Order of the BSON types in a sort, see the MongoDB comparison/sort order.
+BSON_TYPE_SORT_RANKS = {
+    "minKey": 0,
+    "missing": 1,
+    "null": 1,
+    "int": 2,
+    "long": 2,
+    "double": 2,
+    "decimal": 2,
+    "string": 3,
+    "symbol": 3,
+    "object": 4,
+    "array": 5,
+    "binData": 6,
+    "objectId": 7,
+    "bool": 8,
+    "date": 9,
+    "timestamp": 10,
+    "regex": 11,
+    "maxKey": 12,
+}
+
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _sign(payload):
+    return hmac.new(CONTINUATION_TOKEN_SECRET, payload, hashlib.sha256).digest()
+
+
+def encode_continuation_token(sort_values, total_count=None):
+    """Encodes the sort key of the last returned row into an opaque signed token
+    :param sort_values: values of the sort keys (including the tie-breaker) of the last row
+    :param total_count: total number of matching rows, carried over to the next pages
+    :return: url safe token
+    """
+    payload = json_util.dumps({"v": list(sort_values), "t": total_count}).encode(
+        "utf-8",
+    )
+    return base64.urlsafe_b64encode(_sign(payload) + payload).decode("ascii")
+
+
+def decode_continuation_token(token):
+    """Decodes a token created by encode_continuation_token
+    :param token: continuation token
+    :return: tuple of sort_values and total_count
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+        signature, payload = raw[:SIGNATURE_SIZE], raw[SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("invalid signature")
+        payload = json_util.loads(payload.decode("utf-8"))
+        return payload["v"], payload.get("t", None)
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError):
+        raise ValueError("invalid continuation token")
+
+
+def get_sort_value(row, key):
+    """Returns the value of a dotted key in the row, None when missing
+    :param row: dict
+    :param key: dotted path, e.g. meta.pubDate
+    :return: value
+    """
+    value = row
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part, None)
+    return value
+
+
+def get_sort_type_expression(key):
+    """Returns the aggregation expression ranking the type of a key in the sort order,
+    to sort and page a key holding values of mixed types.
+    :param key: dotted path of the sort key
+    :return: aggregation expression
+    """
+    return {
+        "$switch": {
+            "branches": [
+                {"case": {"$eq": [{"$type": f"${key}"}, bson_type]}, "then": rank}
+                for bson_type, rank in BSON_TYPE_SORT_RANKS.items()
+            ],
+            "default": max(BSON_TYPE_SORT_RANKS.values()) + 1,
+        },
+    }
+
+
+def build_keyset_query(sort_tuple_list, sort_values):
+    """Builds the query matching the rows after the given sort values.
+    The last entry of sort_tuple_list must be a unique tie-breaker.
+    Missing values sort before any value. $gt and $lt only match values of the same type,
+    precede a key holding mixed types by its get_sort_type_expression rank.
+    :param sort_tuple_list: list of (key, direction) tuples
+    :param sort_values: values of the sort keys of the last seen row
+    :return: mongo query
+    """
+    if len(sort_tuple_list) != len(sort_values):
+        raise ValueError("continuation token does not match the sort order")
+    or_clauses = []
+    for idx, (key, direction) in enumerate(sort_tuple_list):
+        value = sort_values[idx]
+        clause = {k: sort_values[i] for i, (k, _) in enumerate(sort_tuple_list[:idx])}
+        if value is None:
+            if direction < 0:
+                # Nothing sorts after a missing value in descending order.
+                continue
+            clause[key] = {"$ne": None}
+        elif direction > 0:
+            clause[key] = {"$gt": value}
+        else:
+            clause["$and"] = [{"$or": [{key: {"$lt": value}}, {key: None}]}]
+        or_clauses.append(clause)
+    if not or_clauses:
+        # Last page was the end of the results.
+        return {"_id": {"$exists": False}}
+    return {"$or": or_clauses}
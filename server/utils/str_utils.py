@@ -1,3 +1,4 @@
+import re
 import secrets
 import uuid
 import zlib
@@ -7,6 +8,11 @@ from datetime import timedelta
 from pytz import timezone
 
 t_zone = timezone("UTC")
+NUMBER_PATTERN = re.compile(r"([0-9]+)")
+# Substring search on document names and titles matches these n-grams.
+SEARCH_GRAM_SIZE = 3
+# Prefixes up to this length are stored as edge n-grams, marked with "^".
+SEARCH_EDGE_GRAM_MAX = 16
 
 
 def get_unique_string(prefix=None):
@@ -118,3 +124,105 @@ def timestamp_as_str():
 
 def timestamp_as_utc_str(num_days=0):
     return (datetime.now(t_zone) + timedelta(num_days)).strftime("%Y-%m-%d")
+
+
+def get_natural_sort_key(value):
+    """Returns a string whose lexicographic order is the natural order of the value,
+    i.e. "file2" sorts before "file10". Every number is prefixed with its length.
+    :param value: string to create the key for
+    :return: sort key
+    """
+    if value is None:
+        return ""
+    parts = NUMBER_PATTERN.split(str(value))
+    for idx in range(1, len(parts), 2):
+        digits = parts[idx].lstrip("0") or "0"
+        parts[idx] = f"{len(digits):02d}{digits}"
+    return "".join(parts)
+
+
+def get_document_sort_keys(name=None, inferred_title=None):
+    """Returns the persisted sort keys of a document
+    :param name: name of the document
+    :param inferred_title: inferred title of the document
+    :return: dict with name_sort_key and title_sort_key
+    """
+    return {
+        "name_sort_key": get_natural_sort_key(name),
+        # Documents without a title go last.
+        "title_sort_key": "0" + get_natural_sort_key(inferred_title)
+        if inferred_title
+        else "1",
+    }
+
+
+def get_search_grams(value):
+    """Returns the edge n-grams and the trigrams of a value, stored per document
+    in a multikey index for prefix and substring search
+    :param value: name or title of a document
+    :return: sorted list of distinct grams
+    """
+    if not value:
+        return []
+    value = str(value).lower()
+    grams = {
+        value[idx : idx + SEARCH_GRAM_SIZE]
+        for idx in range(len(value) - SEARCH_GRAM_SIZE + 1)
+    }
+    grams.update(
+        "^" + value[:idx] for idx in range(1, min(len(value), SEARCH_EDGE_GRAM_MAX) + 1)
+    )
+    return sorted(grams)
+
+
+def get_search_query_grams(value, prefix=False):
+    """Returns the grams every document matching the search must contain
+    :param value: searched substring or prefix
+    :param prefix: search for names starting with value
+    :return: list of grams, empty when the value is too short to use the index
+    """
+    value = str(value or "").lower()
+    grams = []
+    if prefix and value:
+        grams.append("^" + value[:SEARCH_EDGE_GRAM_MAX])
+        if len(value) <= SEARCH_EDGE_GRAM_MAX:
+            return grams
+    # Non overlapping trigrams covering the value narrow the candidates enough,
+    # the caller verifies the match with a regex.
+    grams.extend(
+        value[idx : idx + SEARCH_GRAM_SIZE]
+        for idx in range(0, len(value) - SEARCH_GRAM_SIZE + 1, SEARCH_GRAM_SIZE)
+    )
+    if len(value) > SEARCH_GRAM_SIZE and len(value) % SEARCH_GRAM_SIZE:
+        grams.append(value[-SEARCH_GRAM_SIZE:])
+    return list(dict.fromkeys(grams))
+
+
+def get_document_search_keys(name=None, inferred_title=None):
+    """Returns the persisted search grams of a document
+    :param name: name of the document
+    :param inferred_title: inferred title of the document
+    :return: dict with name_grams and title_grams
+    """
+    return {
+        "name_grams": get_search_grams(name),
+        "title_grams": get_search_grams(inferred_title),
+    }
+
+
+def get_document_key_updates(data_to_set):
+    """Returns the sort keys and search grams derived from the name or the
+    inferred title being set on a document
+    :param data_to_set: field values set on the document
+    :return: dict of the derived keys to set along
+    """
+    updates = {}
+    if "name" in data_to_set:
+        updates["name_sort_key"] = get_natural_sort_key(data_to_set["name"])
+        updates["name_grams"] = get_search_grams(data_to_set["name"])
+    if "inferred_title" in data_to_set:
+        updates["title_sort_key"] = get_document_sort_keys(
+            inferred_title=data_to_set["inferred_title"],
+        )["title_sort_key"]
+        updates["title_grams"] = get_search_grams(data_to_set["inferred_title"])
+    return updates
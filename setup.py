@@ -23,6 +23,7 @@ REQUIRES = [
     "pymongo==3.11.4",
     "Werkzeug>=2.3.3",
     "openpyxl==3.0.7",
+    "orjson==3.8.3",
     "pytz==2021.1",
     "validators==0.18.2",
     "python-jose[cryptography]",
@@ -32,7 +33,6 @@ REQUIRES = [
     "sendgrid==6.8.1",
     "xmltodict==0.12.0",
     "webdriver-manager==3.4.2",
-    "natsort==7.1.1",
     "openapi-spec-validator==0.4.0",
     "openapi-schema-validator<0.3.0,>=0.2.0",
 ]
@@ -1,10 +1,28 @@
+import functools
 import logging
 from threading import Thread
 
+from server.storage.local.mongo_stats import command_scope
+
+
+def _run_in_command_scope(run):
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        with command_scope(self.task_name):
+            return run(self, *args, **kwargs)
+
+    return wrapper
+
 
 class BaseTask(Thread):
     task_name = "base_task"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Attribute the mongo commands of the task to its name in command_stats.
+        if "run" in cls.__dict__:
+            cls.run = _run_in_command_scope(cls.__dict__["run"])
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 